@@ -17,6 +17,7 @@ from app.core.security import get_current_user
 from app.services.google_service import gemini_service
 from app.services.google_service import google_service
 from app.services.aws_service import aws_service
+from app.services.category_histogram import category_histogram_service, peak_hours, peak_weekly_slots
 
 router = APIRouter()
 
@@ -184,46 +185,17 @@ async def analyze_optimal_publish_time(
 ):
     """Analyze historical data to find optimal publish time"""
     try:
-        # Aggregate view events by hour for this category
-        pipeline = [
-            {
-                "$lookup": {
-                    "from": "articles",
-                    "localField": "article_id",
-                    "foreignField": "_id",
-                    "as": "article"
-                }
-            },
-            {"$unwind": "$article"},
-            {
-                "$match": {
-                    "event_type": "view",
-                    "article.category": category
-                }
-            },
-            {
-                "$group": {
-                    "_id": {"$hour": "$timestamp"},
-                    "view_count": {"$sum": 1}
-                }
-            },
-            {"$sort": {"view_count": -1}},
-            {"$limit": 5}
-        ]
-        
-        results = await db.analytics.aggregate(pipeline).to_list(length=5)
-        
-        peak_hours = [
-            {"hour": item['_id'], "views": item['view_count']}
-            for item in results
-        ]
-        
-        optimal_hour = peak_hours[0]['hour'] if peak_hours else 12
+        # Precomputed view histogram of this category (one document read)
+        histogram = await category_histogram_service.get(db, category)
+        hours = peak_hours(histogram)
+        
+        optimal_hour = hours[0]['hour'] if hours else 12
         
         return {
             "category": category,
             "optimal_hour": optimal_hour,
-            "peak_hours": peak_hours,
+            "peak_hours": hours,
+            "peak_weekly_slots": peak_weekly_slots(histogram),
             "recommendation": f"Best time to publish: {optimal_hour}:00"
         }
         
@@ -1,37 +1,58 @@
 """
 Analytics API Endpoints
 """
-from fastapi import APIRouter, HTTPException, Depends
-from datetime import datetime, timedelta
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+import asyncio
 from bson import ObjectId
 from loguru import logger
 
-from app.models.schemas import AnalyticsEvent, DashboardStats, ArticleStats
+from app.models.schemas import AnalyticsEvent, DashboardStats, ArticleStats, EventType
 from app.core.database import get_database
-from app.core.security import get_current_admin_user
+from app.core.config import settings
+from app.core.security import get_current_admin_user, get_current_admin_user_from_query
+from app.core.export import FORMAT_PATTERN, streaming_export
+from app.core.sse import SSE_HEADERS
+from app.services.dashboard_stats import dashboard_stats_service
+from app.services.dashboard_live import dashboard_live
+from app.services.trending import trending_service
+from app.services.analytics_ingest import analytics_ingest
+from app.services.analytics_rollups import analytics_rollup_service
+from app.services.article_stats import article_stats_service, read_time_summary
+from app.services.unique_readers import unique_reader_service
+from app.services.analytics_archive import analytics_archive_service
 
 router = APIRouter()
 
+# Engagement weights for /analytics/trending
+TRENDING_WEIGHTS = {"view": 1, "like": 3, "share": 5, "comment": 4}
+
+EVENT_EXPORT_FIELDS = ["_id", "article_id", "user_id", "event_type", "timestamp", "metadata"]
+
+
+async def _submit_events(events: List[AnalyticsEvent]):
+    """Stamp events and hand them to the ingestion pipeline (written in bulk)"""
+    now = datetime.utcnow()
+    docs = []
+    for event in events:
+        event_dict = event.model_dump()
+        # Assigned up front so retried / redelivered events are not stored twice
+        event_dict['_id'] = ObjectId()
+        event_dict['timestamp'] = now
+        docs.append(event_dict)
+        trending_service.record_event(event.article_id, event.event_type.value)
+    
+    # Like counters are applied on write with one coalesced $inc per article
+    await analytics_ingest.submit(docs)
+
 
 @router.post("/track")
-async def track_event(
-    event: AnalyticsEvent,
-    db = Depends(get_database)
-):
+async def track_event(event: AnalyticsEvent):
     """Track analytics event"""
     try:
-        event_dict = event.model_dump()
-        event_dict['timestamp'] = datetime.utcnow()
-        
-        await db.analytics.insert_one(event_dict)
-        
-        # Update article metrics if applicable
-        if event.event_type == 'like':
-            await db.articles.update_one(
-                {"_id": ObjectId(event.article_id)},
-                {"$inc": {"like_count": 1}}
-            )
-        
+        await _submit_events([event])
         return {"success": True, "message": "Event tracked"}
         
     except Exception as e:
@@ -39,65 +60,52 @@ async def track_event(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/track/batch")
+async def track_events_batch(events: List[AnalyticsEvent]):
+    """Track several analytics events in one request"""
+    if len(events) > settings.ANALYTICS_BATCH_MAX_EVENTS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.ANALYTICS_BATCH_MAX_EVENTS} events per batch"
+        )
+    try:
+        await _submit_events(events)
+        return {"success": True, "message": "Events tracked", "accepted": len(events)}
+        
+    except Exception as e:
+        logger.error(f"❌ Track events batch error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/dashboard", response_model=DashboardStats)
 async def get_dashboard_stats(
+    fresh: bool = Query(False, description="Recompute now instead of serving the background snapshot"),
     current_user: dict = Depends(get_current_admin_user),
     db = Depends(get_database)
 ):
-    """Get dashboard statistics"""
+    """Get dashboard statistics (snapshot refreshed in the background)"""
     try:
-        # Total articles
-        total_articles = await db.articles.count_documents({})
-        published_articles = await db.articles.count_documents({"status": "published"})
-        draft_articles = await db.articles.count_documents({"status": "draft"})
-        pending_review = await db.articles.count_documents({"status": "pending_review"})
-        
-        # Total users
-        total_users = await db.users.count_documents({})
-        
-        # Total comments
-        total_comments = await db.comments.count_documents({})
-        
-        # Total views (sum of all article view_count)
-        pipeline = [
-            {"$group": {"_id": None, "total_views": {"$sum": "$view_count"}}}
-        ]
-        view_result = await db.articles.aggregate(pipeline).to_list(length=1)
-        total_views = view_result[0]['total_views'] if view_result else 0
-        
-        # Articles by category
-        category_pipeline = [
-            {"$group": {"_id": "$category", "count": {"$sum": 1}}}
-        ]
-        category_results = await db.articles.aggregate(category_pipeline).to_list(length=20)
-        articles_by_category = {item['_id']: item['count'] for item in category_results}
-        
-        # Sentiment distribution
-        sentiment_pipeline = [
-            {"$group": {"_id": "$sentiment", "count": {"$sum": 1}}}
-        ]
-        sentiment_results = await db.comments.aggregate(sentiment_pipeline).to_list(length=10)
-        sentiment_distribution = {item['_id']: item['count'] for item in sentiment_results}
-        
-        stats = DashboardStats(
-            total_articles=total_articles,
-            published_articles=published_articles,
-            draft_articles=draft_articles,
-            pending_review=pending_review,
-            total_users=total_users,
-            total_comments=total_comments,
-            total_views=total_views,
-            articles_by_category=articles_by_category,
-            sentiment_distribution=sentiment_distribution
-        )
-        
-        return stats
+        snapshot = await dashboard_stats_service.get(db, fresh=fresh)
+        return DashboardStats(**snapshot)
         
     except Exception as e:
         logger.error(f"❌ Dashboard stats error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/dashboard/live")
+async def stream_dashboard(
+    current_user: dict = Depends(get_current_admin_user_from_query),
+    db = Depends(get_database)
+):
+    """Server-sent events: dashboard snapshot, then `delta` messages (views, comments, sentiment, articles)"""
+    return StreamingResponse(
+        dashboard_live.stream(db),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+
 @router.get("/article/{article_id}", response_model=ArticleStats)
 async def get_article_stats(
     article_id: str,
@@ -116,29 +124,13 @@ async def get_article_stats(
         likes = article.get('like_count', 0)
         comments = article.get('comment_count', 0)
         
-        shares_count = await db.analytics.count_documents({
-            "article_id": article_id,
-            "event_type": "share"
-        })
-        
-        # Calculate average read time from view events
-        read_time_pipeline = [
-            {
-                "$match": {
-                    "article_id": article_id,
-                    "event_type": "view"
-                }
-            },
-            {
-                "$group": {
-                    "_id": None,
-                    "avg_time": {"$avg": "$metadata.read_time"}
-                }
-            }
-        ]
-        
-        read_time_result = await db.analytics.aggregate(read_time_pipeline).to_list(length=1)
-        avg_read_time = read_time_result[0]['avg_time'] if read_time_result else 0.0
+        # Shares and read-time statistics: one running-totals document
+        article_stats = await article_stats_service.get(db, article_id)
+        shares_count = ((article_stats or {}).get('counts') or {}).get('share', 0)
+        read_time = read_time_summary(article_stats)
+        
+        # Distinct readers: merge of the article's daily HyperLogLog sketches
+        unique_readers = await unique_reader_service.unique_readers(db, article_id)
         
         stats = ArticleStats(
             article_id=article_id,
@@ -146,7 +138,10 @@ async def get_article_stats(
             likes=likes,
             comments=comments,
             shares=shares_count,
-            avg_read_time=avg_read_time
+            avg_read_time=read_time['avg'],
+            p50_read_time=read_time['p50'],
+            p90_read_time=read_time['p90'],
+            unique_readers=unique_readers
         )
         
         return stats
@@ -158,6 +153,62 @@ async def get_article_stats(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/archive/summary")
+async def get_archive_summary(
+    start: date,
+    end: date,
+    event_type: Optional[str] = None,
+    article_id: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: dict = Depends(get_current_admin_user)
+):
+    """Event counts per article and event type from archived (cold) analytics days"""
+    if not analytics_archive_service.enabled:
+        raise HTTPException(status_code=503, detail="Analytics archive is not enabled")
+    try:
+        # Parquet scans are CPU-bound: keep them off the event loop
+        results = await asyncio.to_thread(
+            analytics_archive_service.summary, start, end, event_type, article_id, limit
+        )
+        return {"start": start, "end": end, "results": results}
+        
+    except Exception as e:
+        logger.error(f"❌ Archive summary error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/export")
+async def export_events(
+    format: str = Query("ndjson", pattern=FORMAT_PATTERN),
+    start: Optional[datetime] = Query(None, description="Inclusive lower bound on event timestamp (UTC)"),
+    end: Optional[datetime] = Query(None, description="Exclusive upper bound on event timestamp (UTC)"),
+    event_type: Optional[EventType] = None,
+    article_id: Optional[str] = None,
+    current_user: dict = Depends(get_current_admin_user),
+    db = Depends(get_database)
+):
+    """Stream raw analytics events as NDJSON or CSV, oldest first"""
+    try:
+        query = {}
+        if start or end:
+            query['timestamp'] = {}
+            if start:
+                query['timestamp']['$gte'] = start
+            if end:
+                query['timestamp']['$lt'] = end
+        if event_type:
+            query['event_type'] = event_type.value
+        if article_id:
+            query['article_id'] = article_id
+
+        cursor = db.analytics.find(query, {field: 1 for field in EVENT_EXPORT_FIELDS}).sort("timestamp", 1)
+        return streaming_export(cursor, format, EVENT_EXPORT_FIELDS, "analytics")
+
+    except Exception as e:
+        logger.error(f"❌ Export analytics error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/trending")
 async def get_trending_articles(
     days: int = 7,
@@ -169,37 +220,8 @@ async def get_trending_articles(
         # Calculate from date
         from_date = datetime.utcnow() - timedelta(days=days)
         
-        # Aggregate recent engagement
-        pipeline = [
-            {
-                "$match": {
-                    "timestamp": {"$gte": from_date},
-                    "event_type": {"$in": ["view", "like", "share", "comment"]}
-                }
-            },
-            {
-                "$group": {
-                    "_id": "$article_id",
-                    "score": {
-                        "$sum": {
-                            "$switch": {
-                                "branches": [
-                                    {"case": {"$eq": ["$event_type", "view"]}, "then": 1},
-                                    {"case": {"$eq": ["$event_type", "like"]}, "then": 3},
-                                    {"case": {"$eq": ["$event_type", "share"]}, "then": 5},
-                                    {"case": {"$eq": ["$event_type", "comment"]}, "then": 4}
-                                ],
-                                "default": 1
-                            }
-                        }
-                    }
-                }
-            },
-            {"$sort": {"score": -1}},
-            {"$limit": limit}
-        ]
-        
-        trending = await db.analytics.aggregate(pipeline).to_list(length=limit)
+        # Aggregate recent engagement from hourly rollups
+        trending = await analytics_rollup_service.top_articles(db, from_date, TRENDING_WEIGHTS, limit)
         
         # Get article details
         article_ids = [ObjectId(item['_id']) for item in trending if item['_id']]
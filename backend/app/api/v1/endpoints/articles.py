@@ -1,25 +1,67 @@
 """
 Articles API Endpoints
 """
-from fastapi import APIRouter, HTTPException, Depends, Query, BackgroundTasks
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, BackgroundTasks, Request, Response
+from typing import List, Optional, Union
 from datetime import datetime
 from bson import ObjectId
 from loguru import logger
 
 from app.models.schemas import (
-    ArticleCreate, ArticleUpdate, ArticleResponse, 
+    ArticleCreate, ArticleUpdate, ArticleResponse, ArticleCardResponse,
     ArticleAIEnhancement, SchedulePublishRequest
 )
 from app.models.schemas import TranslationResponse
 from app.core.database import get_database
+from app.core.pagination import apply_cursor, build_next_cursor, set_next_cursor
+from app.core.http_cache import (
+    make_etag, weak_etag, combine_etags, latest_modified, is_not_modified, not_modified, set_cache_headers
+)
 from app.core.security import get_current_user, get_current_admin_user
+from app.core.export import FORMAT_PATTERN, streaming_export
 from app.services.google_service import gemini_service
 from app.services.rabbitmq_service import rabbitmq_service
+from app.services.article_cards import (
+    article_card_service, build_article_card, card_etag, card_last_modified, CARD_VIEW_PROJECTION
+)
+from app.services.view_counter import view_counter
+from app.services.id_resolver import article_id_resolver
+from app.services.response_cache import response_cache
+from app.services.category_counts import category_count_service
+from app.services.trending import trending_service
+from app.services.dashboard_live import dashboard_live
+from app.services.vector_search import vector_search_service
+from app.services.article_chunks import article_chunk_service
 from slugify import slugify
 
 router = APIRouter()
 
+ARTICLES_SORT = [('created_at', -1), ('_id', -1)]
+PUBLIC_ARTICLES_SORT = [('article_id', -1)]
+
+VIEW_PATTERN = "^(card|full)$"
+
+ARTICLE_EXPORT_FIELDS = [
+    "_id", "title", "slug", "category", "tags", "status", "language", "author_id", "author_name",
+    "view_count", "like_count", "comment_count", "created_at", "published_at", "updated_at"
+]
+
+
+def _public_listing(cards: List[dict], view: str) -> List[Union[ArticleResponse, ArticleCardResponse]]:
+    """Validate listing cards with the schema matching the requested view"""
+    if view == "card":
+        return [ArticleCardResponse(**card) for card in cards]
+    return [ArticleResponse(**card) for card in cards]
+
+
+def _listing_validators(cards: List[dict], *params):
+    """ETag / Last-Modified of a listing, from stored card ETags and counters (no body serialization)"""
+    etag = combine_etags(list(params) + [
+        f"{card['_id']}:{card_etag(card)}:{card.get('view_count')}:{card.get('like_count')}:{card.get('comment_count')}"
+        for card in cards
+    ])
+    return etag, latest_modified(card_last_modified(card) for card in cards)
+
 
 @router.post("/", response_model=ArticleResponse)
 async def create_article(
@@ -57,6 +99,8 @@ async def create_article(
         
         # Get created article
         article = await db.articles.find_one({"_id": ObjectId(article_id)})
+        await article_card_service.upsert(db, article)
+        response_cache.clear()
         article['_id'] = article_id
 
         # Enqueue background translation to English (non-blocking)
@@ -81,6 +125,8 @@ async def get_articles(
     author_id: Optional[str] = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor (overrides skip)"),
+    response: Response = None,
     db = Depends(get_database)
 ):
     """Get all articles with filters"""
@@ -94,9 +140,13 @@ async def get_articles(
         if author_id:
             query['author_id'] = author_id
         
-        # Get articles
-        cursor = db.articles.find(query).sort('created_at', -1).skip(skip).limit(limit)
-        articles = await cursor.to_list(length=limit)
+        # Get articles (keyset pagination when a cursor is given)
+        if cursor:
+            query = apply_cursor(query, ARTICLES_SORT, cursor)
+            skip = 0
+        db_cursor = db.articles.find(query).sort(ARTICLES_SORT).skip(skip).limit(limit)
+        articles = await db_cursor.to_list(length=limit)
+        set_next_cursor(response, build_next_cursor(articles, ARTICLES_SORT, limit))
         
         # Convert ObjectId to string
         for article in articles:
@@ -104,11 +154,47 @@ async def get_articles(
         
         return [ArticleResponse(**article) for article in articles]
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Get articles error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/export")
+async def export_articles(
+    format: str = Query("ndjson", pattern=FORMAT_PATTERN),
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    start: Optional[datetime] = Query(None, description="Inclusive lower bound on created_at (UTC)"),
+    end: Optional[datetime] = Query(None, description="Exclusive upper bound on created_at (UTC)"),
+    include_content: bool = Query(False, description="Also export summary and full content"),
+    current_user: dict = Depends(get_current_admin_user),
+    db = Depends(get_database)
+):
+    """Stream articles as NDJSON or CSV, newest first (Admin only)"""
+    try:
+        query = {}
+        if status:
+            query['status'] = status
+        if category:
+            query['category'] = category
+        if start or end:
+            query['created_at'] = {}
+            if start:
+                query['created_at']['$gte'] = start
+            if end:
+                query['created_at']['$lt'] = end
+
+        fields = ARTICLE_EXPORT_FIELDS + (["summary", "content"] if include_content else [])
+        cursor = db.articles.find(query, {field: 1 for field in fields}).sort(ARTICLES_SORT)
+        return streaming_export(cursor, format, fields, "articles")
+
+    except Exception as e:
+        logger.error(f"❌ Export articles error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/{article_id}", response_model=ArticleResponse)
 async def get_article(
     article_id: str,
@@ -120,11 +206,10 @@ async def get_article(
         if not article:
             raise HTTPException(status_code=404, detail="Article not found")
         
-        # Increment view count
-        await db.articles.update_one(
-            {"_id": ObjectId(article_id)},
-            {"$inc": {"view_count": 1}}
-        )
+        # Buffer the view (flushed in bulk) and include unflushed views in the response
+        view_counter.record(article['_id'])
+        dashboard_live.record_view(article_id)
+        article['view_count'] = article.get('view_count', 0) + view_counter.pending(article['_id'])
         
         article['_id'] = article_id
         return ArticleResponse(**article)
@@ -167,8 +252,20 @@ async def update_article(
             {"$set": update_data}
         )
         
+        # Re-embed when the embedded text changed (the worker skips unchanged articles)
+        if 'title' in update_data or 'content' in update_data:
+            try:
+                await rabbitmq_service.publish_article_processing_task(
+                    article_id=article_id,
+                    operations=['embed']
+                )
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to queue embedding task: {e}")
+        
         # Get updated article
         updated_article = await db.articles.find_one({"_id": ObjectId(article_id)})
+        await article_card_service.upsert(db, updated_article)
+        response_cache.clear()
         updated_article['_id'] = article_id
         
         return ArticleResponse(**updated_article)
@@ -192,6 +289,11 @@ async def delete_article(
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Article not found")
         
+        await article_card_service.remove(db, article_id)
+        await article_chunk_service.remove(db, ObjectId(article_id))
+        vector_search_service.remove(ObjectId(article_id))
+        response_cache.clear()
+        
         return {"success": True, "message": "Article deleted"}
         
     except HTTPException:
@@ -305,6 +407,8 @@ async def publish_article(
             {"_id": ObjectId(article_id)},
             {"$set": update_data}
         )
+        await article_card_service.refresh(db, ObjectId(article_id))
+        response_cache.clear()
         
         return {
             "success": True,
@@ -340,6 +444,9 @@ async def approve_article(
         if result.modified_count == 0:
             raise HTTPException(status_code=404, detail="Article not found")
         
+        await article_card_service.refresh(db, ObjectId(article_id))
+        response_cache.clear()
+        
         return {"success": True, "message": "Article approved"}
         
     except HTTPException:
@@ -356,20 +463,8 @@ async def _translate_and_save(article_id: str, db):
             logger.warning("⚠️ DB instance is None; cannot perform background translation")
             return
 
-        # Fetch article by id (try int, string, ObjectId)
-        article = None
-        try:
-            query_id = int(article_id)
-            article = await db.articles.find_one({"_id": query_id})
-        except Exception:
-            pass
-        if not article:
-            article = await db.articles.find_one({"_id": article_id})
-        if not article:
-            try:
-                article = await db.articles.find_one({"_id": ObjectId(article_id)})
-            except Exception:
-                pass
+        # Fetch article by id (int, string or ObjectId in one query)
+        article = await article_id_resolver.find_one(db.articles, article_id)
         if not article:
             logger.warning(f"⚠️ Background translate: Article not found: {article_id}")
             return
@@ -459,199 +554,165 @@ async def find_similar_articles(
         if not article or not article.get('article_vector'):
             raise HTTPException(status_code=404, detail="Article or vector not found")
         
-        # MongoDB Atlas Vector Search
-        # Note: Requires Atlas Search index on article_vector field
-        pipeline = [
-            {
-                "$search": {
-                    "knnBeta": {
-                        "vector": article['article_vector'],
-                        "path": "article_vector",
-                        "k": limit + 1  # +1 to exclude self
-                    }
-                }
-            },
-            {
-                "$match": {
-                    "_id": {"$ne": ObjectId(article_id)},  # Exclude self
-                    "status": "published"
-                }
-            },
-            {"$limit": limit}
-        ]
-        
-        similar_articles = await db.articles.aggregate(pipeline).to_list(length=limit)
+        # Atlas vector search, or the local vector index when Atlas is unavailable
+        try:
+            similar_articles = await vector_search_service.similar(
+                db, article['article_vector'], limit, exclude_id=article['_id']
+            )
+        except Exception as e:
+            logger.error(f"❌ Similar articles search error: {e}")
+            similar_articles = []
+        
+        note = None
+        if not similar_articles:
+            # Fallback to simple category match if vector search finds nothing
+            similar_articles = await db.articles.find({
+                "category": article.get('category'),
+                "_id": {"$ne": article['_id']},
+                "status": "published"
+            }).limit(limit).to_list(length=limit)
+            note = "Using fallback category matching"
         
         for art in similar_articles:
             art['_id'] = str(art['_id'])
         
-        return {
+        result = {
             "article_id": article_id,
             "similar_articles": [ArticleResponse(**art) for art in similar_articles]
         }
+        if note:
+            result["note"] = note
+        return result
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Similar articles search error: {e}")
-        # Fallback to simple category match if vector search fails
-        article = await db.articles.find_one({"_id": ObjectId(article_id)})
-        similar = await db.articles.find({
-            "category": article.get('category'),
-            "_id": {"$ne": ObjectId(article_id)},
-            "status": "published"
-        }).limit(limit).to_list(length=limit)
-        
-        for art in similar:
-            art['_id'] = str(art['_id'])
-        
-        return {
-            "article_id": article_id,
-            "similar_articles": [ArticleResponse(**art) for art in similar],
-            "note": "Using fallback category matching"
-        }
+        logger.error(f"❌ Similar articles error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/cache/stats")
+async def get_response_cache_stats(current_user: dict = Depends(get_current_admin_user)):
+    """Public response cache hit/miss statistics (Admin only)"""
+    return response_cache.stats()
 
 
 # ==================== PUBLIC ENDPOINTS (NO AUTH REQUIRED) ====================
 
-@router.get("/public/articles", response_model=List[ArticleResponse])
+@router.get("/public/articles", response_model=List[Union[ArticleResponse, ArticleCardResponse]])
 async def get_public_articles(
     category: Optional[str] = None,
+    view: str = Query("full", pattern=VIEW_PATTERN, description="`card` omits content and AI fields"),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor (overrides skip)"),
+    request: Request = None,
+    response: Response = None,
     db = Depends(get_database)
 ):
     """
     Get published articles (PUBLIC - no authentication required)
-    Used by frontend to display articles
+    Used by frontend to display articles; pass `cursor` for infinite scroll
+    and `view=card` for list views that only render title, excerpt and thumbnail
     """
     try:
+        cache_key = response_cache.make_key(
+            "public_articles", category=category, view=view, skip=skip, limit=limit, cursor=cursor
+        )
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            articles, next_cursor, etag, last_modified = cached
+            if is_not_modified(request, etag, last_modified):
+                return not_modified(etag, last_modified)
+            set_next_cursor(response, next_cursor)
+            set_cache_headers(response, etag, last_modified)
+            return articles
+        
         # Build query - only published articles
         query = {"status": "published"}
         if category and category != "All":
-            query['category'] = category
+            query['source_category'] = category
         
-        # Get articles sorted by _id (newest first - MongoDB ObjectId contains timestamp)
-        cursor = db.articles.find(query).sort('_id', -1).skip(skip).limit(limit)
-        articles = await cursor.to_list(length=limit)
+        if cursor:
+            query = apply_cursor(query, PUBLIC_ARTICLES_SORT, cursor)
+            skip = 0
         
-        # Map MongoDB fields to API schema
-        mapped_articles = []
-        for article in articles:
-            # Map category to valid enum (fallback to technology)
-            category_map = {
-                "AI Models": "technology",
-                "Tech Innovations": "technology",
-                "Blockchain": "technology",
-                "Software": "technology",
-                "Healthcare": "health",
-                "Finance": "business",
-                "Economy": "business",
-                "Politics": "politics",
-                "Sports": "sports",
-                "Entertainment": "entertainment",
-                "Science": "science",
-                "World News": "world",
-                "Local News": "local"
-            }
-            mongo_category = article.get('category', 'Technology')
-            api_category = category_map.get(mongo_category, 'technology')
-            
-            mapped = {
-                "_id": str(article['_id']),
-                "title": article.get('title', ''),
-                "slug": article.get('slug', ''),
-                "excerpt": article.get('excerpt', ''),
-                "content": article.get('content', ''),
-                "summary": article.get('excerpt', ''),
-                "category": api_category,
-                "tags": article.get('tags', []),
-                "featured_image": article.get('thumbnail', ''),
-                "language": article.get('language', 'vi'),
-                "status": article.get('status', 'draft'),
-                "author_id": str(article.get('authorId', article.get('author_id', 1))),
-                "author_name": article.get('author', article.get('author_name', 'Unknown')),
-                "view_count": article.get('views', article.get('view_count', 0)),
-                "like_count": article.get('likes', article.get('like_count', 0)),
-                "comment_count": article.get('commentsCount', article.get('comment_count', 0)),
-                "published_at": article.get('publishedAt', article.get('published_at')),
-                "created_at": article.get('createdAt', article.get('created_at')),
-                "updated_at": article.get('updatedAt', article.get('updated_at'))
-            }
-            mapped_articles.append(mapped)
+        # Read precomputed cards sorted by article _id (newest first - MongoDB ObjectId contains timestamp)
+        projection = CARD_VIEW_PROJECTION if view == "card" else None
+        db_cursor = db.article_cards.find(query, projection).sort(PUBLIC_ARTICLES_SORT).skip(skip).limit(limit)
+        cards = await db_cursor.to_list(length=limit)
+        next_cursor = build_next_cursor(cards, PUBLIC_ARTICLES_SORT, limit)
+        etag, last_modified = _listing_validators(cards, view, next_cursor)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
+        set_next_cursor(response, next_cursor)
+        set_cache_headers(response, etag, last_modified)
+        
+        articles = _public_listing(cards, view)
+        response_cache.set(cache_key, (articles, next_cursor, etag, last_modified))
         
-        logger.info(f"✅ Public articles: Found {len(mapped_articles)} published articles")
-        return [ArticleResponse(**art) for art in mapped_articles]
+        logger.info(f"✅ Public articles: Found {len(cards)} published articles")
+        return articles
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Get public articles error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/public/trending", response_model=List[ArticleResponse])
+@router.get("/public/trending", response_model=List[Union[ArticleResponse, ArticleCardResponse]])
 async def get_trending_articles(
     limit: int = Query(5, ge=1, le=20),
+    view: str = Query("full", pattern=VIEW_PATTERN, description="`card` omits content and AI fields"),
+    request: Request = None,
+    response: Response = None,
     db = Depends(get_database)
 ):
     """
-    Get trending articles (PUBLIC - sorted by views and engagement)
+    Get trending articles (PUBLIC - time-decayed engagement leaderboard)
     """
     try:
-        # Get top articles by view_count + like_count
-        cursor = db.articles.find({"status": "published"}).sort([
-            ('view_count', -1),
-            ('like_count', -1)
-        ]).limit(limit)
-        
-        articles = await cursor.to_list(length=limit)
-        
-        # Map MongoDB fields to API schema
-        mapped_articles = []
-        for article in articles:
-            # Map category to valid enum
-            category_map = {
-                "AI Models": "technology",
-                "Tech Innovations": "technology",
-                "Blockchain": "technology",
-                "Software": "technology",
-                "Healthcare": "health",
-                "Finance": "business",
-                "Economy": "business",
-                "Politics": "politics",
-                "Sports": "sports",
-                "Entertainment": "entertainment",
-                "Science": "science",
-                "World News": "world",
-                "Local News": "local"
-            }
-            mongo_category = article.get('category', 'Technology')
-            api_category = category_map.get(mongo_category, 'technology')
-            
-            mapped = {
-                "_id": str(article['_id']),
-                "title": article.get('title', ''),
-                "slug": article.get('slug', ''),
-                "excerpt": article.get('excerpt', ''),
-                "content": article.get('content', ''),
-                "summary": article.get('excerpt', ''),
-                "category": api_category,
-                "tags": article.get('tags', []),
-                "featured_image": article.get('thumbnail', ''),
-                "language": article.get('language', 'vi'),
-                "status": article.get('status', 'draft'),
-                "author_id": str(article.get('authorId', article.get('author_id', 1))),
-                "author_name": article.get('author', article.get('author_name', 'Unknown')),
-                "view_count": article.get('views', article.get('view_count', 0)),
-                "like_count": article.get('likes', article.get('like_count', 0)),
-                "comment_count": article.get('commentsCount', article.get('comment_count', 0)),
-                "published_at": article.get('publishedAt', article.get('published_at')),
-                "created_at": article.get('createdAt', article.get('created_at')),
-                "updated_at": article.get('updatedAt', article.get('updated_at'))
-            }
-            mapped_articles.append(mapped)
-        
-        logger.info(f"✅ Trending articles: Found {len(mapped_articles)} articles")
-        return [ArticleResponse(**art) for art in mapped_articles]
+        cache_key = response_cache.make_key("public_trending", limit=limit, view=view)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            articles, etag, last_modified = cached
+            if is_not_modified(request, etag, last_modified):
+                return not_modified(etag, last_modified)
+            set_cache_headers(response, etag, last_modified)
+            return articles
+        
+        # Leaderboard ids, best first; extra ids cover unpublished / deleted articles
+        projection = CARD_VIEW_PROJECTION if view == "card" else None
+        ranked_ids = trending_service.top(limit * 2)
+        cards = []
+        if ranked_ids:
+            found = await db.article_cards.find(
+                {"_id": {"$in": ranked_ids}, "status": "published"}, projection
+            ).to_list(length=len(ranked_ids))
+            by_id = {card['_id']: card for card in found}
+            cards = [by_id[i] for i in ranked_ids if i in by_id][:limit]
+        
+        # Not enough recent activity (e.g. cold start): fill with all-time popularity
+        if len(cards) < limit:
+            cursor = db.article_cards.find(
+                {"status": "published", "_id": {"$nin": [card['_id'] for card in cards]}}, projection
+            ).sort([
+                ('view_count', -1),
+                ('like_count', -1)
+            ]).limit(limit - len(cards))
+            cards += await cursor.to_list(length=limit - len(cards))
+        
+        etag, last_modified = _listing_validators(cards, view)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
+        set_cache_headers(response, etag, last_modified)
+        
+        articles = _public_listing(cards, view)
+        response_cache.set(cache_key, (articles, etag, last_modified))
+        
+        logger.info(f"✅ Trending articles: Found {len(cards)} articles")
+        return articles
         
     except Exception as e:
         logger.error(f"❌ Get trending articles error: {e}")
@@ -664,25 +725,19 @@ async def get_public_categories(db = Depends(get_database)):
     Get all available categories with article count (PUBLIC)
     """
     try:
-        # Aggregate articles by category
-        pipeline = [
-            {"$match": {"status": "published"}},
-            {"$group": {
-                "_id": "$category",
-                "count": {"$sum": 1}
-            }},
-            {"$sort": {"count": -1}}
-        ]
-        
-        result = await db.articles.aggregate(pipeline).to_list(length=None)
-        
-        categories = [
-            {"name": cat["_id"], "count": cat["count"]}
-            for cat in result
-        ]
+        cache_key = response_cache.make_key("public_categories")
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Read incrementally maintained per-category counters
+        categories = await category_count_service.published_categories(db)
+        
+        result = {"categories": categories}
+        response_cache.set(cache_key, result)
         
         logger.info(f"✅ Public categories: Found {len(categories)} categories")
-        return {"categories": categories}
+        return result
         
     except Exception as e:
         logger.error(f"❌ Get public categories error: {e}")
@@ -690,92 +745,49 @@ async def get_public_categories(db = Depends(get_database)):
 
 
 @router.get("/public/articles/{article_id}", response_model=ArticleResponse)
-async def get_public_article_by_id(article_id: str, db = Depends(get_database)):
+async def get_public_article_by_id(
+    article_id: str,
+    request: Request,
+    response: Response,
+    db = Depends(get_database)
+):
+    """
+    Get a published article (PUBLIC). Supports conditional GET: the ETag is a
+    weak validator of the card's content hash, so live view/like counters
+    (part of the body) do not change it.
+    """
     try:
-        # Try all possible _id types: int, string, ObjectId
-        article = None
-        # Try int
-        try:
-            query_id = int(article_id)
-            article = await db.articles.find_one({"_id": query_id, "status": "published"})
-        except Exception:
-            pass
-        # Try string
-        if not article:
-            article = await db.articles.find_one({"_id": article_id, "status": "published"})
-        # Try ObjectId
-        if not article:
-            try:
-                article = await db.articles.find_one({"_id": ObjectId(article_id), "status": "published"})
-            except Exception:
-                pass
-        if not article:
-            raise HTTPException(status_code=404, detail="Article not found")
-
-        # Increment view count
-        await db.articles.update_one(
-            {"_id": article['_id']},
-            {"$inc": {"view_count": 1}}
-        )
-        article['view_count'] = article.get('view_count', 0) + 1
-
-        # Map category
-        category_map = {
-            "AI Models": "technology",
-            "Tech Innovations": "technology",
-            "Blockchain": "technology",
-            "Software": "technology",
-            "Healthcare": "health",
-            "Finance": "business",
-            "Economy": "business",
-            "Politics": "politics",
-            "Sports": "sports",
-            "Entertainment": "entertainment",
-            "Science": "science",
-            "World News": "world",
-            "Local News": "local"
-        }
-        mongo_category = article.get('category', 'Technology')
-        api_category = category_map.get(mongo_category, 'technology')
-
-        # Parse datetime fields
-        from datetime import datetime
-        def parse_dt(val):
-            if isinstance(val, datetime):
-                return val
-            if isinstance(val, str):
-                try:
-                    # Handle ISO8601 with Z (UTC)
-                    if val.endswith('Z'):
-                        val = val.replace('Z', '+00:00')
-                    return datetime.fromisoformat(val)
-                except Exception:
-                    return None
-            return None
-
-        mapped = {
-            "_id": str(article['_id']),
-            "title": article.get('title', ''),
-            "slug": article.get('slug', ''),
-            "excerpt": article.get('excerpt', ''),
-            "content": article.get('content', ''),
-            "summary": article.get('excerpt', ''),
-            "category": api_category,
-            "tags": article.get('tags', []),
-            "featured_image": article.get('thumbnail', ''),
-            "language": article.get('language', 'vi'),
-            "status": article.get('status', 'draft'),
-            "author_id": str(article.get('authorId', article.get('author_id', 1))),
-            "author_name": article.get('author', article.get('author_name', 'Unknown')),
-            "view_count": article.get('view_count', 0),
-            "like_count": article.get('like_count', 0),
-            "comment_count": article.get('comment_count', 0),
-            "published_at": parse_dt(article.get('published_at') or article.get('publishedAt')), 
-            "created_at": parse_dt(article.get('created_at') or article.get('createdAt')), 
-            "updated_at": parse_dt(article.get('updated_at') or article.get('updatedAt'))
-        }
-        logger.info(f"✅ Public article: {article_id} - {mapped['title'][:50]} - Views: {mapped['view_count']}")
-        return ArticleResponse(**mapped)
+        cache_key = response_cache.make_key("public_article", article_id=article_id)
+        cached = response_cache.get(cache_key)
+        
+        # Cards are keyed by the string form of the article _id
+        if cached is not None:
+            card = dict(cached)
+        else:
+            card = await db.article_cards.find_one({"_id": article_id, "status": "published"})
+        if not card:
+            # Card missing (not yet built) - resolve int / string / ObjectId _id in one query
+            article = await article_id_resolver.find_one(db.articles, article_id, {"status": "published"})
+            if not article:
+                raise HTTPException(status_code=404, detail="Article not found")
+            card = await article_card_service.upsert(db, article) or build_article_card(article)
+        if cached is None:
+            # Cached without buffered views; view_counter drops the entry when it flushes
+            response_cache.set(cache_key, dict(card))
+
+        # Buffer the view (flushed in bulk) and include unflushed views in the response
+        view_counter.record(card['article_id'])
+        trending_service.record_view(card['_id'])
+        dashboard_live.record_view(card['_id'])
+        card['view_count'] = card.get('view_count', 0) + view_counter.pending(card['article_id'])
+
+        etag, last_modified = weak_etag(card_etag(card)), card_last_modified(card)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
+        set_cache_headers(response, etag, last_modified)
+
+        logger.info(f"✅ Public article: {article_id} - {card['title'][:50]} - Views: {card['view_count']}")
+        return ArticleResponse(**card)
     except HTTPException:
         raise
     except Exception as e:
@@ -783,24 +795,31 @@ async def get_public_article_by_id(article_id: str, db = Depends(get_database)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _translation_response(request: Request, response: Response, translation: TranslationResponse):
+    """Attach ETag / Last-Modified to a stored translation (304 when the client copy is current)"""
+    etag = make_etag(translation.article_id, translation.target_language, translation.translated_at)
+    if is_not_modified(request, etag, translation.translated_at):
+        return not_modified(etag, translation.translated_at)
+    set_cache_headers(response, etag, translation.translated_at)
+    return translation
+
+
+@router.get("/public/articles/{article_id}/translate/{lang}", response_model=TranslationResponse)
 @router.post("/public/articles/{article_id}/translate/{lang}", response_model=TranslationResponse)
-async def public_translate_article(article_id: str, lang: str, db = Depends(get_database)):
-    """Public endpoint: return (and create if needed) a translated version of an article."""
+async def public_translate_article(
+    article_id: str,
+    lang: str,
+    request: Request,
+    response: Response,
+    db = Depends(get_database)
+):
+    """Public endpoint: return (and create if needed) a translated version of an article.
+
+    GET requests honor If-None-Match / If-Modified-Since for stored translations.
+    """
     try:
-        # Fetch article (try int/string/ObjectId as earlier)
-        article = None
-        try:
-            query_id = int(article_id)
-            article = await db.articles.find_one({"_id": query_id, "status": "published"})
-        except Exception:
-            pass
-        if not article:
-            article = await db.articles.find_one({"_id": article_id, "status": "published"})
-        if not article:
-            try:
-                article = await db.articles.find_one({"_id": ObjectId(article_id), "status": "published"})
-            except Exception:
-                pass
+        # Fetch article (int / string / ObjectId _id resolved in one query)
+        article = await article_id_resolver.find_one(db.articles, article_id, {"status": "published"})
         if not article:
             raise HTTPException(status_code=404, detail="Article not found")
 
@@ -810,7 +829,7 @@ async def public_translate_article(article_id: str, lang: str, db = Depends(get_
                 article_id_str = str(article['_id'])
                 tr = await db.english_trans.find_one({"article_id": article_id_str})
                 if tr:
-                    return TranslationResponse(
+                    return _translation_response(request, response, TranslationResponse(
                         article_id=article_id_str,
                         original_language=article.get('language', 'vi'),
                         target_language=lang,
@@ -819,12 +838,12 @@ async def public_translate_article(article_id: str, lang: str, db = Depends(get_
                         translated_summary=tr.get('excerpt'),
                         translated_at=tr.get('translated_at'),
                         translated_by=tr.get('translated_by')
-                    )
+                    ))
             except Exception:
                 # If english_trans collection is missing or query fails, fall back to checking embedded field
                 tr = article.get('english_trans')
                 if tr:
-                    return TranslationResponse(
+                    return _translation_response(request, response, TranslationResponse(
                         article_id=str(article['_id']),
                         original_language=article.get('language', 'vi'),
                         target_language=lang,
@@ -833,12 +852,12 @@ async def public_translate_article(article_id: str, lang: str, db = Depends(get_
                         translated_summary=tr.get('excerpt'),
                         translated_at=tr.get('translated_at'),
                         translated_by=tr.get('translated_by')
-                    )
+                    ))
         else:
             translations = article.get('translations', {}) or {}
             if lang in translations:
                 tr = translations[lang]
-                return TranslationResponse(
+                return _translation_response(request, response, TranslationResponse(
                     article_id=str(article['_id']),
                     original_language=article.get('language', 'vi'),
                     target_language=lang,
@@ -847,7 +866,7 @@ async def public_translate_article(article_id: str, lang: str, db = Depends(get_
                     translated_summary=tr.get('excerpt'),
                     translated_at=tr.get('translated_at'),
                     translated_by=tr.get('translated_by')
-                )
+                ))
 
         # Otherwise, perform translation (prefer Google Cloud, fallback to Gemini)
         from app.services.google_service import google_service, gemini_service
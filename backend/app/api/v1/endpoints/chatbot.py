@@ -1,67 +1,78 @@
 """
 Chatbot API Endpoints
 """
+from typing import AsyncIterator
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from loguru import logger
 
 from app.models.schemas import ChatRequest, ChatResponse, ArticleResponse
 from app.core.database import get_database
+from app.core.sse import SSE_HEADERS, sse_event
 
 # 👇 THAY THẾ OPENAI BẰNG GEMINI 👇
 from app.services.google_service import gemini_service 
+from app.services.vector_search import vector_search_service
+from app.services.article_chunks import article_chunk_service
+from app.services.embedding_cache import embedding_cache
 
 router = APIRouter()
 
-@router.post("/chat", response_model=ChatResponse)
-async def chat_with_ai(request: ChatRequest, db = Depends(get_database)):
-    """Chat with AI assistant (RAG-based using Gemini)"""
+ERROR_MESSAGE = "Xin lỗi, tôi đang gặp sự cố kỹ thuật. Vui lòng thử lại sau."
+
+async def _prepare_chat(request: ChatRequest, db):
+    """Retrieve context for the question; returns (messages, context, related articles, sources)"""
+    # 👇 ĐÃ ĐỔI SANG GEMINI 👇
+    passages = []
+    relevant_articles = []
     try:
-        # 👇 ĐÃ ĐỔI SANG GEMINI 👇
+        # Best passages under the context token budget; whole articles if none are chunked yet
         query_embedding = await gemini_service.create_embedding(request.message)
-        
-        try:
-            pipeline = [
-                {"$search": {
-                    "knnBeta": {
-                        "vector": query_embedding,
-                        "path": "article_vector", 
-                        "k": 3
-                    }
-                }},
-                { "$match": { "status": "published" }},
-                { "$project": { "title": 1, "summary": 1, "content": 1, "score": {"$meta": "searchScore"} }},
-                {"$limit": 3}
-            ]
-            relevant_articles = await db.articles.aggregate(pipeline).to_list(length=3)
-        except Exception as vector_error:
-            logger.warning(f"⚠️ Vector search failed: {vector_error}, using text search")
-            relevant_articles = await db.articles.find(
-                {"$text": {"$search": request.message}, "status": "published"}
-            ).limit(3).to_list(length=3)
-        
-        context = ""
-        related_articles = []
-        sources = []
-        for article in relevant_articles:
+        passages, relevant_articles = await article_chunk_service.retrieve(db, query_embedding)
+        if not passages:
+            relevant_articles = await vector_search_service.similar(db, query_embedding, 3)
+    except Exception as vector_error:
+        logger.warning(f"⚠️ Vector search failed: {vector_error}, using text search")
+    
+    if not relevant_articles:
+        relevant_articles = await db.articles.find(
+            {"$text": {"$search": request.message}, "status": "published"}
+        ).limit(3).to_list(length=3)
+    
+    context = ""
+    for passage in passages:
+        context += f"\nBài viết: {passage['title']}\nĐoạn trích: {passage['text']}\n"
+    related_articles = []
+    sources = []
+    for article in relevant_articles:
+        if not passages:
             context += f"\nBài viết: {article['title']}\nNội dung: {article.get('content', '')[:500]}...\n"
-            article['_id'] = str(article['_id'])
-            related_articles.append(ArticleResponse(**article))
-            sources.append(article['title'])
+        article['_id'] = str(article['_id'])
+        related_articles.append(ArticleResponse(**article))
+        sources.append(article['title'])
+    
+    # Format messages for Gemini service
+    messages = []
+    try:
+        # Get last 5 messages from history
+        for msg in request.conversation_history[-5:]:
+            role = msg.role if hasattr(msg, 'role') else ('assistant' if getattr(msg, 'type', '') == 'bot' else 'user')
+            content = msg.content if hasattr(msg, 'content') else str(msg)
+            messages.append({"role": role, "content": content})
+    except Exception as e:
+        logger.warning(f"⚠️ Error processing history: {e}")
+        # Continue with empty history if there's an error
         
-        # Format messages for Gemini service
-        messages = []
-        try:
-            # Get last 5 messages from history
-            for msg in request.conversation_history[-5:]:
-                role = msg.role if hasattr(msg, 'role') else ('assistant' if getattr(msg, 'type', '') == 'bot' else 'user')
-                content = msg.content if hasattr(msg, 'content') else str(msg)
-                messages.append({"role": role, "content": content})
-        except Exception as e:
-            logger.warning(f"⚠️ Error processing history: {e}")
-            # Continue with empty history if there's an error
-            
-        # Add current message
-        messages.append({"role": "user", "content": request.message})
+    # Add current message
+    messages.append({"role": "user", "content": request.message})
+    return messages, context, related_articles, sources
+
+
+@router.post("/chat", response_model=ChatResponse)
+async def chat_with_ai(request: ChatRequest, db = Depends(get_database)):
+    """Chat with AI assistant (RAG-based using Gemini)"""
+    try:
+        messages, context, related_articles, sources = await _prepare_chat(request, db)
         
         # 👇 ĐÃ ĐỔI SANG GEMINI 👇
         ai_response = await gemini_service.chat_completion(
@@ -76,18 +87,55 @@ async def chat_with_ai(request: ChatRequest, db = Depends(get_database)):
     except Exception as e:
         logger.error(f"❌ Chatbot error: {e}")
         return ChatResponse(
-            message="Xin lỗi, tôi đang gặp sự cố kỹ thuật. Vui lòng thử lại sau.",
+            message=ERROR_MESSAGE,
             related_articles=[],
             sources=[]
         )
 
+
+async def _chat_events(request: ChatRequest, db) -> AsyncIterator[str]:
+    """SSE frames: `context` (related articles, sources), `token` chunks, then `done` with the full answer"""
+    try:
+        messages, context, related_articles, sources = await _prepare_chat(request, db)
+        yield sse_event("context", {
+            "related_articles": [article.model_dump() for article in related_articles],
+            "sources": sources
+        })
+        
+        answer = []
+        async for text in gemini_service.stream_chat_completion(messages=messages, context=context):
+            answer.append(text)
+            yield sse_event("token", {"text": text})
+        
+        yield sse_event("done", {"message": "".join(answer)})
+        logger.info("✅ Chatbot (Gemini) streamed a response.")
+        
+    except Exception as e:
+        logger.error(f"❌ Chatbot stream error: {e}")
+        yield sse_event("error", {"message": ERROR_MESSAGE})
+
+
+@router.post("/chat/stream")
+async def chat_with_ai_stream(request: ChatRequest, db = Depends(get_database)):
+    """Chat with AI assistant, streamed over server-sent events (`context`, `token`..., `done`)"""
+    return StreamingResponse(
+        _chat_events(request, db),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
 @router.get("/health")
 async def chatbot_health():
     """Check chatbot health"""
     try:
         # 👇 ĐÃ ĐỔI SANG GEMINI 👇
         test_response = await gemini_service.generate_text("Say 'OK' if you are working", max_tokens=5)
-        return {"status": "healthy", "ai_service": "Gemini (operational)", "test_response": test_response}
+        return {
+            "status": "healthy",
+            "ai_service": "Gemini (operational)",
+            "test_response": test_response,
+            "embedding_cache": embedding_cache.stats()
+        }
     except Exception as e:
         logger.error(f"❌ Chatbot health check failed: {e}")
         return {"status": "unhealthy", "error": str(e)}
\ No newline at end of file
@@ -1,7 +1,7 @@
 """
 Comments API Endpoints
 """
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from typing import List, Optional
 from datetime import datetime
 from bson import ObjectId
@@ -9,11 +9,17 @@ from loguru import logger
 
 from app.models.schemas import CommentCreate, CommentResponse
 from app.core.database import get_database
+from app.core.pagination import apply_cursor, build_next_cursor, set_next_cursor
 from app.core.security import get_current_user, get_current_admin_user
 from app.services.google_service import google_service
+from app.services.article_cards import article_card_service
+from app.services.trending import trending_service
+from app.services.dashboard_live import dashboard_live
 
 router = APIRouter()
 
+COMMENTS_SORT = [('created_at', -1), ('_id', -1)]
+
 
 @router.post("/", response_model=CommentResponse)
 async def create_comment(
@@ -51,6 +57,9 @@ async def create_comment(
             {"_id": ObjectId(comment_data.article_id)},
             {"$inc": {"comment_count": 1}}
         )
+        await article_card_service.increment(db, comment_data.article_id, "comment_count")
+        trending_service.record_event(comment_data.article_id, "comment")
+        dashboard_live.record_comment(sentiment_result['sentiment'])
         
         comment_dict['_id'] = comment_id
         
@@ -73,6 +82,8 @@ async def get_comments(
     is_flagged: Optional[bool] = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor (overrides skip)"),
+    response: Response = None,
     db = Depends(get_database)
 ):
     """Get comments with filters"""
@@ -88,15 +99,21 @@ async def get_comments(
         if is_flagged is not None:
             query['is_flagged'] = is_flagged
         
-        # Get comments
-        cursor = db.comments.find(query).sort('created_at', -1).skip(skip).limit(limit)
-        comments = await cursor.to_list(length=limit)
+        # Get comments (keyset pagination when a cursor is given)
+        if cursor:
+            query = apply_cursor(query, COMMENTS_SORT, cursor)
+            skip = 0
+        db_cursor = db.comments.find(query).sort(COMMENTS_SORT).skip(skip).limit(limit)
+        comments = await db_cursor.to_list(length=limit)
+        set_next_cursor(response, build_next_cursor(comments, COMMENTS_SORT, limit))
         
         for comment in comments:
             comment['_id'] = str(comment['_id'])
         
         return [CommentResponse(**comment) for comment in comments]
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Get comments error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -107,18 +124,27 @@ async def get_article_comments(
     article_id: str,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor (overrides skip)"),
+    response: Response = None,
     db = Depends(get_database)
 ):
     """Get all comments for an article"""
     try:
-        cursor = db.comments.find({"article_id": article_id}).sort('created_at', -1).skip(skip).limit(limit)
-        comments = await cursor.to_list(length=limit)
+        query = {"article_id": article_id}
+        if cursor:
+            query = apply_cursor(query, COMMENTS_SORT, cursor)
+            skip = 0
+        db_cursor = db.comments.find(query).sort(COMMENTS_SORT).skip(skip).limit(limit)
+        comments = await db_cursor.to_list(length=limit)
+        set_next_cursor(response, build_next_cursor(comments, COMMENTS_SORT, limit))
         
         for comment in comments:
             comment['_id'] = str(comment['_id'])
         
         return [CommentResponse(**comment) for comment in comments]
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Get article comments error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -149,6 +175,8 @@ async def delete_comment(
             {"_id": ObjectId(comment['article_id'])},
             {"$inc": {"comment_count": -1}}
         )
+        await article_card_service.increment(db, comment['article_id'], "comment_count", -1)
+        dashboard_live.record_comment(comment.get('sentiment'), -1)
         
         return {"success": True, "message": "Comment deleted"}
         
@@ -1,7 +1,7 @@
 """
 Users API Endpoints
 """
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from typing import List, Optional
 from datetime import datetime
 from bson import ObjectId
@@ -9,10 +9,13 @@ from loguru import logger
 
 from app.models.schemas import UserResponse, UserUpdate
 from app.core.database import get_database
+from app.core.pagination import apply_cursor, build_next_cursor, set_next_cursor
 from app.core.security import get_current_user, get_current_admin_user
 
 router = APIRouter()
 
+USERS_SORT = [('_id', 1)]
+
 
 @router.get("/", response_model=List[UserResponse])
 async def get_users(
@@ -20,6 +23,8 @@ async def get_users(
     is_active: Optional[bool] = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor (overrides skip)"),
+    response: Response = None,
     current_user: dict = Depends(get_current_admin_user),
     db = Depends(get_database)
 ):
@@ -31,8 +36,12 @@ async def get_users(
         if is_active is not None:
             query['is_active'] = is_active
         
-        cursor = db.users.find(query).skip(skip).limit(limit)
-        users = await cursor.to_list(length=limit)
+        if cursor:
+            query = apply_cursor(query, USERS_SORT, cursor)
+            skip = 0
+        db_cursor = db.users.find(query).sort(USERS_SORT).skip(skip).limit(limit)
+        users = await db_cursor.to_list(length=limit)
+        set_next_cursor(response, build_next_cursor(users, USERS_SORT, limit))
         
         for user in users:
             user['_id'] = str(user['_id'])
@@ -40,6 +49,8 @@ async def get_users(
         
         return [UserResponse(**user) for user in users]
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Get users error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,58 @@
+"""
+Passage Chunking Helpers - overlapping passages on paragraph / sentence boundaries
+"""
+import re
+from typing import List
+
+
+_PARAGRAPH = re.compile(r"\n\s*\n")
+_SENTENCE = re.compile(r"(?<=[.!?…])\s+")
+
+# Rough size of a token for Latin-script (incl. Vietnamese) text
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count (no tokenizer round-trip)"""
+    return max(1, len(text or "") // CHARS_PER_TOKEN)
+
+
+def _units(text: str, size: int) -> List[str]:
+    """Paragraphs, split into sentences (then hard-split) when longer than `size`"""
+    units = []
+    for paragraph in _PARAGRAPH.split(text or ""):
+        paragraph = " ".join(paragraph.split())
+        if not paragraph:
+            continue
+        if len(paragraph) <= size:
+            units.append(paragraph)
+            continue
+        for sentence in _SENTENCE.split(paragraph):
+            units.extend(sentence[i:i + size] for i in range(0, len(sentence), size))
+    return units
+
+
+def _tail(text: str, overlap: int) -> str:
+    """Last `overlap` characters of `text`, starting at a sentence (else word) boundary"""
+    if overlap <= 0 or len(text) <= overlap:
+        return text if overlap > 0 else ""
+    tail = text[-overlap:]
+    sentences = _SENTENCE.split(tail, maxsplit=1)
+    if len(sentences) == 2 and sentences[1]:
+        return sentences[1]
+    return tail.split(" ", 1)[1] if " " in tail else ""
+
+
+def split_passages(text: str, size: int, overlap: int) -> List[str]:
+    """Passages of about `size` characters; each starts with up to `overlap` trailing characters of the previous one"""
+    passages: List[str] = []
+    current = ""
+    for unit in _units(text, size):
+        if current and len(current) + 1 + len(unit) > size:
+            passages.append(current)
+            carried = _tail(current, overlap)
+            current = carried if len(carried) + 1 + len(unit) <= size else ""
+        current = f"{current} {unit}" if current else unit
+    if current:
+        passages.append(current)
+    return passages
@@ -51,6 +51,66 @@ class Settings(BaseSettings):
     RABBITMQ_USER: str = "guest"
     RABBITMQ_PASSWORD: str = "guest"
     RABBITMQ_VHOST: str = "/"
+    RABBITMQ_MAX_RETRIES: int = 5  # failed batch messages, then moved to `<queue>.dead`
+    
+    # View counter (write-behind buffer)
+    VIEW_COUNTER_FLUSH_SECONDS: int = 5
+    VIEW_COUNTER_MAX_PENDING: int = 1000
+    
+    # Article ID resolver (LRU of external id → _id type)
+    ID_RESOLVER_CACHE_SIZE: int = 10000
+    
+    # Public response cache
+    RESPONSE_CACHE_TTL_SECONDS: int = 30
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1000
+    
+    # Analytics ingestion buffer
+    ANALYTICS_FLUSH_SECONDS: int = 2
+    ANALYTICS_MAX_PENDING: int = 500
+    ANALYTICS_MAX_BUFFERED: int = 50000
+    ANALYTICS_BATCH_MAX_EVENTS: int = 500
+    ANALYTICS_QUEUE_ENABLED: bool = False  # publish to RabbitMQ; requires `python -m app.worker analytics`
+    ANALYTICS_WORKER_BATCH_SIZE: int = 500
+    ANALYTICS_WORKER_MAX_WAIT_SECONDS: float = 1.0
+    
+    # Trending leaderboard (time-decayed)
+    TRENDING_HALF_LIFE_HOURS: float = 24
+    TRENDING_CAPACITY: int = 200
+    TRENDING_REFRESH_SECONDS: int = 30
+    TRENDING_REBUILD_SECONDS: int = 900
+    
+    # Analytics cold storage (Parquet, requires pyarrow)
+    ANALYTICS_ARCHIVE_ENABLED: bool = False
+    ANALYTICS_ARCHIVE_DIR: str = "data/analytics_archive"
+    ANALYTICS_RETENTION_DAYS: int = 90
+    ANALYTICS_ARCHIVE_INTERVAL_HOURS: int = 6
+    
+    # Admin dashboard snapshot
+    DASHBOARD_SNAPSHOT_SECONDS: int = 60
+    DASHBOARD_LIVE_TICK_SECONDS: float = 2
+    DASHBOARD_LIVE_QUEUE_SIZE: int = 100
+    
+    # Category counters reconciliation
+    CATEGORY_COUNTS_RECONCILE_SECONDS: int = 3600
+    
+    # Embeddings & vector search
+    GEMINI_EMBEDDING_MODEL: str = "models/text-embedding-004"
+    EMBEDDING_DIMENSIONS: int = 768
+    EMBEDDING_BATCH_SIZE: int = 32  # texts per embedding API call
+    EMBEDDING_WORKER_MAX_WAIT_SECONDS: float = 2.0
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 5000  # in-process LRU in front of `embedding_cache`
+    VECTOR_SEARCH_BACKEND: str = "auto"  # auto (Atlas, local fallback) | atlas | local
+    VECTOR_INDEX_PATH: str = "data/vector_index"  # empty = keep the local index in memory only
+    VECTOR_INDEX_REFRESH_SECONDS: int = 60
+    VECTOR_INDEX_IVF_MIN_SIZE: int = 20000
+    VECTOR_INDEX_NPROBE: int = 8
+    CHUNK_CHARS: int = 1000  # passage length (characters) in `article_chunks`
+    CHUNK_OVERLAP_CHARS: int = 200
+    CHATBOT_PASSAGE_CANDIDATES: int = 24  # nearest passages considered per question
+    CHATBOT_CONTEXT_TOKEN_BUDGET: int = 1500  # approximate tokens of passages in the prompt
+    
+    # Admin data exports (NDJSON / CSV streaming)
+    EXPORT_BATCH_SIZE: int = 1000
     
     # Redis
     REDIS_HOST: str = "localhost"
@@ -14,6 +14,8 @@ class Database:
     # Keep client without type annotation to avoid runtime typing issues
     client = None
     db = None
+    # None = unknown, False = standalone server (no multi-document transactions)
+    transactions_supported = None
 
 
 db_instance = Database()
@@ -61,48 +63,75 @@ async def close_mongo_connection():
         logger.info("✅ Closed MongoDB connection")
 
 
-async def create_indexes():
-    """Create database indexes for optimal performance"""
-    db = db_instance.db
-    if db is None:
-        logger.warning("⚠️ Skipping index creation because DB is not connected")
-        return
-
-    # Users collection indexes
-    await db.users.create_indexes([
+# Index definitions per collection. Compound indexes follow the endpoint query
+# shapes (equality fields first, then the sort keys); `index_audit.py` checks them.
+COLLECTION_INDEXES = {
+    "users": [
         IndexModel([("email", ASCENDING)], unique=True),
         IndexModel([("username", ASCENDING)], unique=True),
         IndexModel([("created_at", DESCENDING)]),
-    ])
-
-    # Articles collection indexes
-    await db.articles.create_indexes([
+    ],
+    "articles": [
         IndexModel([("slug", ASCENDING)], unique=True),
-        IndexModel([("status", ASCENDING)]),
-        IndexModel([("category", ASCENDING)]),
         IndexModel([("author_id", ASCENDING)]),
         IndexModel([("published_at", DESCENDING)]),
-        IndexModel([("created_at", DESCENDING)]),
         IndexModel([("title", TEXT), ("content", TEXT), ("summary", TEXT)]),  # Full-text search
         IndexModel([("tags", ASCENDING)]),
+        # Admin listing: optional status / category filter, newest first
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("status", ASCENDING), ("category", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("category", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+        # Popular published articles (recommendation fallback)
+        IndexModel([("status", ASCENDING), ("view_count", DESCENDING), ("like_count", DESCENDING)]),
         # Vector search index will be created via Atlas UI
-    ])
-
-    # Comments collection indexes
-    await db.comments.create_indexes([
-        IndexModel([("article_id", ASCENDING)]),
-        IndexModel([("user_id", ASCENDING)]),
-        IndexModel([("created_at", DESCENDING)]),
+    ],
+    # Article cards (public read model)
+    "article_cards": [
+        IndexModel([("status", ASCENDING), ("article_id", DESCENDING)]),
+        IndexModel([("status", ASCENDING), ("source_category", ASCENDING), ("article_id", DESCENDING)]),
+        IndexModel([("status", ASCENDING), ("view_count", DESCENDING), ("like_count", DESCENDING)]),
+    ],
+    # Passages for chatbot retrieval (`<article_id>:<chunk_index>`)
+    "article_chunks": [
+        IndexModel([("article_id", ASCENDING), ("chunk_index", ASCENDING)]),
+        IndexModel([("vector_updated_at", ASCENDING)]),
+    ],
+    "comments": [
         IndexModel([("sentiment", ASCENDING)]),
-    ])
-
-    # Analytics collection indexes
-    await db.analytics.create_indexes([
-        IndexModel([("article_id", ASCENDING)]),
+        # Listings are sorted newest first with `_id` as tie-breaker
+        IndexModel([("article_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+    ],
+    "analytics": [
         IndexModel([("user_id", ASCENDING)]),
-        IndexModel([("event_type", ASCENDING)]),
         IndexModel([("timestamp", DESCENDING)]),
-    ])
+        # Per-article stats (shares, read time) and time-windowed event scans
+        IndexModel([("article_id", ASCENDING), ("event_type", ASCENDING)]),
+        IndexModel([("event_type", ASCENDING), ("timestamp", DESCENDING)]),
+    ],
+    # Daily HyperLogLog reader sketches (`_id` is "<article_id>:<YYYY-MM-DD>")
+    "reader_sketches": [
+        IndexModel([("article_id", ASCENDING), ("day", ASCENDING)]),
+    ],
+    # Hourly per-article counters (`_id` is {article_id, event_type, hour})
+    "analytics_rollups": [
+        IndexModel([("article_id", ASCENDING), ("event_type", ASCENDING), ("hour", DESCENDING)]),
+        IndexModel([("event_type", ASCENDING), ("hour", DESCENDING)]),
+    ],
+}
+
+
+async def create_indexes():
+    """Create database indexes for optimal performance"""
+    db = db_instance.db
+    if db is None:
+        logger.warning("⚠️ Skipping index creation because DB is not connected")
+        return
+
+    for collection, indexes in COLLECTION_INDEXES.items():
+        await db[collection].create_indexes(indexes)
 
     # English translations collection (separate collection linked by article_id)
     try:
@@ -117,6 +146,43 @@ async def create_indexes():
     logger.info("✅ Created MongoDB indexes")
 
 
+def _is_transaction_unsupported(error: OperationFailure) -> bool:
+    """Standalone mongod rejects sessions with transactions (IllegalOperation)"""
+    return error.code == 20 or "Transaction numbers are only allowed" in str(error)
+
+
+async def run_in_transaction(db, func):
+    """Run `await func(session)` in a multi-document transaction when the server supports it.
+
+    Falls back to `await func(None)` on standalone deployments (self-hosted dev Mongo).
+    """
+    if db_instance.transactions_supported is not False:
+        try:
+            async with await db.client.start_session() as session:
+                async with session.start_transaction():
+                    return await func(session)
+        except OperationFailure as e:
+            if not _is_transaction_unsupported(e):
+                raise
+            db_instance.transactions_supported = False
+            logger.info("ℹ️ MongoDB transactions unavailable (standalone server) - writing without them")
+    return await func(None)
+
+
+def run_in_transaction_sync(db, func):
+    """Synchronous (pymongo) variant of `run_in_transaction`"""
+    if db_instance.transactions_supported is not False:
+        try:
+            with db.client.start_session() as session:
+                with session.start_transaction():
+                    return func(session)
+        except OperationFailure as e:
+            if not _is_transaction_unsupported(e):
+                raise
+            db_instance.transactions_supported = False
+    return func(None)
+
+
 def get_database():
     """Dependency to get database instance
 
@@ -0,0 +1,103 @@
+"""
+Streaming Data Export Helpers (NDJSON / CSV)
+"""
+import csv
+import io
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, AsyncIterator, List
+
+from bson import ObjectId
+from fastapi.responses import StreamingResponse
+from loguru import logger
+
+from app.core.config import settings
+
+
+FORMAT_PATTERN = "^(ndjson|csv)$"
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def to_jsonable(value: Any) -> Any:
+    """Convert BSON values (ObjectId, datetime, nested documents) to JSON types"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, dict):
+        return {str(k): to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(v) for v in value]
+    return value
+
+
+def _csv_cell(value: Any) -> Any:
+    """Scalars as-is, nested documents / arrays as compact JSON"""
+    value = to_jsonable(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    return "" if value is None else value
+
+
+async def _ndjson_chunks(cursor, chunk_docs: int) -> AsyncIterator[bytes]:
+    lines: List[str] = []
+    async for doc in cursor:
+        lines.append(json.dumps(to_jsonable(doc), ensure_ascii=False))
+        if len(lines) >= chunk_docs:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+async def _csv_chunks(cursor, fields: List[str], chunk_docs: int) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    rows = 0
+    async for doc in cursor:
+        writer.writerow([_csv_cell(doc.get(field)) for field in fields])
+        rows += 1
+        if rows >= chunk_docs:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            rows = 0
+    yield buffer.getvalue().encode("utf-8")
+
+
+async def _stream(cursor, fmt: str, fields: List[str], name: str) -> AsyncIterator[bytes]:
+    chunk_docs = settings.EXPORT_BATCH_SIZE
+    chunks = _ndjson_chunks(cursor, chunk_docs) if fmt == "ndjson" else _csv_chunks(cursor, fields, chunk_docs)
+    try:
+        async for chunk in chunks:
+            yield chunk
+    except Exception as e:
+        # Headers are already sent: the client sees a truncated body
+        logger.error(f"❌ Export {name} failed mid-stream: {e}")
+        raise
+    finally:
+        await cursor.close()
+
+
+def streaming_export(cursor, fmt: str, fields: List[str], name: str) -> StreamingResponse:
+    """Stream a Motor cursor as NDJSON or CSV, one batch in memory at a time.
+
+    `fields` are the CSV columns (NDJSON writes whole documents, so the cursor
+    should carry the same projection). The cursor is closed when the client
+    disconnects or the export ends.
+    """
+    cursor.batch_size(settings.EXPORT_BATCH_SIZE)
+    filename = f"{name}-{datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')}.{fmt}"
+    return StreamingResponse(
+        _stream(cursor, fmt, fields, name),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
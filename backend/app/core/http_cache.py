@@ -0,0 +1,90 @@
+"""
+HTTP Conditional GET Helpers (ETag / Last-Modified)
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable, Optional
+
+from fastapi import Request, Response
+
+
+CACHE_CONTROL = "public, no-cache"  # CDN/browser may store, but must revalidate
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag from an ordered list of version tokens"""
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def weak_etag(etag: str) -> str:
+    """Weak form of an ETag: the representation may differ in non-semantic parts"""
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+def _opaque(etag: str) -> str:
+    """ETag without its weakness indicator (weak comparison)"""
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def combine_etags(etags: Iterable[str]) -> str:
+    """Strong ETag for a listing built from its items' ETags"""
+    return make_etag(*etags)
+
+
+def _as_utc(dt: datetime) -> datetime:
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def latest_modified(values: Iterable[Optional[datetime]]) -> Optional[datetime]:
+    """Most recent timestamp among naive (UTC) and aware datetimes"""
+    dates = [_as_utc(v) for v in values if isinstance(v, datetime)]
+    return max(dates) if dates else None
+
+
+def http_date(dt: datetime) -> str:
+    """Format a datetime as an RFC 7231 HTTP-date"""
+    return format_datetime(_as_utc(dt), usegmt=True)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """Evaluate If-None-Match (preferred) and If-Modified-Since for a GET request"""
+    if request.method not in ("GET", "HEAD"):
+        return False
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [_opaque(t.strip()) for t in if_none_match.split(",")]
+        # Weak comparison is allowed for If-None-Match
+        return "*" in tags or _opaque(etag) in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except Exception:
+            return False
+        if since is None:
+            return False
+        # HTTP dates have second precision
+        return _as_utc(last_modified).replace(microsecond=0) <= _as_utc(since)
+
+    return False
+
+
+def set_cache_headers(response: Response, etag: str, last_modified: Optional[datetime] = None):
+    """Attach validators to a response"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    if last_modified:
+        response.headers["Last-Modified"] = http_date(last_modified)
+
+
+def not_modified(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    """Empty 304 response carrying the same validators"""
+    response = Response(status_code=304)
+    set_cache_headers(response, etag, last_modified)
+    return response
@@ -0,0 +1,124 @@
+"""
+Keyset (cursor) Pagination Helpers
+"""
+import base64
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId, json_util
+from fastapi import HTTPException, Response
+
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+SortSpec = List[Tuple[str, int]]
+
+# BSON comparison order for the value types we paginate on. MongoDB `$lt`/`$gt`
+# only match values of the same type (type bracketing), so crossing from one
+# type to the next (e.g. int `_id`s after ObjectId `_id`s) needs explicit `$type` clauses.
+_TYPE_ORDER = ["null", "number", "string", "objectId", "date"]
+
+
+def _type_alias(value: Any) -> Optional[str]:
+    """Return the `$type` alias of a value (None for unsupported types)"""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, ObjectId):
+        return "objectId"
+    if isinstance(value, datetime):
+        return "date"
+    return None
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """Encode sort-key values into an opaque, URL-safe cursor (types preserved)"""
+    raw = json_util.dumps(values, json_options=json_util.CANONICAL_JSON_OPTIONS)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a cursor produced by `encode_cursor`"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json_util.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        if not isinstance(values, dict):
+            raise ValueError("cursor payload must be an object")
+        return values
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _strictly_past(field: str, value: Any, direction: int) -> Dict[str, Any]:
+    """Filter for values sorting strictly after `value` in the given direction"""
+    alias = _type_alias(value)
+    if alias is None:
+        return {field: {"$lt" if direction < 0 else "$gt": value}}
+
+    rank = _TYPE_ORDER.index(alias)
+    if direction < 0:
+        other_types = _TYPE_ORDER[:rank]
+    else:
+        other_types = _TYPE_ORDER[rank + 1:]
+
+    clauses = []
+    if alias != "null":
+        clauses.append({field: {"$lt" if direction < 0 else "$gt": value}})
+    if "null" in other_types:
+        # Missing fields sort as null
+        clauses.append({field: None})
+        other_types = [t for t in other_types if t != "null"]
+    if other_types:
+        clauses.append({field: {"$type": other_types}})
+
+    if not clauses:
+        # Nothing sorts past this value
+        return {field: {"$exists": False, "$ne": None}}
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+
+def keyset_filter(sort: SortSpec, last: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the filter selecting documents after `last` for a compound sort"""
+    branches = []
+    for i, (field, direction) in enumerate(sort):
+        equal_prefix = [{f: last.get(f)} for f, _ in sort[:i]]
+        branch = equal_prefix + [_strictly_past(field, last.get(field), direction)]
+        branches.append(branch[0] if len(branch) == 1 else {"$and": branch})
+    return branches[0] if len(branches) == 1 else {"$or": branches}
+
+
+def apply_cursor(query: Dict[str, Any], sort: SortSpec, cursor: Optional[str]) -> Dict[str, Any]:
+    """Combine a listing query with the keyset condition encoded in `cursor`"""
+    if not cursor:
+        return query
+
+    last = decode_cursor(cursor)
+    if set(last.keys()) != {field for field, _ in sort}:
+        raise HTTPException(status_code=400, detail="Cursor does not match this listing")
+
+    condition = keyset_filter(sort, last)
+    if not query:
+        return condition
+    return {"$and": [query, condition]}
+
+
+def build_next_cursor(docs: List[Dict[str, Any]], sort: SortSpec, limit: int) -> Optional[str]:
+    """Cursor pointing after the last document of a full page (None on the last page).
+
+    Must be called before `_id` values are converted to strings for the response.
+    """
+    if len(docs) < limit or not docs:
+        return None
+    last = docs[-1]
+    return encode_cursor({field: last.get(field) for field, _ in sort})
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]):
+    """Expose the next cursor without changing the list-shaped response body"""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
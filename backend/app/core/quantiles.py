@@ -0,0 +1,46 @@
+"""
+Log-Bucket Quantile Sketch Helpers
+"""
+import math
+from typing import Dict, Optional
+
+
+# Bucket i >= 1 holds values in [GAMMA^(i-1), GAMMA^i): quantiles within ~5% relative error
+GAMMA = 1.1
+_LOG_GAMMA = math.log(GAMMA)
+# Values below MIN_VALUE (e.g. instant bounces) share bucket 0
+MIN_VALUE = 1.0
+
+
+def bucket_for(value: float) -> int:
+    """Bucket index of a non-negative value"""
+    if value < MIN_VALUE:
+        return 0
+    return 1 + int(math.floor(math.log(value) / _LOG_GAMMA))
+
+
+def bucket_value(index: int) -> float:
+    """Representative value of a bucket (minimizes the worst-case relative error)"""
+    if index <= 0:
+        return 0.0
+    return 2 * GAMMA ** index / (GAMMA + 1)
+
+
+def add(buckets: Dict[int, int], value: float, count: int = 1):
+    """Count a value into a sparse bucket map in place"""
+    index = bucket_for(value)
+    buckets[index] = buckets.get(index, 0) + count
+
+
+def quantile(buckets: Dict[int, int], q: float) -> Optional[float]:
+    """Approximate q-quantile (0 <= q <= 1); None for an empty sketch"""
+    total = sum(buckets.values())
+    if total <= 0:
+        return None
+    rank = q * (total - 1)
+    seen = 0
+    for index in sorted(buckets):
+        seen += buckets[index]
+        if seen > rank:
+            return bucket_value(index)
+    return bucket_value(max(buckets))
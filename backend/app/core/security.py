@@ -5,7 +5,7 @@ from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 import bcrypt
-from fastapi import HTTPException, Security, Depends
+from fastapi import HTTPException, Security, Depends, Query
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from app.core.config import settings
@@ -77,11 +77,8 @@ def decode_token(token: str) -> dict:
         )
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Security(security)
-) -> dict:
-    """Get current authenticated user from JWT token"""
-    token = credentials.credentials
+def user_from_access_token(token: str) -> dict:
+    """Validated payload of an access token"""
     payload = decode_token(token)
     
     if payload.get("type") != "access":
@@ -100,6 +97,13 @@ async def get_current_user(
     return payload
 
 
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Security(security)
+) -> dict:
+    """Get current authenticated user from JWT token"""
+    return user_from_access_token(credentials.credentials)
+
+
 async def get_current_admin_user(
     current_user: dict = Depends(get_current_user)
 ) -> dict:
@@ -110,3 +114,10 @@ async def get_current_admin_user(
             detail="Insufficient permissions"
         )
     return current_user
+
+
+async def get_current_admin_user_from_query(
+    token: str = Query(..., description="Access token (EventSource cannot send headers)")
+) -> dict:
+    """Require admin role, token passed as `?token=` (server-sent event streams)"""
+    return await get_current_admin_user(user_from_access_token(token))
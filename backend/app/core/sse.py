@@ -0,0 +1,20 @@
+"""
+Server-Sent Events Helpers
+"""
+import json
+from typing import Any, Dict, Optional
+
+from app.core.export import to_jsonable
+
+
+# Response headers for `text/event-stream`: no caching, no proxy buffering (nginx)
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def sse_event(event: str, data: Dict[str, Any], event_id: Optional[int] = None) -> str:
+    """One server-sent event frame"""
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(to_jsonable(data), ensure_ascii=False)}")
+    return "\n".join(lines) + "\n\n"
@@ -0,0 +1,53 @@
+"""
+Background Periodic Tasks (run on the FastAPI event loop)
+"""
+import asyncio
+from typing import Awaitable, Callable, Optional
+from loguru import logger
+
+
+class PeriodicTask:
+    """Run an async callable every `interval_seconds` until stopped.
+
+    Errors are logged and the loop keeps going, so a transient DB failure
+    does not kill the background job.
+    """
+
+    def __init__(self, name: str, interval_seconds: float, func: Callable[[], Awaitable]):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.func = func
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Schedule the loop on the running event loop"""
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run(), name=self.name)
+        logger.info(f"✅ Started periodic task '{self.name}' (every {self.interval_seconds}s)")
+
+    async def stop(self):
+        """Cancel the loop and wait for it to finish"""
+        if not self._task:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info(f"✅ Stopped periodic task '{self.name}'")
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.func()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Periodic task '{self.name}' failed: {e}")
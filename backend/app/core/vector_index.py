@@ -0,0 +1,208 @@
+"""
+In-Process Vector Index (NumPy) - exact and IVF approximate cosine top-k search
+"""
+import os
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from bson import json_util
+
+
+def _normalize(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Unit-length rows and a mask of the rows that could be normalized (non-zero)"""
+    norms = np.linalg.norm(vectors, axis=1)
+    valid = norms > 0
+    out = np.zeros_like(vectors)
+    out[valid] = vectors[valid] / norms[valid, None]
+    return out, valid
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first"""
+    if k >= len(scores):
+        return np.argsort(-scores)
+    candidates = np.argpartition(-scores, k)[:k]
+    return candidates[np.argsort(-scores[candidates])]
+
+
+class VectorIndex:
+    """Cosine-similarity index over unit-normalized float32 rows.
+
+    Rows are keyed by `str(id)` (the raw id is kept for queries, so int, str and
+    ObjectId article ids all work). Search is exact (one matrix-vector product)
+    unless an IVF structure was built with `build_ivf`: rows are then clustered
+    by k-means and a query scans only the `nprobe` nearest clusters, plus any
+    rows added since the clustering. All-zero vectors (placeholder embeddings)
+    are ignored. `save` / `load` persist the matrix as `.npy`, memory-mapped on
+    load; the first write after loading copies it into memory.
+    """
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._ids: List[Any] = []
+        self._positions: Dict[str, int] = {}
+        self._removed = np.zeros(0, dtype=bool)
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[np.ndarray] = []
+        self._ivf_size = 0
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, item_id: Any) -> bool:
+        return str(item_id) in self._positions
+
+    @property
+    def has_ivf(self) -> bool:
+        return self._centroids is not None
+
+    @property
+    def ivf_size(self) -> int:
+        """Number of rows when the IVF clustering was built"""
+        return self._ivf_size
+
+    def copy(self) -> "VectorIndex":
+        """Independent index sharing the matrix copy-on-write (the first write copies it)"""
+        index = VectorIndex(self.dim)
+        index._vectors = self._vectors.view()
+        index._vectors.flags.writeable = False
+        index._ids = list(self._ids)
+        index._positions = dict(self._positions)
+        index._removed = self._removed.copy()
+        index._centroids = self._centroids
+        index._lists = list(self._lists)
+        index._ivf_size = self._ivf_size
+        return index
+
+    def _writable(self):
+        if not self._vectors.flags.writeable:
+            self._vectors = np.array(self._vectors)
+
+    def upsert_many(self, items: Iterable[Tuple[Any, Sequence[float]]]) -> int:
+        """Insert or replace vectors; returns how many rows were stored"""
+        # Last vector wins when an id repeats within the batch
+        items = list({
+            str(item_id): (item_id, vector) for item_id, vector in items
+            if vector is not None and len(vector) == self.dim
+        }.values())
+        if not items:
+            return 0
+        vectors, valid = _normalize(np.asarray([v for _, v in items], dtype=np.float32))
+
+        self._writable()
+        start = len(self._vectors)
+        new_rows = []
+        for (item_id, _), row, ok in zip(items, vectors, valid):
+            key = str(item_id)
+            if not ok:
+                self.remove(item_id)
+                continue
+            position = self._positions.get(key)
+            if position is None:
+                self._positions[key] = start + len(new_rows)
+                self._ids.append(item_id)
+                new_rows.append(row)
+            else:
+                self._vectors[position] = row
+
+        if new_rows:
+            self._vectors = np.vstack([self._vectors, np.asarray(new_rows, dtype=np.float32)])
+            self._removed = np.concatenate([self._removed, np.zeros(len(new_rows), dtype=bool)])
+        return int(valid.sum())
+
+    def remove(self, item_id: Any):
+        """Drop a row (tombstoned until the next `save`)"""
+        position = self._positions.pop(str(item_id), None)
+        if position is not None:
+            self._removed[position] = True
+
+    def build_ivf(self, nlist: Optional[int] = None, iterations: int = 10, seed: int = 0):
+        """Cluster current rows with spherical k-means into `nlist` inverted lists"""
+        rows = len(self._vectors)
+        if rows == 0:
+            return
+        nlist = min(nlist or max(1, int(np.sqrt(rows))), rows)
+        rng = np.random.default_rng(seed)
+
+        # Train on a sample, then assign every row once
+        sample = self._vectors[rng.choice(rows, size=min(rows, nlist * 64), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = sample[assignment == c]
+                if len(members):
+                    centroids[c] = members.sum(axis=0)
+            centroids, _ = _normalize(centroids)
+
+        assignment = np.argmax(self._vectors @ centroids.T, axis=1)
+        self._centroids = centroids
+        self._lists = [np.flatnonzero(assignment == c) for c in range(nlist)]
+        self._ivf_size = rows
+
+    def search(
+        self,
+        query: Sequence[float],
+        k: int,
+        exclude: Optional[Any] = None,
+        nprobe: Optional[int] = None
+    ) -> List[Tuple[Any, float]]:
+        """Top-k (id, cosine similarity); approximate when `nprobe` is given and IVF is built"""
+        if len(self) == 0 or len(query) != self.dim:
+            return []
+        q, valid = _normalize(np.asarray([query], dtype=np.float32))
+        if not valid[0]:
+            return []
+        q = q[0]
+
+        if nprobe and self.has_ivf:
+            probes = _top_k(self._centroids @ q, nprobe)
+            candidates = np.concatenate(
+                [self._lists[c] for c in probes] + [np.arange(self._ivf_size, len(self._vectors))]
+            )
+        else:
+            candidates = np.arange(len(self._vectors))
+
+        scores = self._vectors[candidates] @ q
+        live = ~self._removed[candidates]
+        excluded = self._positions.get(str(exclude)) if exclude is not None else None
+        if excluded is not None:
+            live &= candidates != excluded
+        candidates, scores = candidates[live], scores[live]
+
+        order = _top_k(scores, k)
+        return [(self._ids[candidates[i]], float(scores[i])) for i in order]
+
+    def save(self, path: str):
+        """Write the live rows to `<path>/vectors.npy` and `<path>/ids.json` (atomically renamed)"""
+        os.makedirs(path, exist_ok=True)
+        live = np.flatnonzero(~self._removed)
+        vectors_tmp = os.path.join(path, "vectors.tmp.npy")
+        ids_tmp = os.path.join(path, "ids.json.tmp")
+        np.save(vectors_tmp, self._vectors[live])
+        with open(ids_tmp, "w") as f:
+            f.write(json_util.dumps([self._ids[i] for i in live]))
+        os.replace(vectors_tmp, os.path.join(path, "vectors.npy"))
+        os.replace(ids_tmp, os.path.join(path, "ids.json"))
+
+    @classmethod
+    def load(cls, path: str, dim: int) -> Optional["VectorIndex"]:
+        """Memory-map a saved index; None when missing or of another dimension"""
+        vectors_path = os.path.join(path, "vectors.npy")
+        ids_path = os.path.join(path, "ids.json")
+        if not (os.path.exists(vectors_path) and os.path.exists(ids_path)):
+            return None
+
+        vectors = np.load(vectors_path, mmap_mode="r")
+        with open(ids_path) as f:
+            ids = json_util.loads(f.read())
+        if vectors.ndim != 2 or vectors.shape[1] != dim or len(ids) != len(vectors):
+            return None
+
+        index = cls(dim)
+        index._vectors = vectors
+        index._ids = list(ids)
+        index._positions = {str(item_id): i for i, item_id in enumerate(ids)}
+        index._removed = np.zeros(len(ids), dtype=bool)
+        return index
@@ -160,6 +160,33 @@ class ArticleResponse(ArticleBase):
         populate_by_name = True
 
 
+class ArticleCardResponse(BaseModel):
+    """Lightweight article for list views (no content body, AI fields or vectors)"""
+    id: str = Field(alias="_id")
+    title: str
+    slug: str
+    excerpt: Optional[str] = None
+    summary: Optional[str] = None
+    category: ArticleCategory
+    tags: List[str] = []
+    featured_image: Optional[str] = None
+    language: str = "vi"
+    status: ArticleStatus = ArticleStatus.PUBLISHED
+    author_id: str
+    author_name: str
+    
+    view_count: int = 0
+    like_count: int = 0
+    comment_count: int = 0
+    
+    published_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    
+    class Config:
+        populate_by_name = True
+
+
 # ===================== Translation Schemas =====================
 
 class TranslationRequest(BaseModel):
@@ -229,6 +256,9 @@ class ArticleStats(BaseModel):
     comments: int
     shares: int
     avg_read_time: float  # seconds
+    p50_read_time: Optional[float] = None  # seconds, log-bucket estimate (~5% error)
+    p90_read_time: Optional[float] = None
+    unique_readers: int = 0  # HyperLogLog estimate (~3% error)
 
 
 class DashboardStats(BaseModel):
@@ -241,6 +271,8 @@ class DashboardStats(BaseModel):
     total_views: int
     articles_by_category: Dict[str, int]
     sentiment_distribution: Dict[str, int]
+    computed_at: Optional[datetime] = None
+    age_seconds: Optional[float] = None
 
 
 # ===================== AI Service Schemas =====================
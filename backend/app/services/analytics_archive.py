@@ -0,0 +1,203 @@
+"""
+Analytics Archive Service - cold storage of old analytics events as Parquet files
+"""
+import json
+import os
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+from loguru import logger
+
+from app.core.config import settings
+from app.services.analytics_rollups import event_read_time
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency
+    pa = None
+
+
+# One file per day, rewritten in place when more events of that day are archived
+DAY_FILE = "events.parquet"
+
+
+def _schema():
+    return pa.schema([
+        ("_id", pa.string()),
+        ("article_id", pa.string()),
+        ("user_id", pa.string()),
+        ("event_type", pa.string()),
+        ("timestamp", pa.timestamp("ms")),
+        ("read_time", pa.float64()),
+        ("metadata", pa.string()),  # remaining metadata as JSON
+    ])
+
+
+def _read_time(event: Dict[str, Any]) -> Optional[float]:
+    value = event_read_time(event)
+    return float(value) if value is not None else None
+
+
+def _to_columns(events: List[Dict[str, Any]]) -> Dict[str, list]:
+    return {
+        "_id": [str(e['_id']) for e in events],
+        "article_id": [e.get('article_id') for e in events],
+        "user_id": [e.get('user_id') for e in events],
+        "event_type": [e.get('event_type') for e in events],
+        "timestamp": [e.get('timestamp') for e in events],
+        "read_time": [_read_time(e) for e in events],
+        "metadata": [json.dumps(e.get('metadata') or {}, default=str, ensure_ascii=False) for e in events],
+    }
+
+
+class AnalyticsArchiveService:
+    """Moves analytics events older than `ANALYTICS_RETENTION_DAYS` to Parquet.
+
+    Files are zstd-compressed, one per event day
+    (`<ANALYTICS_ARCHIVE_DIR>/date=YYYY-MM-DD/events.parquet`). A day is written
+    to a temporary file together with the rows already archived for it (minus
+    the `_id`s being archived now), renamed over the day file, and only then are
+    exactly the written `_id`s deleted from MongoDB. A crash can at worst leave
+    events both archived and in the hot collection; the next run rewrites the
+    day file without duplicating them. Rollups, article stats, histograms and
+    reader sketches are derived data and stay in MongoDB, so stats endpoints
+    are unaffected by archiving.
+
+    Uses synchronous pymongo: runs on the scheduler thread or from
+    `archive_analytics.py`. Requires the optional `pyarrow` package.
+    """
+
+    def __init__(self):
+        self.root = settings.ANALYTICS_ARCHIVE_DIR
+        self.retention_days = settings.ANALYTICS_RETENTION_DAYS
+        self.chunk_size = 50000
+        self.enabled = settings.ANALYTICS_ARCHIVE_ENABLED and pa is not None
+
+        if settings.ANALYTICS_ARCHIVE_ENABLED and pa is None:
+            logger.warning("⚠️ Analytics archive disabled - pyarrow is not installed")
+
+    def _partition_dir(self, day: date) -> str:
+        return os.path.join(self.root, f"date={day.isoformat()}")
+
+    def _archive_day(self, db, day: date) -> int:
+        """Merge all hot events of one day into the day's Parquet file, then delete them"""
+        start = datetime.combine(day, datetime.min.time())
+        query = {"timestamp": {"$gte": start, "$lt": start + timedelta(days=1)}}
+
+        os.makedirs(self.root, exist_ok=True)
+        day_path = os.path.join(self._partition_dir(day), DAY_FILE)
+        tmp_path = os.path.join(self.root, f".{day.isoformat()}.parquet.tmp")
+
+        archived_ids = []
+        writer = pq.ParquetWriter(tmp_path, _schema(), compression="zstd")
+        try:
+            chunk = []
+            for event in db.analytics.find(query).sort("_id", 1):
+                chunk.append(event)
+                if len(chunk) >= self.chunk_size:
+                    writer.write_table(pa.table(_to_columns(chunk), schema=_schema()))
+                    archived_ids.extend(e['_id'] for e in chunk)
+                    chunk = []
+            if chunk:
+                writer.write_table(pa.table(_to_columns(chunk), schema=_schema()))
+                archived_ids.extend(e['_id'] for e in chunk)
+
+            # Keep earlier archived rows of the day, except those being re-archived
+            if archived_ids and os.path.exists(day_path):
+                previous = pq.read_table(day_path, schema=_schema())
+                rearchived = pa.array([str(_id) for _id in archived_ids], type=pa.string())
+                writer.write_table(previous.filter(pc.invert(pc.is_in(previous["_id"], value_set=rearchived))))
+        except Exception:
+            writer.close()
+            os.remove(tmp_path)
+            raise
+        writer.close()
+
+        if not archived_ids:
+            os.remove(tmp_path)
+            return 0
+        os.makedirs(self._partition_dir(day), exist_ok=True)
+        os.replace(tmp_path, day_path)
+
+        for i in range(0, len(archived_ids), self.chunk_size):
+            db.analytics.delete_many({"_id": {"$in": archived_ids[i:i + self.chunk_size]}})
+        return len(archived_ids)
+
+    def archive(self, db) -> int:
+        """Archive every complete day older than the retention horizon"""
+        if not self.enabled:
+            return 0
+
+        cutoff = datetime.combine(
+            datetime.utcnow().date() - timedelta(days=self.retention_days), datetime.min.time()
+        )
+        total = 0
+        while True:
+            # Oldest remaining day past the horizon (days without events are skipped)
+            oldest = db.analytics.find_one({"timestamp": {"$lt": cutoff}}, sort=[("timestamp", 1)])
+            if not oldest:
+                break
+            day = oldest['timestamp'].date()
+            count = self._archive_day(db, day)
+            if not count:
+                break
+            logger.info(f"🧊 Archived {count} analytics events of {day.isoformat()}")
+            total += count
+        return total
+
+    def _dataset(self):
+        partitioning = ds.partitioning(pa.schema([("date", pa.string())]), flavor="hive")
+        return ds.dataset(self.root, format="parquet", partitioning=partitioning, schema=_schema().append(
+            pa.field("date", pa.string())
+        ))
+
+    def summary(
+        self,
+        start: date,
+        end: date,
+        event_type: Optional[str] = None,
+        article_id: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Event counts and read time per (article, event type) over archived days [start, end]"""
+        if pa is None:
+            raise RuntimeError("pyarrow is not installed")
+        if not os.path.isdir(self.root):
+            return []
+
+        # Partition pruning on the directory key, then vectorized filtering
+        condition = (ds.field("date") >= start.isoformat()) & (ds.field("date") <= end.isoformat())
+        if event_type:
+            condition = condition & (ds.field("event_type") == event_type)
+        if article_id:
+            condition = condition & (ds.field("article_id") == article_id)
+
+        table = self._dataset().to_table(
+            columns=["article_id", "event_type", "read_time"], filter=condition
+        )
+        if table.num_rows == 0:
+            return []
+
+        grouped = table.group_by(["article_id", "event_type"]).aggregate([
+            ([], "count_all"),
+            ("read_time", "sum"),
+            ("read_time", "count"),
+        ])
+        grouped = grouped.take(pc.sort_indices(grouped, sort_keys=[("count_all", "descending")]))
+
+        results = []
+        for row in grouped.slice(0, limit).to_pylist():
+            read_time_count = row['read_time_count'] or 0
+            results.append({
+                "article_id": row['article_id'],
+                "event_type": row['event_type'],
+                "count": row['count_all'],
+                "avg_read_time": (row['read_time_sum'] or 0) / read_time_count if read_time_count else None,
+            })
+        return results
+
+
+# Singleton instance
+analytics_archive_service = AnalyticsArchiveService()
@@ -0,0 +1,291 @@
+"""
+Analytics Ingestion Service - buffered bulk writes for analytics events
+"""
+import asyncio
+from collections import Counter
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+from bson import ObjectId
+from loguru import logger
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.core.config import settings
+from app.core.database import get_database
+from app.core.tasks import PeriodicTask
+from app.services.analytics_rollups import analytics_rollup_service, rollup_increments, merge_increments
+from app.services.article_stats import article_stats_service, stats_increments, merge_stats_increments
+from app.services.category_histogram import category_histogram_service
+from app.services.id_resolver import article_id_resolver, candidate_ids
+from app.services.rabbitmq_service import rabbitmq_service
+from app.services.response_cache import response_cache
+from app.services.unique_readers import unique_reader_service, sketch_updates, merge_sketch_updates
+
+
+# Duplicate key: the event was already stored by an earlier (partially failed) flush
+_DUPLICATE_KEY = 11000
+
+# Fields every queued event needs (derived counters key on them)
+_REQUIRED_FIELDS = ("_id", "timestamp", "event_type", "article_id")
+
+
+def _article_filter(article_id: str) -> Dict[str, Any]:
+    """Match an article by external id (single equality when the type is known)"""
+    typed = article_id_resolver.typed_id(article_id)
+    if typed is not None:
+        return {"_id": typed}
+    return {"_id": {"$in": candidate_ids(article_id)}}
+
+
+def event_to_message(event: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON-safe form of an event document for the analytics queue"""
+    message = dict(event)
+    message['_id'] = str(event['_id'])
+    message['timestamp'] = event['timestamp'].isoformat()
+    return message
+
+
+def event_from_message(message: Dict[str, Any]) -> Dict[str, Any]:
+    """Event document from its queue form (inverse of `event_to_message`)"""
+    event = dict(message)
+    event['_id'] = ObjectId(message['_id'])
+    event['timestamp'] = datetime.fromisoformat(message['timestamp'])
+    return event
+
+
+def events_from_message(message: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Validated event documents of one analytics queue message; raises ValueError when malformed"""
+    events = message.get("events")
+    if not isinstance(events, list):
+        raise ValueError("message has no 'events' list")
+    parsed = []
+    for event in events:
+        if not isinstance(event, dict):
+            raise ValueError("event is not an object")
+        missing = [field for field in _REQUIRED_FIELDS if not event.get(field)]
+        if missing:
+            raise ValueError(f"event is missing {', '.join(missing)}")
+        try:
+            parsed.append(event_from_message(event))
+        except Exception as e:
+            raise ValueError(f"invalid event {event.get('_id')}: {e}")
+    return parsed
+
+
+def view_increments(events: List[Dict[str, Any]]) -> Dict:
+    """Rollup increments of view events only (input of the category histogram)"""
+    return rollup_increments([
+        e for e in events if getattr(e['event_type'], 'value', e['event_type']) == 'view'
+    ])
+
+
+def like_counts(events: List[Dict[str, Any]]) -> Counter:
+    """Like events per article id, coalesced into one `$inc` each"""
+    return Counter(e['article_id'] for e in events if e.get('event_type') == 'like')
+
+
+async def insert_events(db, events: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """`insert_many(ordered=False)`; returns `(inserted, retry)`.
+
+    `inserted` are the events stored by this call, `retry` those that must be
+    retried. Events carry their `_id` before the first attempt, so a retry after
+    a partial failure only reports duplicate keys (in neither list) for rows
+    that were already stored.
+    """
+    if not events:
+        return [], []
+    try:
+        await db.analytics.insert_many(events, ordered=False)
+        return list(events), []
+    except BulkWriteError as e:
+        errors = {err['index']: err.get('code') for err in e.details.get('writeErrors', [])}
+        inserted = [event for i, event in enumerate(events) if i not in errors]
+        retry = [event for i, event in enumerate(events) if i in errors and errors[i] != _DUPLICATE_KEY]
+        return inserted, retry
+
+
+async def apply_like_counts(db, likes: Dict[str, int]):
+    """Apply coalesced like increments to articles and their cards"""
+    if not likes:
+        return
+    await db.articles.bulk_write([
+        UpdateOne(_article_filter(article_id), {"$inc": {"like_count": count}})
+        for article_id, count in likes.items()
+    ], ordered=False)
+    try:
+        await db.article_cards.bulk_write([
+            UpdateOne({"_id": article_id}, {"$inc": {"like_count": count}})
+            for article_id, count in likes.items()
+        ], ordered=False)
+    except Exception as e:
+        logger.warning(f"⚠️ Like count card update failed (rebuild cards to repair): {e}")
+
+    for article_id in likes:
+        response_cache.invalidate(response_cache.make_key("public_article", article_id=article_id))
+
+
+class DerivedCounter(NamedTuple):
+    """Counters computed from stored events: extract → coalesce (merge) → bulk write (apply)"""
+    name: str
+    extract: Callable[[List[Dict[str, Any]]], Any]
+    merge: Callable[[Any, Any], None]
+    apply: Callable[[Any, Any], Awaitable]
+
+
+DERIVED_COUNTERS = [
+    DerivedCounter("like counts", like_counts, Counter.update, apply_like_counts),
+    DerivedCounter("analytics rollups", rollup_increments, merge_increments, analytics_rollup_service.apply),
+    DerivedCounter("article stats", stats_increments, merge_stats_increments, article_stats_service.apply),
+    DerivedCounter("category histogram", view_increments, merge_increments, category_histogram_service.apply),
+    DerivedCounter("reader sketches", sketch_updates, merge_sketch_updates, unique_reader_service.apply),
+]
+
+
+async def _uncounted_events(db, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Stored documents of `events` that some derived counter has not counted yet"""
+    if not events:
+        return []
+    names = [counter.name for counter in DERIVED_COUNTERS]
+    return await db.analytics.find({
+        "_id": {"$in": [e['_id'] for e in events]},
+        "counted": {"$not": {"$all": names}},
+    }).to_list(length=None)
+
+
+async def write_events(db, events: List[Dict[str, Any]]) -> int:
+    """Store events and apply their derived counters once per counter.
+
+    Used by the analytics queue worker, which retries the messages on failure
+    (raises if any event could not be stored or counted). Once a counter is
+    applied, its name is added to the `counted` field of the events it covered.
+    Redelivered events hit duplicate keys: they are not stored twice, and only
+    the counters missing from their `counted` field are applied.
+    """
+    inserted, retry = await insert_events(db, events)
+    settled = {id(e) for e in inserted} | {id(e) for e in retry}
+    duplicates = await _uncounted_events(db, [e for e in events if id(e) not in settled])
+
+    failed = []
+    for counter in DERIVED_COUNTERS:
+        pending = inserted + [e for e in duplicates if counter.name not in e.get('counted', [])]
+        if not pending:
+            continue
+        try:
+            await counter.apply(db, counter.extract(pending))
+        except Exception as e:
+            failed.append(counter.name)
+            logger.error(f"❌ Analytics {counter.name} update failed: {e}")
+            continue
+        await db.analytics.update_many(
+            {"_id": {"$in": [e['_id'] for e in pending]}},
+            {"$addToSet": {"counted": counter.name}}
+        )
+
+    if retry:
+        raise RuntimeError(f"{len(retry)} analytics events failed to insert")
+    if failed:
+        raise RuntimeError(f"analytics counters failed: {', '.join(failed)}")
+    return len(inserted)
+
+
+class AnalyticsIngestService:
+    """Buffers analytics events in memory and writes them in bulk.
+
+    A flush stores all buffered events with one `insert_many(ordered=False)` and
+    then applies each of `DERIVED_COUNTERS` (likes, hourly rollups, article read-time
+    stats, category hour histogram, unique-reader sketches) with one coalesced bulk write. Counters
+    whose write fails are kept and merged into the next flush. Flushes run every
+    `ANALYTICS_FLUSH_SECONDS` or as soon as `ANALYTICS_MAX_PENDING` events are
+    buffered. Failed events are re-queued (up to `ANALYTICS_MAX_BUFFERED`).
+
+    With `ANALYTICS_QUEUE_ENABLED`, `submit` publishes events to the RabbitMQ
+    `analytics` queue instead and the analytics worker writes them
+    (`python -m app.worker analytics`); the buffer is the fallback.
+    """
+
+    def __init__(self):
+        self.flush_interval = settings.ANALYTICS_FLUSH_SECONDS
+        self.max_pending = settings.ANALYTICS_MAX_PENDING
+        self.max_buffered = settings.ANALYTICS_MAX_BUFFERED
+        self._events: List[Dict[str, Any]] = []
+        self._pending = [counter.extract([]) for counter in DERIVED_COUNTERS]
+        self._flush_lock = asyncio.Lock()
+        self._threshold_flush: Optional[asyncio.Task] = None
+        self._task = PeriodicTask("analytics_flush", self.flush_interval, self.flush)
+
+    async def submit(self, events: List[Dict[str, Any]]):
+        """Hand events to the analytics queue when enabled, else to the buffer"""
+        if settings.ANALYTICS_QUEUE_ENABLED and rabbitmq_service.channel is not None:
+            try:
+                await rabbitmq_service.publish_analytics_events([event_to_message(e) for e in events])
+                return
+            except Exception as e:
+                logger.warning(f"⚠️ Analytics publish failed - buffering in process: {e}")
+        self.record(events)
+
+    def record(self, events: List[Dict[str, Any]]):
+        """Buffer event documents; triggers an early flush once `max_pending` is reached"""
+        self._events.extend(events)
+
+        if len(self._events) > self.max_buffered:
+            dropped = len(self._events) - self.max_buffered
+            del self._events[:dropped]
+            logger.warning(f"⚠️ Analytics buffer full - dropped {dropped} oldest events")
+
+        if len(self._events) >= self.max_pending and \
+                (self._threshold_flush is None or self._threshold_flush.done()):
+            self._threshold_flush = asyncio.create_task(self.flush())
+
+    async def flush(self, db=None) -> int:
+        """Persist buffered events and their derived counters"""
+        if db is None:
+            db = get_database()
+        if db is None or not (self._events or any(self._pending)):
+            return 0
+
+        async with self._flush_lock:
+            batch, self._events = self._events, []
+
+            try:
+                _, retry = await insert_events(db, batch)
+            except Exception as e:
+                # Put the events back so the next flush retries them
+                self._events[:0] = batch
+                logger.error(f"❌ Analytics flush failed: {e}")
+                return 0
+
+            if retry:
+                self._events[:0] = retry
+                logger.warning(f"⚠️ {len(retry)} analytics events failed to insert - will retry")
+
+            # Counters are updated once their event is stored (duplicates included: an
+            # earlier flush may have stored them before failing, without counting them)
+            retried = {id(event) for event in retry}
+            stored_events = [e for e in batch if id(e) not in retried]
+            for counter, pending in zip(DERIVED_COUNTERS, self._pending):
+                counter.merge(pending, counter.extract(stored_events))
+
+            for i, counter in enumerate(DERIVED_COUNTERS):
+                state, self._pending[i] = self._pending[i], counter.extract([])
+                try:
+                    await counter.apply(db, state)
+                except Exception as e:
+                    counter.merge(self._pending[i], state)
+                    logger.error(f"❌ Analytics {counter.name} flush failed: {e}")
+
+            stored = len(batch) - len(retry)
+            logger.info(f"✅ Flushed {stored} analytics events")
+            return stored
+
+    def start(self):
+        """Start the periodic flush loop"""
+        self._task.start()
+
+    async def stop(self):
+        """Stop the flush loop and persist whatever is still buffered"""
+        await self._task.stop()
+        await self.flush()
+
+
+# Singleton instance
+analytics_ingest = AnalyticsIngestService()
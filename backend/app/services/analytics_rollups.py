@@ -0,0 +1,134 @@
+"""
+Analytics Rollups - hourly per-article event counters
+"""
+import math
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from pymongo import UpdateOne
+
+
+# (article_id, event_type, hour) -> {"count", "read_time_sum", "read_time_count"}
+RollupKey = Tuple[str, str, datetime]
+RollupIncrements = Dict[RollupKey, Dict[str, float]]
+
+
+def hour_bucket(ts: datetime) -> datetime:
+    """Start of the hour containing `ts`"""
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+def event_read_time(event: Dict[str, Any]) -> Optional[float]:
+    """`metadata.read_time` of an event; None unless a finite, non-negative number"""
+    value = (event.get('metadata') or {}).get('read_time')
+    if isinstance(value, (int, float)) and not isinstance(value, bool) \
+            and math.isfinite(value) and value >= 0:
+        return value
+    return None
+
+
+def rollup_increments(events: List[Dict[str, Any]]) -> RollupIncrements:
+    """Coalesce stored events into one increment per (article, event type, hour)"""
+    incs: RollupIncrements = {}
+    for event in events:
+        event_type = getattr(event['event_type'], 'value', event['event_type'])
+        key = (event['article_id'], event_type, hour_bucket(event['timestamp']))
+        inc = incs.setdefault(key, {"count": 0, "read_time_sum": 0.0, "read_time_count": 0})
+        inc['count'] += 1
+        read_time = event_read_time(event)
+        if read_time is not None:
+            inc['read_time_sum'] += read_time
+            inc['read_time_count'] += 1
+    return incs
+
+
+def merge_increments(target: RollupIncrements, source: RollupIncrements):
+    """Add `source` increments into `target` (used to carry failed flushes over)"""
+    for key, inc in source.items():
+        current = target.setdefault(key, {"count": 0, "read_time_sum": 0.0, "read_time_count": 0})
+        for field, value in inc.items():
+            current[field] += value
+
+
+def rollup_updates(incs: RollupIncrements) -> List[UpdateOne]:
+    """Upserting `$inc` operations for `analytics_rollups`"""
+    updates = []
+    for (article_id, event_type, hour), inc in incs.items():
+        updates.append(UpdateOne(
+            {"_id": {"article_id": article_id, "event_type": event_type, "hour": hour}},
+            {
+                "$inc": inc,
+                # Top-level copies of the key fields for indexed range queries
+                "$setOnInsert": {"article_id": article_id, "event_type": event_type, "hour": hour}
+            },
+            upsert=True
+        ))
+    return updates
+
+
+# Rebuilds every rollup document from raw events (backfill / repair)
+BACKFILL_PIPELINE = [
+    {"$group": {
+        "_id": {
+            "article_id": "$article_id",
+            "event_type": "$event_type",
+            "hour": {"$dateFromParts": {
+                "year": {"$year": "$timestamp"},
+                "month": {"$month": "$timestamp"},
+                "day": {"$dayOfMonth": "$timestamp"},
+                "hour": {"$hour": "$timestamp"}
+            }}
+        },
+        "count": {"$sum": 1},
+        "read_time_sum": {"$sum": {"$cond": [{"$isNumber": "$metadata.read_time"}, "$metadata.read_time", 0]}},
+        "read_time_count": {"$sum": {"$cond": [{"$isNumber": "$metadata.read_time"}, 1, 0]}}
+    }},
+    {"$addFields": {
+        "article_id": "$_id.article_id",
+        "event_type": "$_id.event_type",
+        "hour": "$_id.hour"
+    }},
+    {"$merge": {"into": "analytics_rollups", "whenMatched": "replace", "whenNotMatched": "insert"}}
+]
+
+
+class AnalyticsRollupService:
+    """Reads and writes the `analytics_rollups` collection.
+
+    Each document counts one event type for one article within one hour, plus
+    the sum and number of `metadata.read_time` values. Counters are applied when
+    buffered events are flushed, so reports scan at most one document per
+    (article, event type, hour) instead of every raw event.
+    """
+
+    async def apply(self, db, incs: RollupIncrements):
+        """Apply coalesced increments with one bulk write"""
+        if incs:
+            await db.analytics_rollups.bulk_write(rollup_updates(incs), ordered=False)
+
+    async def top_articles(self, db, since: datetime, weights: Dict[str, float], limit: int) -> List[Dict[str, Any]]:
+        """Articles by weighted event count since `since` (hour granularity)"""
+        pipeline = [
+            {"$match": {"hour": {"$gte": hour_bucket(since)}, "event_type": {"$in": list(weights)}}},
+            {"$group": {
+                "_id": "$article_id",
+                "score": {"$sum": {"$multiply": ["$count", {"$switch": {
+                    "branches": [
+                        {"case": {"$eq": ["$event_type", event_type]}, "then": weight}
+                        for event_type, weight in weights.items()
+                    ],
+                    "default": 0
+                }}]}}
+            }},
+            {"$sort": {"score": -1}},
+            {"$limit": limit}
+        ]
+        return await db.analytics_rollups.aggregate(pipeline).to_list(length=limit)
+
+    def backfill_sync(self, db) -> int:
+        """Recompute all rollups from the raw `analytics` collection"""
+        db.analytics.aggregate(BACKFILL_PIPELINE, allowDiskUse=True)
+        return db.analytics_rollups.estimated_document_count()
+
+
+# Singleton instance
+analytics_rollup_service = AnalyticsRollupService()
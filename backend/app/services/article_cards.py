@@ -0,0 +1,322 @@
+"""
+Article Card Read Model - precomputed public article documents
+"""
+from datetime import datetime
+from typing import Any, Dict, Optional
+import json
+
+from loguru import logger
+from pymongo import ReplaceOne
+
+from app.core.database import run_in_transaction, run_in_transaction_sync
+from app.core.http_cache import make_etag
+from app.models.schemas import ArticleCategory
+from app.services.category_counts import (
+    category_count_service, COUNT_FIELDS, DEFAULT_CATEGORY, article_category, article_status
+)
+from app.services.category_histogram import category_histogram_service
+from app.services.dashboard_live import dashboard_live
+
+
+# Map legacy MongoDB categories (seeded / generated articles) to API enum values
+CATEGORY_MAP = {
+    "AI Models": "technology",
+    "Tech Innovations": "technology",
+    "Blockchain": "technology",
+    "Software": "technology",
+    "Healthcare": "health",
+    "Finance": "business",
+    "Economy": "business",
+    "Politics": "politics",
+    "Sports": "sports",
+    "Entertainment": "entertainment",
+    "Science": "science",
+    "World News": "world",
+    "Local News": "local"
+}
+
+API_CATEGORIES = {c.value for c in ArticleCategory}
+
+# Mongo projection for `view=card` listings: only the fields of ArticleCardResponse
+CARD_VIEW_PROJECTION = {
+    "title": 1, "slug": 1, "excerpt": 1, "summary": 1, "category": 1, "tags": 1,
+    "featured_image": 1, "language": 1, "status": 1, "author_id": 1, "author_name": 1,
+    "view_count": 1, "like_count": 1, "comment_count": 1,
+    "published_at": 1, "created_at": 1, "updated_at": 1,
+    "article_id": 1,  # sort key, needed to build the next cursor
+    "etag": 1
+}
+
+# Fields that define the public representation; live counters are excluded from
+# the card ETag so a reader's own page view does not invalidate it
+_ETAG_FIELDS = (
+    "title", "slug", "excerpt", "content", "category", "tags", "featured_image",
+    "language", "status", "author_id", "author_name", "published_at", "updated_at"
+)
+
+
+def parse_dt(val) -> Optional[datetime]:
+    """Parse datetime stored either as BSON date or ISO8601 string"""
+    if isinstance(val, datetime):
+        return val
+    if isinstance(val, str):
+        try:
+            # Handle ISO8601 with Z (UTC)
+            if val.endswith('Z'):
+                val = val.replace('Z', '+00:00')
+            return datetime.fromisoformat(val)
+        except Exception:
+            return None
+    return None
+
+
+# Counters: snake_case field → legacy camelCase field (seeded / generated articles)
+LEGACY_COUNTERS = {"view_count": "views", "like_count": "likes", "comment_count": "commentsCount"}
+
+# Articles still carrying a legacy counter, and the update folding it into the snake_case one
+# (one-off migration: migrate_legacy_counters.py; until then `counter_value` adds them at read time)
+LEGACY_COUNTERS_FILTER = {"$or": [{legacy: {"$exists": True}} for legacy in LEGACY_COUNTERS.values()]}
+FOLD_LEGACY_COUNTERS = [
+    {"$set": {
+        field: {"$add": [{"$ifNull": [f"${field}", 0]}, {"$ifNull": [f"${legacy}", 0]}]}
+        for field, legacy in LEGACY_COUNTERS.items()
+    }},
+    {"$unset": list(LEGACY_COUNTERS.values())}
+]
+
+
+def counter_value(article: Dict[str, Any], field: str) -> int:
+    """Counter of an article: the live field plus any legacy starting value (e.g. `views=100`)"""
+    return (article.get(field) or 0) + (article.get(LEGACY_COUNTERS[field]) or 0)
+
+
+def normalize_counters(article: Dict[str, Any]) -> Dict[str, Any]:
+    """Fold legacy counters into `view_count` / `like_count` / `comment_count` before writing (in place)"""
+    for field, legacy in LEGACY_COUNTERS.items():
+        if legacy in article:
+            article[field] = counter_value(article, field)
+            del article[legacy]
+    return article
+
+
+def _first(article: Dict[str, Any], *keys, default=None):
+    """Return the first non-null value among snake_case and legacy camelCase keys"""
+    for key in keys:
+        value = article.get(key)
+        if value is not None:
+            return value
+    return default
+
+
+def map_category(mongo_category: Optional[str]) -> str:
+    """Map a stored category to a valid ArticleCategory value (fallback to technology)"""
+    if mongo_category in API_CATEGORIES:
+        return mongo_category
+    return CATEGORY_MAP.get(mongo_category or DEFAULT_CATEGORY, 'technology')
+
+
+def compute_card_etag(card: Dict[str, Any]) -> str:
+    """Strong ETag (content hash) of a card, computed once at write time"""
+    return make_etag(json.dumps([card.get(f) for f in _ETAG_FIELDS], default=str, ensure_ascii=False))
+
+
+def card_etag(card: Dict[str, Any]) -> str:
+    """Stored card ETag (computed on the fly for cards built before ETags existed)"""
+    return card.get('etag') or compute_card_etag(card)
+
+
+def card_last_modified(card: Dict[str, Any]) -> Optional[datetime]:
+    """Last-Modified timestamp of a card"""
+    return card.get('updated_at') or card.get('published_at') or card.get('created_at')
+
+
+def build_article_card(article: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the card document (API shape) for a raw article document.
+
+    The card `_id` is the string form of the article `_id` so public lookups are a
+    single equality match, while `article_id` keeps the original typed `_id`
+    (int / str / ObjectId) for ordering and for writes back to `articles`.
+    """
+    source_category = article_category(article)
+    published_at = parse_dt(_first(article, 'published_at', 'publishedAt'))
+    created_at = parse_dt(_first(article, 'created_at', 'createdAt')) or published_at
+
+    card = {
+        "_id": str(article['_id']),
+        "article_id": article['_id'],
+        "title": article.get('title', ''),
+        "slug": article.get('slug', ''),
+        "excerpt": _first(article, 'excerpt', 'summary', default=''),
+        "content": article.get('content', ''),
+        "summary": _first(article, 'excerpt', 'summary', default=''),
+        "category": map_category(source_category),
+        "source_category": source_category,
+        "tags": article.get('tags', []),
+        "featured_image": _first(article, 'thumbnail', 'featured_image', default=''),
+        "language": article.get('language', 'vi'),
+        "status": article_status(article),
+        "author_id": str(_first(article, 'authorId', 'author_id', default=1)),
+        "author_name": _first(article, 'author', 'author_name', default='Unknown'),
+        "view_count": counter_value(article, 'view_count'),
+        "like_count": counter_value(article, 'like_count'),
+        "comment_count": counter_value(article, 'comment_count'),
+        "published_at": published_at,
+        "created_at": created_at,
+        "updated_at": parse_dt(_first(article, 'updated_at', 'updatedAt')),
+        "built_at": datetime.utcnow()  # a full rebuild drops cards built before it started
+    }
+    card['etag'] = compute_card_etag(card)
+    return card
+
+
+def _stale_cards_filter(started: datetime) -> Dict[str, Any]:
+    """Cards not rewritten since a full rebuild started (their article is gone)"""
+    return {"$or": [{"built_at": {"$lt": started}}, {"built_at": {"$exists": False}}]}
+
+
+def _record_status_change(before: Optional[Dict[str, Any]], card: Optional[Dict[str, Any]]):
+    """Push an article status change (creation / move / deletion) to live dashboards"""
+    old_status = before.get('status') if before else None
+    new_status = card.get('status') if card else None
+    if old_status != new_status:
+        dashboard_live.record_article_status(new_status, old_status)
+
+
+class ArticleCardService:
+    """Maintains the `article_cards` collection at write time.
+
+    Public listing endpoints read cards directly (one indexed query, no remapping);
+    every article write path calls `upsert` / `refresh` / `remove` to keep them in sync.
+    Category counters are adjusted from the previous card state in the same
+    transaction, so a card and the counters never disagree; status changes
+    derived from the same previous state are pushed to live dashboards.
+    """
+
+    def __init__(self):
+        self.collection_name = "article_cards"
+        self.rebuild_batch_size = 500
+
+    async def upsert(self, db, article: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Replace the card for an already-loaded article document"""
+        try:
+            card = build_article_card(article)
+
+            async def write(session):
+                before = await db.article_cards.find_one_and_replace(
+                    {"_id": card['_id']}, card, projection=COUNT_FIELDS, upsert=True, session=session
+                )
+                await category_count_service.apply(db, before, card, session=session)
+                return before
+
+            before = await run_in_transaction(db, write)
+            category_histogram_service.forget(card['_id'])
+            _record_status_change(before, card)
+            return card
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to upsert article card {article.get('_id')}: {e}")
+            return None
+
+    async def refresh(self, db, article_id) -> Optional[Dict[str, Any]]:
+        """Reload the article by its typed `_id` and rewrite (or drop) its card"""
+        try:
+            article = await db.articles.find_one({"_id": article_id})
+            if not article:
+                await self.remove(db, article_id)
+                return None
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to refresh article card {article_id}: {e}")
+            return None
+        return await self.upsert(db, article)
+
+    async def remove(self, db, article_id):
+        """Delete the card of a removed article"""
+        async def write(session):
+            before = await db.article_cards.find_one_and_delete(
+                {"_id": str(article_id)}, projection=COUNT_FIELDS, session=session
+            )
+            await category_count_service.apply(db, before, None, session=session)
+            return before
+
+        before = await run_in_transaction(db, write)
+        category_histogram_service.forget(article_id)
+        _record_status_change(before, None)
+
+    async def increment(self, db, article_id, field: str, amount: int = 1):
+        """Mirror a counter `$inc` applied to the article onto its card"""
+        await db.article_cards.update_one({"_id": str(article_id)}, {"$inc": {field: amount}})
+
+    def upsert_sync(self, db, article: Dict[str, Any]) -> Dict[str, Any]:
+        """Synchronous variant for pymongo callers (scheduler thread)"""
+        card = build_article_card(article)
+
+        def write(session):
+            before = db.article_cards.find_one_and_replace(
+                {"_id": card['_id']}, card, projection=COUNT_FIELDS, upsert=True, session=session
+            )
+            category_count_service.apply_sync(db, before, card, session=session)
+            return before
+
+        before = run_in_transaction_sync(db, write)
+        category_histogram_service.forget(card['_id'])
+        _record_status_change(before, card)
+        return card
+
+    async def rebuild(self, db) -> int:
+        """Recompute every card from the articles collection"""
+        started = datetime.utcnow()
+        ops = []
+        total = 0
+        async for article in db.articles.find({}):
+            card = build_article_card(article)
+            ops.append(ReplaceOne({"_id": card['_id']}, card, upsert=True))
+            if len(ops) >= self.rebuild_batch_size:
+                await db.article_cards.bulk_write(ops, ordered=False)
+                total += len(ops)
+                ops = []
+        if ops:
+            await db.article_cards.bulk_write(ops, ordered=False)
+            total += len(ops)
+
+        # Drop cards whose article no longer exists (not rewritten since the rebuild started)
+        await db.article_cards.delete_many(_stale_cards_filter(started))
+        logger.info(f"✅ Rebuilt {total} article cards")
+
+        # Bulk rebuild bypasses per-card counter deltas
+        await category_count_service.reconcile(db)
+        return total
+
+    def rebuild_sync(self, db) -> int:
+        """Synchronous variant of `rebuild` for maintenance scripts"""
+        started = datetime.utcnow()
+        ops = []
+        total = 0
+        for article in db.articles.find({}):
+            card = build_article_card(article)
+            ops.append(ReplaceOne({"_id": card['_id']}, card, upsert=True))
+            if len(ops) >= self.rebuild_batch_size:
+                db.article_cards.bulk_write(ops, ordered=False)
+                total += len(ops)
+                ops = []
+        if ops:
+            db.article_cards.bulk_write(ops, ordered=False)
+            total += len(ops)
+
+        db.article_cards.delete_many(_stale_cards_filter(started))
+        category_count_service.reconcile_sync(db)
+        return total
+
+    async def ensure_populated(self, db):
+        """Build cards on startup when the read model has never been populated"""
+        if db is None:
+            return
+        try:
+            if await db.article_cards.estimated_document_count() == 0 and \
+                    await db.articles.estimated_document_count() > 0:
+                logger.info("📇 Article cards empty - rebuilding read model...")
+                await self.rebuild(db)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to populate article cards: {e}")
+
+
+# Singleton instance
+article_card_service = ArticleCardService()
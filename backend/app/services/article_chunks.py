@@ -0,0 +1,179 @@
+"""
+Article Chunk Service - overlapping passages with embeddings for chatbot retrieval
+"""
+import hashlib
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+from pymongo import DeleteMany, ReplaceOne, UpdateOne
+
+from app.core.chunking import estimate_tokens, split_passages
+from app.core.config import settings
+from app.services.google_service import gemini_service
+from app.services.vector_search import chunk_search_service
+
+
+def chunks_hash(article: Dict[str, Any]) -> str:
+    """Fingerprint of the chunked fields and chunking parameters"""
+    source = f"{settings.CHUNK_CHARS}:{settings.CHUNK_OVERLAP_CHARS}:" \
+             f"{article.get('title') or ''}\n\n{article.get('content') or ''}"
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+
+def needs_chunking(article: Dict[str, Any]) -> bool:
+    """True when the stored passages do not match the current title and content"""
+    return article.get('chunks_source_hash') != chunks_hash(article)
+
+
+def article_passages(article: Dict[str, Any]) -> List[str]:
+    return split_passages(article.get('content') or "", settings.CHUNK_CHARS, settings.CHUNK_OVERLAP_CHARS)
+
+
+def passage_embedding_text(article: Dict[str, Any], passage: str) -> str:
+    """Text embedded for a passage: the article title gives it context"""
+    return f"{article.get('title') or ''}\n\n{passage}"
+
+
+def chunk_writes(
+    article: Dict[str, Any],
+    passages: List[str],
+    vectors: List[List[float]]
+) -> Tuple[list, UpdateOne]:
+    """`article_chunks` operations (upsert passages, drop surplus ones) and the article's hash update"""
+    now = datetime.utcnow()
+    article_id = article['_id']
+    ops: list = [
+        ReplaceOne(
+            {"_id": f"{article_id}:{i}"},
+            {
+                "article_id": article_id,
+                "chunk_index": i,
+                "text": passage,
+                "tokens": estimate_tokens(passage),
+                "vector": vector,
+                "vector_updated_at": now
+            },
+            upsert=True
+        )
+        for i, (passage, vector) in enumerate(zip(passages, vectors))
+    ]
+    ops.append(DeleteMany({"article_id": article_id, "chunk_index": {"$gte": len(passages)}}))
+    # Skipped if the article was edited meanwhile: the next embed task re-chunks it
+    mark = UpdateOne(
+        {"_id": article_id, "title": article.get('title'), "content": article.get('content')},
+        {"$set": {"chunks_source_hash": chunks_hash(article)}}
+    )
+    return ops, mark
+
+
+class ArticleChunkService:
+    """Splits articles into overlapping passages (`CHUNK_CHARS`, `CHUNK_OVERLAP_CHARS`)
+    and stores one embedded document per passage in `article_chunks`
+    (`_id` = `<article_id>:<chunk_index>`).
+
+    `chunks_source_hash` on the article records what the passages were built
+    from, so unchanged articles are never re-chunked. Passages of all articles in
+    a call are embedded together, `EMBEDDING_BATCH_SIZE` texts per API call.
+    """
+
+    def __init__(self):
+        self.batch_size = settings.EMBEDDING_BATCH_SIZE
+
+    def _plan(self, articles: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], List[str]]]:
+        return [(article, article_passages(article)) for article in articles if needs_chunking(article)]
+
+    def _texts(self, plan) -> List[str]:
+        return [passage_embedding_text(article, p) for article, passages in plan for p in passages]
+
+    def _writes(self, plan, vectors: List[List[float]]) -> Tuple[list, list]:
+        chunk_ops, article_ops = [], []
+        offset = 0
+        for article, passages in plan:
+            ops, mark = chunk_writes(article, passages, vectors[offset:offset + len(passages)])
+            offset += len(passages)
+            chunk_ops.extend(ops)
+            article_ops.append(mark)
+        return chunk_ops, article_ops
+
+    async def chunk_documents(self, db, articles: List[Dict[str, Any]]) -> int:
+        """(Re)build passages of the articles whose chunks are missing or stale; returns how many"""
+        plan = self._plan(articles)
+        if not plan:
+            return 0
+        texts = self._texts(plan)
+        vectors: List[List[float]] = []
+        for i in range(0, len(texts), self.batch_size):
+            vectors.extend(await gemini_service.create_document_embeddings(texts[i:i + self.batch_size]))
+        chunk_ops, article_ops = self._writes(plan, vectors)
+        await db.article_chunks.bulk_write(chunk_ops, ordered=True)
+        await db.articles.bulk_write(article_ops, ordered=False)
+        return len(plan)
+
+    def chunk_documents_sync(self, db, articles: List[Dict[str, Any]]) -> int:
+        """Synchronous `chunk_documents` for maintenance scripts (pymongo database)"""
+        plan = self._plan(articles)
+        if not plan:
+            return 0
+        texts = self._texts(plan)
+        vectors: List[List[float]] = []
+        for i in range(0, len(texts), self.batch_size):
+            vectors.extend(gemini_service.embed_sync(texts[i:i + self.batch_size]))
+        chunk_ops, article_ops = self._writes(plan, vectors)
+        db.article_chunks.bulk_write(chunk_ops, ordered=True)
+        db.articles.bulk_write(article_ops, ordered=False)
+        return len(plan)
+
+    async def remove(self, db, article_id: Any):
+        """Drop the passages of a deleted article (collection and local index)"""
+        chunk_ids = [doc['_id'] async for doc in db.article_chunks.find({"article_id": article_id}, {"_id": 1})]
+        await db.article_chunks.delete_many({"article_id": article_id})
+        for chunk_id in chunk_ids:
+            chunk_search_service.remove(chunk_id)
+
+    async def retrieve(
+        self,
+        db,
+        query_vector: List[float],
+        token_budget: int = settings.CHATBOT_CONTEXT_TOKEN_BUDGET,
+        candidates: int = settings.CHATBOT_PASSAGE_CANDIDATES
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Best passages of published articles that fit in `token_budget`.
+
+        Returns `(passages, articles)`: passages (`title`, `text`, `score`, ...)
+        best first, chosen greedily among the `candidates` nearest ones, and the
+        distinct source articles in order of their best passage.
+        """
+        hits = await chunk_search_service.similar(db, query_vector, candidates)
+        if not hits:
+            return [], []
+
+        article_ids = list({str(hit['article_id']): hit['article_id'] for hit in hits}.values())
+        articles = {
+            str(article['_id']): article
+            async for article in db.articles.find(
+                {"_id": {"$in": article_ids}, "status": "published"},
+                {"article_vector": 0}
+            )
+        }
+
+        passages: List[Dict[str, Any]] = []
+        sources: Dict[str, Dict[str, Any]] = {}
+        remaining = token_budget
+        for hit in hits:
+            article = articles.get(str(hit['article_id']))
+            tokens = hit.get('tokens') or estimate_tokens(hit.get('text', ''))
+            if article is None or tokens > remaining:
+                continue
+            remaining -= tokens
+            passages.append({
+                "article_id": str(hit['article_id']),
+                "chunk_index": hit.get('chunk_index'),
+                "title": article.get('title', ''),
+                "text": hit.get('text', ''),
+                "score": hit.get('score'),
+            })
+            sources.setdefault(str(hit['article_id']), article)
+        return passages, list(sources.values())
+
+
+# Singleton instance
+article_chunk_service = ArticleChunkService()
@@ -0,0 +1,133 @@
+"""
+Article Embedding Service - batched `article_vector` generation
+"""
+import hashlib
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+from pymongo import UpdateOne
+
+from app.core.config import settings
+from app.core.pagination import keyset_filter
+from app.services.article_chunks import article_chunk_service
+from app.services.google_service import gemini_service
+from app.services.id_resolver import candidate_ids
+
+
+EMBED_PROJECTION = {"title": 1, "content": 1, "vector_source_hash": 1, "chunks_source_hash": 1}
+
+CHECKPOINT_ID = "embedding_backfill"
+
+
+def embedding_text(article: Dict[str, Any]) -> str:
+    """Text embedded for an article: title, then body"""
+    return f"{article.get('title') or ''}\n\n{article.get('content') or ''}"
+
+
+def source_hash(article: Dict[str, Any]) -> str:
+    """Fingerprint of the embedded fields; the vector is stale when it changes"""
+    return hashlib.sha1(embedding_text(article).encode("utf-8")).hexdigest()
+
+
+def needs_embedding(article: Dict[str, Any]) -> bool:
+    """True when the article has no vector for its current title and content"""
+    return article.get('vector_source_hash') != source_hash(article)
+
+
+def embedding_updates(articles: List[Dict[str, Any]], vectors: List[List[float]]) -> List[UpdateOne]:
+    """`$set` operations storing vectors, skipped if the article was edited meanwhile"""
+    now = datetime.utcnow()
+    return [
+        UpdateOne(
+            {"_id": article['_id'], "title": article.get('title'), "content": article.get('content')},
+            {"$set": {
+                "article_vector": vector,
+                "vector_source_hash": source_hash(article),
+                "vector_updated_at": now
+            }}
+        )
+        for article, vector in zip(articles, vectors)
+    ]
+
+
+class ArticleEmbeddingService:
+    """Embeds articles in micro-batches of `EMBEDDING_BATCH_SIZE` texts per API call.
+
+    `vector_source_hash` records which title and content a vector was computed
+    from, so unchanged articles are never re-embedded. `vector_updated_at` lets
+    the local vector index pick up new vectors incrementally. The same pass
+    (re)builds the article's retrieval passages (`article_chunk_service`).
+    """
+
+    def __init__(self):
+        self.batch_size = settings.EMBEDDING_BATCH_SIZE
+
+    async def embed_documents(self, db, articles: List[Dict[str, Any]]) -> int:
+        """Embed the articles whose vector is missing or stale; returns how many"""
+        pending = [article for article in articles if needs_embedding(article)]
+        for i in range(0, len(pending), self.batch_size):
+            chunk = pending[i:i + self.batch_size]
+            vectors = await gemini_service.create_document_embeddings([embedding_text(a) for a in chunk])
+            await db.articles.bulk_write(embedding_updates(chunk, vectors), ordered=False)
+        await article_chunk_service.chunk_documents(db, articles)
+        return len(pending)
+
+    async def embed_articles(self, db, article_ids: List[str]) -> int:
+        """Embed articles by external id (one `$in` read for the whole batch)"""
+        ids = [typed for article_id in set(article_ids) for typed in candidate_ids(article_id)]
+        if not ids:
+            return 0
+        articles = await db.articles.find({"_id": {"$in": ids}}, EMBED_PROJECTION).to_list(length=None)
+        return await self.embed_documents(db, articles)
+
+    def backfill_sync(
+        self,
+        db,
+        restart: bool = False,
+        progress: Optional[Callable[[int, int], None]] = None
+    ) -> int:
+        """Embed the whole corpus in `_id` order, resuming from the stored checkpoint.
+
+        The checkpoint (last processed `_id`) is saved in `maintenance_checkpoints`
+        after every batch, so an interrupted run continues where it stopped.
+        """
+        if restart:
+            db.maintenance_checkpoints.delete_one({"_id": CHECKPOINT_ID})
+        checkpoint = db.maintenance_checkpoints.find_one({"_id": CHECKPOINT_ID}) or {}
+
+        query = keyset_filter([("_id", 1)], {"_id": checkpoint['last_id']}) if 'last_id' in checkpoint else {}
+        scanned = checkpoint.get('scanned', 0)
+        embedded = checkpoint.get('embedded', 0)
+
+        cursor = db.articles.find(query, EMBED_PROJECTION).sort("_id", 1).batch_size(self.batch_size * 4)
+        batch: List[Dict[str, Any]] = []
+
+        def _flush():
+            nonlocal scanned, embedded
+            pending = [article for article in batch if needs_embedding(article)]
+            if pending:
+                vectors = gemini_service.embed_sync([embedding_text(a) for a in pending])
+                db.articles.bulk_write(embedding_updates(pending, vectors), ordered=False)
+            article_chunk_service.chunk_documents_sync(db, batch)
+            scanned += len(batch)
+            embedded += len(pending)
+            db.maintenance_checkpoints.replace_one(
+                {"_id": CHECKPOINT_ID},
+                {"last_id": batch[-1]['_id'], "scanned": scanned, "embedded": embedded,
+                 "updated_at": datetime.utcnow()},
+                upsert=True
+            )
+            if progress:
+                progress(scanned, embedded)
+
+        for article in cursor:
+            batch.append(article)
+            if len(batch) >= self.batch_size:
+                _flush()
+                batch = []
+        if batch:
+            _flush()
+        return embedded
+
+
+# Singleton instance
+article_embedding_service = ArticleEmbeddingService()
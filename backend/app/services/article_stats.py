@@ -0,0 +1,136 @@
+"""
+Article Stats Service - running per-article event counts and read-time statistics
+"""
+import math
+from typing import Any, Dict, List, Optional
+from pymongo import ReplaceOne, UpdateOne
+
+from app.core import quantiles
+from app.services.analytics_rollups import event_read_time
+
+
+# article_id -> {"counts.<event_type>" | "read_time_sum" | "read_time_count" | "read_time_buckets.<i>": inc}
+StatsIncrements = Dict[str, Dict[str, float]]
+
+
+def stats_increments(events: List[Dict[str, Any]]) -> StatsIncrements:
+    """Coalesce stored events into one `$inc` document per article"""
+    incs: StatsIncrements = {}
+    for event in events:
+        event_type = getattr(event['event_type'], 'value', event['event_type'])
+        inc = incs.setdefault(event['article_id'], {})
+        inc[f"counts.{event_type}"] = inc.get(f"counts.{event_type}", 0) + 1
+
+        # Read time is reported with view events
+        read_time = event_read_time(event) if event_type == 'view' else None
+        if read_time is not None:
+            bucket = f"read_time_buckets.{quantiles.bucket_for(read_time)}"
+            inc['read_time_sum'] = inc.get('read_time_sum', 0.0) + read_time
+            inc['read_time_count'] = inc.get('read_time_count', 0) + 1
+            inc[bucket] = inc.get(bucket, 0) + 1
+    return incs
+
+
+def merge_stats_increments(target: StatsIncrements, source: StatsIncrements):
+    """Add `source` increments into `target` (carried over after a failed flush)"""
+    for article_id, inc in source.items():
+        current = target.setdefault(article_id, {})
+        for field, value in inc.items():
+            current[field] = current.get(field, 0) + value
+
+
+def read_time_summary(doc: Optional[Dict[str, Any]]) -> Dict[str, Optional[float]]:
+    """Average and p50 / p90 read time (seconds) of a stats document"""
+    doc = doc or {}
+    count = doc.get('read_time_count', 0)
+    buckets = {int(i): n for i, n in (doc.get('read_time_buckets') or {}).items()}
+    return {
+        "avg": doc.get('read_time_sum', 0.0) / count if count else 0.0,
+        "p50": quantiles.quantile(buckets, 0.5),
+        "p90": quantiles.quantile(buckets, 0.9),
+    }
+
+
+# (article, event type, read-time bucket) totals from raw events (backfill / repair)
+BACKFILL_PIPELINE = [
+    {"$project": {
+        "article_id": 1,
+        "event_type": 1,
+        "read_time": {"$cond": [
+            {"$and": [{"$eq": ["$event_type", "view"]}, {"$isNumber": "$metadata.read_time"}]},
+            "$metadata.read_time",
+            None
+        ]}
+    }},
+    {"$group": {
+        "_id": {
+            "article_id": "$article_id",
+            "event_type": "$event_type",
+            # Same bucketing as `quantiles.bucket_for`
+            "bucket": {"$switch": {
+                "branches": [
+                    {"case": {"$eq": ["$read_time", None]}, "then": None},
+                    {"case": {"$lt": ["$read_time", quantiles.MIN_VALUE]}, "then": 0},
+                ],
+                "default": {"$add": [1, {"$floor": {"$divide": [{"$ln": "$read_time"}, math.log(quantiles.GAMMA)]}}]}
+            }}
+        },
+        "count": {"$sum": 1},
+        "read_time_sum": {"$sum": {"$ifNull": ["$read_time", 0]}}
+    }}
+]
+
+
+class ArticleStatsService:
+    """Keeps one `article_stats` document per article (`_id` = article id string).
+
+    Holds all-time event counts (`counts.<event_type>`), the running sum and
+    number of view read times, and a log-bucket histogram of read times
+    (`read_time_buckets.<i>`, see `app.core.quantiles`) from which p50 / p90 are
+    read within ~5%. Everything is `$inc`-updated when events are flushed, so
+    article stats are a single document read.
+    """
+
+    async def apply(self, db, incs: StatsIncrements):
+        """Apply coalesced increments with one bulk write"""
+        if not incs:
+            return
+        await db.article_stats.bulk_write([
+            UpdateOne({"_id": article_id}, {"$inc": inc}, upsert=True)
+            for article_id, inc in incs.items()
+        ], ordered=False)
+
+    async def get(self, db, article_id: str) -> Optional[Dict[str, Any]]:
+        """Stats document of an article (None before its first event)"""
+        return await db.article_stats.find_one({"_id": article_id})
+
+    def backfill_sync(self, db) -> int:
+        """Recompute stats documents from the raw `analytics` collection.
+
+        Articles whose events were archived keep only their hot-collection events.
+        """
+        docs: Dict[str, Dict[str, Any]] = {}
+        for row in db.analytics.aggregate(BACKFILL_PIPELINE, allowDiskUse=True):
+            key = row['_id']
+            doc = docs.setdefault(key['article_id'], {
+                "_id": key['article_id'],
+                "counts": {},
+                "read_time_sum": 0.0,
+                "read_time_count": 0,
+                "read_time_buckets": {}
+            })
+            doc['counts'][key['event_type']] = doc['counts'].get(key['event_type'], 0) + row['count']
+            if key.get('bucket') is not None:
+                bucket = str(int(key['bucket']))
+                doc['read_time_sum'] += row['read_time_sum']
+                doc['read_time_count'] += row['count']
+                doc['read_time_buckets'][bucket] = doc['read_time_buckets'].get(bucket, 0) + row['count']
+
+        requests = [ReplaceOne({"_id": article_id}, doc, upsert=True) for article_id, doc in docs.items()]
+        for i in range(0, len(requests), 1000):
+            db.article_stats.bulk_write(requests[i:i + 1000], ordered=False)
+        return len(docs)
+
+
+# Singleton instance
+article_stats_service = ArticleStatsService()
@@ -0,0 +1,155 @@
+"""
+Category Count Service - incrementally maintained per-category article counters
+"""
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+from loguru import logger
+from pymongo import ReplaceOne, UpdateOne
+
+
+# Card fields the counters depend on
+COUNT_FIELDS = {"status": 1, "source_category": 1}
+
+# Used when an article's category / status is missing, null or empty
+DEFAULT_CATEGORY = "Technology"
+DEFAULT_STATUS = "draft"
+
+
+def article_category(article: Dict[str, Any]) -> str:
+    """Category an article is counted under (cards store it as `source_category`)"""
+    return article.get('category') or DEFAULT_CATEGORY
+
+
+def article_status(article: Dict[str, Any]) -> str:
+    """Status an article is counted under"""
+    return article.get('status') or DEFAULT_STATUS
+
+
+def _or_default(field: str, default: str) -> Dict[str, Any]:
+    """Aggregation form of `article.get(field) or default` (missing, null and "" → default)"""
+    return {"$ifNull": [{"$cond": [{"$eq": [f"${field}", ""]}, None, f"${field}"]}, default]}
+
+
+# Grouping used by `reconcile`; same rule as `article_category` / `article_status`
+_RECONCILE_PIPELINE = [
+    {"$group": {
+        "_id": {
+            "category": _or_default("category", DEFAULT_CATEGORY),
+            "status": _or_default("status", DEFAULT_STATUS)
+        },
+        "count": {"$sum": 1}
+    }}
+]
+
+
+def _key(card: Optional[Dict[str, Any]]):
+    if not card:
+        return None
+    return card.get('source_category'), card.get('status') or DEFAULT_STATUS
+
+
+def count_updates(before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> List[UpdateOne]:
+    """`$inc` operations moving one article from its previous (category, status) to the new one"""
+    old, new = _key(before), _key(after)
+    if old == new:
+        return []
+
+    deltas: Dict[Any, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    if old:
+        deltas[old[0]][old[1]] -= 1
+    if new:
+        deltas[new[0]][new[1]] += 1
+
+    updates = []
+    for category, statuses in deltas.items():
+        inc = {f"statuses.{status}": delta for status, delta in statuses.items() if delta}
+        total = sum(statuses.values())
+        if total:
+            inc["total"] = total
+        if inc:
+            updates.append(UpdateOne({"_id": category}, {"$inc": inc}, upsert=True))
+    return updates
+
+
+def _documents_from_groups(groups: List[Dict[str, Any]]) -> Dict[Any, Dict[str, Any]]:
+    docs: Dict[Any, Dict[str, Any]] = {}
+    for group in groups:
+        category = group['_id']['category']
+        status = group['_id']['status']
+        doc = docs.setdefault(category, {"_id": category, "statuses": {}, "total": 0})
+        doc['statuses'][status] = doc['statuses'].get(status, 0) + group['count']
+        doc['total'] += group['count']
+    return docs
+
+
+class CategoryCountService:
+    """Keeps one small `category_counts` document per category.
+
+    Each document holds `total` and `statuses.<status>` counts. They are updated
+    together with the article card (in the same transaction when the server
+    supports it), so reads are O(categories) instead of a `$group` over all
+    articles. `reconcile` recomputes everything from scratch to repair drift.
+    """
+
+    async def apply(self, db, before, after, session=None):
+        """Apply the counter change for one card write"""
+        updates = count_updates(before, after)
+        if updates:
+            await db.category_counts.bulk_write(updates, ordered=False, session=session)
+
+    def apply_sync(self, db, before, after, session=None):
+        """Synchronous variant for pymongo callers"""
+        updates = count_updates(before, after)
+        if updates:
+            db.category_counts.bulk_write(updates, ordered=False, session=session)
+
+    async def published_categories(self, db) -> List[Dict[str, Any]]:
+        """Categories with their published article count, most articles first"""
+        docs = await db.category_counts.find(
+            {"statuses.published": {"$gt": 0}}
+        ).sort("statuses.published", -1).to_list(length=None)
+        return [{"name": doc['_id'], "count": doc['statuses']['published']} for doc in docs]
+
+    async def totals_by_category(self, db) -> Dict[str, int]:
+        """Article count per category (all statuses)"""
+        docs = await db.category_counts.find({"total": {"$gt": 0}}).to_list(length=None)
+        return {doc['_id']: doc['total'] for doc in docs}
+
+    async def reconcile(self, db) -> int:
+        """Recompute all counters from the articles collection"""
+        groups = await db.articles.aggregate(_RECONCILE_PIPELINE).to_list(length=None)
+        docs = _documents_from_groups(groups)
+        if docs:
+            await db.category_counts.bulk_write(
+                [ReplaceOne({"_id": cat}, doc, upsert=True) for cat, doc in docs.items()],
+                ordered=False
+            )
+        await db.category_counts.delete_many({"_id": {"$nin": list(docs.keys())}})
+        logger.info(f"✅ Reconciled category counts ({len(docs)} categories)")
+        return len(docs)
+
+    def reconcile_sync(self, db) -> int:
+        """Synchronous variant of `reconcile` for maintenance scripts"""
+        groups = list(db.articles.aggregate(_RECONCILE_PIPELINE))
+        docs = _documents_from_groups(groups)
+        if docs:
+            db.category_counts.bulk_write(
+                [ReplaceOne({"_id": cat}, doc, upsert=True) for cat, doc in docs.items()],
+                ordered=False
+            )
+        db.category_counts.delete_many({"_id": {"$nin": list(docs.keys())}})
+        return len(docs)
+
+    async def ensure_populated(self, db):
+        """Compute counters on startup when they have never been built"""
+        if db is None:
+            return
+        try:
+            if await db.category_counts.estimated_document_count() == 0:
+                await self.reconcile(db)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to populate category counts: {e}")
+
+
+# Singleton instance
+category_count_service = CategoryCountService()
@@ -0,0 +1,153 @@
+"""
+Category Histogram Service - per-category view counts by hour of day and weekday
+"""
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from pymongo import ReplaceOne, UpdateOne
+
+
+# view events per (article_id, hour bucket), as produced by `rollup_increments`
+ViewIncrements = Dict[Any, Dict[str, float]]
+
+# Rebuilds (category, weekday, hour) view counts from raw events; weekday 0 = Monday
+BACKFILL_PIPELINE = [
+    {"$match": {"event_type": "view"}},
+    {"$group": {
+        "_id": {
+            "article_id": "$article_id",
+            "weekday": {"$subtract": [{"$isoDayOfWeek": "$timestamp"}, 1]},
+            "hour": {"$hour": "$timestamp"}
+        },
+        "count": {"$sum": 1}
+    }},
+    # Cards are keyed by the string article id, like analytics events
+    {"$lookup": {
+        "from": "article_cards",
+        "localField": "_id.article_id",
+        "foreignField": "_id",
+        "as": "card"
+    }},
+    {"$unwind": "$card"},
+    {"$group": {
+        "_id": {"category": "$card.source_category", "weekday": "$_id.weekday", "hour": "$_id.hour"},
+        "count": {"$sum": "$count"}
+    }}
+]
+
+
+def _empty_document(category: str) -> Dict[str, Any]:
+    return {
+        "_id": category,
+        "hours": {str(h): 0 for h in range(24)},
+        "week": {str(d): {str(h): 0 for h in range(24)} for d in range(7)},
+    }
+
+
+class CategoryHistogramService:
+    """Keeps one `category_hour_histogram` document per (source) category.
+
+    `hours.<h>` counts view events by UTC hour of day and `week.<d>.<h>` by
+    weekday (0 = Monday) and hour, so the optimal publish time is read from a
+    single document. Counters are incremented when view events are flushed;
+    the article → category mapping comes from the article cards. It is cached
+    for `ttl_seconds` and dropped at once when this process rewrites the card
+    (`forget`), so views follow a category change.
+    """
+
+    def __init__(self, max_cached_categories: int = 10000, ttl_seconds: float = 300):
+        self.max_cached_categories = max_cached_categories
+        self.ttl_seconds = ttl_seconds
+        self._categories: "OrderedDict[str, Tuple[Optional[str], float]]" = OrderedDict()
+
+    def forget(self, article_id: Any):
+        """Drop the cached category of an article whose card changed"""
+        self._categories.pop(str(article_id), None)
+
+    async def _categories_for(self, db, article_ids: List[str]) -> Dict[str, Optional[str]]:
+        """Source category per article id (LRU; misses resolved with one `$in` query)"""
+        result: Dict[str, Optional[str]] = {}
+        missing = []
+        now = time.monotonic()
+        for article_id in article_ids:
+            cached = self._categories.get(article_id)
+            if cached is not None and cached[1] > now:
+                self._categories.move_to_end(article_id)
+                result[article_id] = cached[0]
+            else:
+                missing.append(article_id)
+
+        if missing:
+            expires_at = now + self.ttl_seconds
+            async for card in db.article_cards.find({"_id": {"$in": missing}}, {"source_category": 1}):
+                result[card['_id']] = card.get('source_category')
+                self._categories[card['_id']] = (card.get('source_category'), expires_at)
+                self._categories.move_to_end(card['_id'])
+            while len(self._categories) > self.max_cached_categories:
+                self._categories.popitem(last=False)
+        return result
+
+    async def apply(self, db, view_incs: ViewIncrements):
+        """Add view counts (keyed by (article_id, event_type, hour) like rollups)"""
+        if not view_incs:
+            return
+        categories = await self._categories_for(db, list({key[0] for key in view_incs}))
+
+        incs: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        for (article_id, _, hour), inc in view_incs.items():
+            category = categories.get(article_id)
+            if category is None:
+                continue
+            incs[category][f"hours.{hour.hour}"] += inc['count']
+            incs[category][f"week.{hour.weekday()}.{hour.hour}"] += inc['count']
+
+        if incs:
+            await db.category_hour_histogram.bulk_write([
+                UpdateOne({"_id": category}, {"$inc": dict(fields)}, upsert=True)
+                for category, fields in incs.items()
+            ], ordered=False)
+
+    async def get(self, db, category: str) -> Dict[str, Any]:
+        """Histogram document of a category (all zeros when it has no views)"""
+        doc = await db.category_hour_histogram.find_one({"_id": category})
+        return doc or _empty_document(category)
+
+    def backfill_sync(self, db) -> int:
+        """Recompute every histogram from the raw `analytics` collection"""
+        docs: Dict[str, Dict[str, Any]] = {}
+        for row in db.analytics.aggregate(BACKFILL_PIPELINE, allowDiskUse=True):
+            category = row['_id']['category']
+            if category is None:
+                continue
+            doc = docs.setdefault(category, _empty_document(category))
+            weekday, hour = str(row['_id']['weekday']), str(row['_id']['hour'])
+            doc['hours'][hour] += row['count']
+            doc['week'][weekday][hour] += row['count']
+
+        if docs:
+            db.category_hour_histogram.bulk_write(
+                [ReplaceOne({"_id": cat}, doc, upsert=True) for cat, doc in docs.items()],
+                ordered=False
+            )
+        db.category_hour_histogram.delete_many({"_id": {"$nin": list(docs.keys())}})
+        return len(docs)
+
+
+def peak_hours(doc: Dict[str, Any], limit: int = 5) -> List[Dict[str, int]]:
+    """Busiest hours of day, most views first"""
+    hours = [{"hour": int(h), "views": n} for h, n in (doc.get('hours') or {}).items() if n > 0]
+    return sorted(hours, key=lambda item: item['views'], reverse=True)[:limit]
+
+
+def peak_weekly_slots(doc: Dict[str, Any], limit: int = 5) -> List[Dict[str, int]]:
+    """Busiest (weekday, hour) slots, most views first (weekday 0 = Monday)"""
+    slots = [
+        {"weekday": int(d), "hour": int(h), "views": n}
+        for d, hours in (doc.get('week') or {}).items()
+        for h, n in hours.items() if n > 0
+    ]
+    return sorted(slots, key=lambda item: item['views'], reverse=True)[:limit]
+
+
+# Singleton instance
+category_histogram_service = CategoryHistogramService()
@@ -0,0 +1,158 @@
+"""
+Dashboard Live Hub - shared in-process aggregator pushing dashboard deltas to admins
+"""
+import asyncio
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Optional, Set
+from loguru import logger
+
+from app.core.config import settings
+from app.core.database import get_database
+from app.core.sse import sse_event
+from app.core.tasks import PeriodicTask
+from app.services.dashboard_stats import dashboard_stats_service
+
+
+# Comment line sent when nothing happened, so proxies keep the stream open
+KEEPALIVE_SECONDS = 15
+
+
+class _Subscriber:
+    def __init__(self, max_queue: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.dropped = False
+
+
+class DashboardLiveHub:
+    """Aggregates dashboard changes in memory and fans them out to every connected admin.
+
+    Request handlers record views, comments (with sentiment) and article status
+    changes as plain counter increments. Every `DASHBOARD_LIVE_TICK_SECONDS` the
+    pending increments become one `delta` message pushed to all subscribers.
+    Subscribers start from the shared dashboard snapshot and get a new
+    `snapshot` message whenever it is refreshed, which resyncs their totals.
+
+    Database load is one snapshot `find_one` per refresh interval, however many
+    dashboards are open. Deltas cover this process only; with several API
+    workers each dashboard sees the traffic of its worker between snapshots.
+    A subscriber that falls `DASHBOARD_LIVE_QUEUE_SIZE` messages behind is
+    disconnected; EventSource reconnects and starts from a fresh snapshot.
+    """
+
+    def __init__(self):
+        self.max_queue = settings.DASHBOARD_LIVE_QUEUE_SIZE
+        self.snapshot_interval = settings.DASHBOARD_SNAPSHOT_SECONDS
+        self._subscribers: Set[_Subscriber] = set()
+        self._delta = self._empty_delta()
+        self._seq = 0
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._snapshot_checked = 0.0
+        self._snapshot_lock = asyncio.Lock()
+        self._task = PeriodicTask("dashboard_live", settings.DASHBOARD_LIVE_TICK_SECONDS, self.tick)
+
+    @staticmethod
+    def _empty_delta() -> Dict[str, Any]:
+        return {
+            "views": 0,
+            "comments": 0,
+            "sentiment": Counter(),
+            "articles": Counter(),  # status -> change in article count
+            "top_viewed": Counter(),
+        }
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def record_view(self, article_id: str):
+        self._delta['views'] += 1
+        self._delta['top_viewed'][str(article_id)] += 1
+
+    def record_comment(self, sentiment: Optional[str], count: int = 1):
+        """A comment was created (count=1) or deleted (count=-1)"""
+        self._delta['comments'] += count
+        if sentiment:
+            self._delta['sentiment'][sentiment] += count
+
+    def record_article_status(self, new_status: Optional[str], old_status: Optional[str] = None):
+        """An article was created (no old status), deleted (no new status) or moved between statuses"""
+        if old_status:
+            self._delta['articles'][old_status] -= 1
+        if new_status:
+            self._delta['articles'][new_status] += 1
+
+    def _take_delta(self) -> Optional[Dict[str, Any]]:
+        delta, self._delta = self._delta, self._empty_delta()
+        if not (delta['views'] or delta['comments'] or any(delta['articles'].values())):
+            return None
+        return {
+            "views": delta['views'],
+            "comments": delta['comments'],
+            "sentiment": {k: v for k, v in delta['sentiment'].items() if v},
+            "articles": {k: v for k, v in delta['articles'].items() if v},
+            "top_viewed": dict(delta['top_viewed'].most_common(5)),
+            "at": datetime.utcnow(),
+        }
+
+    def _broadcast(self, frame: str):
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                subscriber.dropped = True
+                self._subscribers.discard(subscriber)
+                logger.warning("⚠️ Dashboard live subscriber too slow - disconnected")
+
+    async def _load_snapshot(self, db) -> Dict[str, Any]:
+        """Shared snapshot (one read per refresh interval for all subscribers)"""
+        async with self._snapshot_lock:
+            if self._snapshot is None or time.monotonic() - self._snapshot_checked >= self.snapshot_interval:
+                self._snapshot = await dashboard_stats_service.get(db)
+                self._snapshot_checked = time.monotonic()
+            return self._snapshot
+
+    async def tick(self):
+        """Push pending deltas, and the snapshot when it was refreshed"""
+        delta = self._take_delta()
+        if not self._subscribers:
+            return
+
+        if delta:
+            self._seq += 1
+            self._broadcast(sse_event("delta", delta, self._seq))
+
+        if time.monotonic() - self._snapshot_checked >= self.snapshot_interval:
+            db = get_database()
+            if db is None:
+                return
+            previous = self._snapshot
+            snapshot = await self._load_snapshot(db)
+            if previous is None or snapshot['computed_at'] != previous['computed_at']:
+                self._broadcast(sse_event("snapshot", snapshot))
+
+    async def stream(self, db) -> AsyncIterator[str]:
+        """SSE frames for one admin: the current snapshot, then deltas until disconnect"""
+        subscriber = _Subscriber(self.max_queue)
+        self._subscribers.add(subscriber)
+        try:
+            yield sse_event("snapshot", await self._load_snapshot(db))
+            while not subscriber.dropped:
+                try:
+                    yield await asyncio.wait_for(subscriber.queue.get(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+        finally:
+            self._subscribers.discard(subscriber)
+
+    def start(self):
+        """Start the broadcast loop"""
+        self._task.start()
+
+    async def stop(self):
+        await self._task.stop()
+
+
+# Singleton instance
+dashboard_live = DashboardLiveHub()
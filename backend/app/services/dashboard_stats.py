@@ -0,0 +1,103 @@
+"""
+Dashboard Stats Service - periodically refreshed snapshot of admin dashboard numbers
+"""
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.core.database import get_database
+from app.core.tasks import PeriodicTask
+from app.services.category_counts import category_count_service
+
+
+SNAPSHOT_ID = "dashboard"
+
+# One pass over articles: status counts and total views
+_ARTICLES_FACET = [{"$facet": {
+    "statuses": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+    "views": [{"$group": {"_id": None, "total_views": {"$sum": "$view_count"}}}]
+}}]
+
+# One pass over comments: total and sentiment distribution
+_COMMENTS_FACET = [{"$facet": {
+    "total": [{"$count": "count"}],
+    "sentiments": [{"$group": {"_id": "$sentiment", "count": {"$sum": 1}}}]
+}}]
+
+
+class DashboardStatsService:
+    """Computes the admin dashboard numbers and stores them as one snapshot.
+
+    A refresh runs one `$facet` aggregation per collection, all concurrently,
+    and writes the result to `dashboard_snapshots`. The snapshot is refreshed
+    every `DASHBOARD_SNAPSHOT_SECONDS`; requests read it (one `find_one`) and
+    can force a recomputation with `fresh=True`.
+    """
+
+    def __init__(self):
+        self._task = PeriodicTask(
+            "dashboard_snapshot", settings.DASHBOARD_SNAPSHOT_SECONDS, self.refresh
+        )
+
+    async def compute(self, db) -> Dict[str, Any]:
+        """Compute all dashboard numbers in one concurrent batch"""
+        articles, comments, total_users, articles_by_category = await asyncio.gather(
+            db.articles.aggregate(_ARTICLES_FACET).to_list(length=1),
+            db.comments.aggregate(_COMMENTS_FACET).to_list(length=1),
+            db.users.estimated_document_count(),
+            category_count_service.totals_by_category(db)
+        )
+
+        statuses = {item['_id']: item['count'] for item in articles[0]['statuses']}
+        views = articles[0]['views']
+        comment_total = comments[0]['total']
+
+        return {
+            "total_articles": sum(statuses.values()),
+            "published_articles": statuses.get("published", 0),
+            "draft_articles": statuses.get("draft", 0),
+            "pending_review": statuses.get("pending_review", 0),
+            "total_users": total_users,
+            "total_comments": comment_total[0]['count'] if comment_total else 0,
+            "total_views": views[0]['total_views'] if views else 0,
+            "articles_by_category": articles_by_category,
+            "sentiment_distribution": {
+                item['_id']: item['count'] for item in comments[0]['sentiments'] if item['_id']
+            },
+        }
+
+    async def refresh(self, db=None) -> Optional[Dict[str, Any]]:
+        """Recompute and store the snapshot"""
+        if db is None:
+            db = get_database()
+        if db is None:
+            return None
+
+        snapshot = await self.compute(db)
+        snapshot['computed_at'] = datetime.utcnow()
+        await db.dashboard_snapshots.replace_one({"_id": SNAPSHOT_ID}, snapshot, upsert=True)
+        return snapshot
+
+    async def get(self, db, fresh: bool = False) -> Dict[str, Any]:
+        """Stored snapshot (computed on demand when missing or `fresh`) with its age"""
+        snapshot = None
+        if not fresh:
+            snapshot = await db.dashboard_snapshots.find_one({"_id": SNAPSHOT_ID})
+        if snapshot is None:
+            snapshot = await self.refresh(db)
+
+        snapshot.pop('_id', None)
+        snapshot['age_seconds'] = (datetime.utcnow() - snapshot['computed_at']).total_seconds()
+        return snapshot
+
+    def start(self):
+        """Start the periodic refresh loop"""
+        self._task.start()
+
+    async def stop(self):
+        await self._task.stop()
+
+
+# Singleton instance
+dashboard_stats_service = DashboardStatsService()
@@ -0,0 +1,150 @@
+"""
+Embedding Cache - in-process LRU in front of the persistent `embedding_cache` collection
+"""
+import hashlib
+import re
+import threading
+import unicodedata
+from array import array
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List
+from bson import Binary
+from loguru import logger
+from pymongo import UpdateOne
+
+from app.core.config import settings
+from app.core.database import get_database
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Unicode NFC with collapsed whitespace: formatting-only differences share a vector"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text or "")).strip()
+
+
+def cache_key(model: str, text: str) -> str:
+    """`<model>:<sha256 of the normalized text>`"""
+    digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"{model}:{digest}"
+
+
+def _pack(vector: List[float]) -> Binary:
+    return Binary(array("f", vector).tobytes())
+
+
+def _unpack(data: bytes) -> array:
+    vector = array("f")
+    vector.frombytes(data)
+    return vector
+
+
+class EmbeddingCache:
+    """Caches embeddings by `(model, sha256(normalized text))`.
+
+    `model` identifies everything that changes the vector (provider model,
+    task type, dimensions). Vectors are kept as float32 arrays: up to
+    `EMBEDDING_CACHE_MAX_ENTRIES` in an in-process LRU, and all of them in the
+    `embedding_cache` collection (packed float32 bytes), which survives
+    restarts and is shared by the API and the workers. Cache failures are
+    logged and fall through to the embedding API.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, array]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    def _remember(self, key: str, vector: array):
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _lookup(self, key: str):
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+            return vector
+
+    async def _load(self, db, keys: List[str]) -> Dict[str, array]:
+        found = {}
+        try:
+            async for doc in db.embedding_cache.find({"_id": {"$in": keys}}, {"vector": 1}):
+                found[doc['_id']] = _unpack(doc['vector'])
+        except Exception as e:
+            logger.warning(f"⚠️ Embedding cache read failed: {e}")
+        return found
+
+    async def _store(self, db, model: str, vectors: Dict[str, List[float]]):
+        try:
+            now = datetime.utcnow()
+            await db.embedding_cache.bulk_write([
+                UpdateOne(
+                    {"_id": key},
+                    {"$setOnInsert": {"model": model, "vector": _pack(vector), "created_at": now}},
+                    upsert=True
+                )
+                for key, vector in vectors.items()
+            ], ordered=False)
+        except Exception as e:
+            logger.warning(f"⚠️ Embedding cache write failed: {e}")
+
+    async def get_or_compute(
+        self,
+        model: str,
+        texts: List[str],
+        compute: Callable[[List[str]], Awaitable[List[List[float]]]]
+    ) -> List[List[float]]:
+        """Vectors for `texts` (in order); only uncached distinct texts reach `compute`"""
+        keys = [cache_key(model, text) for text in texts]
+        vectors: Dict[str, Any] = {}
+        for key in keys:
+            vector = self._lookup(key)
+            if vector is not None:
+                vectors[key] = vector
+        self.hits += sum(1 for key in keys if key in vectors)
+
+        db = get_database()
+        missing = list(dict.fromkeys(key for key in keys if key not in vectors))
+        if missing and db is not None:
+            for key, vector in (await self._load(db, missing)).items():
+                vectors[key] = vector
+                self._remember(key, vector)
+                self.db_hits += 1
+            missing = [key for key in missing if key not in vectors]
+
+        if missing:
+            self.misses += len(missing)
+            text_of = {key: text for key, text in zip(keys, texts)}
+            computed = dict(zip(missing, await compute([text_of[key] for key in missing])))
+            for key, vector in computed.items():
+                vectors[key] = array("f", vector)
+                self._remember(key, vectors[key])
+            if db is not None:
+                await self._store(db, model, computed)
+
+        return [vectors[key].tolist() for key in keys]
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit / miss statistics (memory hits, collection hits, API calls)"""
+        lookups = self.hits + self.db_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.db_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Singleton instance
+embedding_cache = EmbeddingCache(max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES)
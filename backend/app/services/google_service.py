@@ -4,13 +4,15 @@ Google Cloud Services & Google AI (Gemini) Service
 from google.cloud import translate_v2 as translate
 from google.cloud import language_v1
 import google.generativeai as genai
-from typing import Dict, List
+from typing import AsyncIterator, Dict, List
 from loguru import logger
 import os
 import asyncio
+import threading
 from datetime import datetime
 
 from app.core.config import settings
+from app.services.embedding_cache import embedding_cache
 
 # ==========================================================
 # DỊCH VỤ GOOGLE CLOUD (Dịch thuật, Cảm xúc)
@@ -247,15 +249,54 @@ class GeminiService:
         prompt = f"Phân loại đoạn văn bản sau vào 1 trong các chủ đề (ví dụ: Tin tức, Phân tích, Hướng dẫn): \n\n{text}"
         return await self.generate_text(prompt, max_tokens=50)
 
+    def embed_sync(self, contents: List[str], task_type: str = "retrieval_document") -> List[List[float]]:
+        """Embedding cho nhiều văn bản (gọi đồng bộ, tối đa 100 văn bản mỗi request)."""
+        if not self.api_key:
+            raise Exception("Gemini API key not configured.")
+
+        vectors = []
+        try:
+            for i in range(0, len(contents), 100):
+                result = genai.embed_content(
+                    model=settings.GEMINI_EMBEDDING_MODEL,
+                    content=[text[:8000] for text in contents[i:i + 100]],  # Limit input size
+                    task_type=task_type,
+                    output_dimensionality=settings.EMBEDDING_DIMENSIONS
+                )
+                vectors.extend(result['embedding'])
+        except Exception as e:
+            error_str = str(e).lower()
+            logger.error(f"❌ Gemini embedding error: {e}")
+            if "quota" in error_str or "rate" in error_str:
+                self.quota_exceeded = True
+                self.last_error_time = datetime.now()
+            raise
+        return vectors
+
+    async def _cached_embeddings(self, texts: List[str], task_type: str) -> List[List[float]]:
+        """Embedding qua cache (model, sha256(text)): chỉ gọi API cho văn bản chưa có."""
+        model = f"gemini:{settings.GEMINI_EMBEDDING_MODEL}:{task_type}:{settings.EMBEDDING_DIMENSIONS}"
+
+        async def _compute(missing: List[str]) -> List[List[float]]:
+            return await asyncio.to_thread(self.embed_sync, missing, task_type)
+
+        return await embedding_cache.get_or_compute(model, texts, _compute)
+
     async def create_embedding(self, text: str) -> List[float]:
-        """Tạo embedding cho văn bản (dùng cho RAG)."""
-        # Temporarily return dummy embedding to avoid quota issues
-        return [0.0] * 768  # Standard embedding size
+        """Tạo embedding cho câu truy vấn (dùng cho RAG)."""
+        vectors = await self._cached_embeddings([text], "retrieval_query")
+        return vectors[0]
         
     async def create_document_embedding(self, text: str) -> List[float]:
         """Tạo embedding cho văn bản (dùng để lưu trữ)."""
-        # Temporarily return dummy embedding to avoid quota issues
-        return [0.0] * 768  # Standard embedding size
+        vectors = await self.create_document_embeddings([text])
+        return vectors[0]
+
+    async def create_document_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Tạo embedding cho nhiều văn bản với một lần gọi API (batch)."""
+        if not texts:
+            return []
+        return await self._cached_embeddings(texts, "retrieval_document")
 
     def _check_rate_limit(self) -> bool:
         """Check and update rate limits."""
@@ -290,6 +331,42 @@ class GeminiService:
         self.request_count += 1
         return True
 
+    def _chat_contents(self, messages: list[dict], context: str = "") -> list[dict]:
+        """Nội dung gửi cho Gemini: system prompt, lịch sử, câu hỏi mới nhất, rồi ngữ cảnh (RAG)."""
+        contents = [
+            {
+                "role": "user",
+                "parts": ["Bạn là trợ lý AI chuyên về tin tức crypto/blockchain. Trả lời ngắn gọn, chính xác."]
+            },
+            {
+                "role": "model",
+                "parts": ["Xin chào! Tôi sẽ trả lời các câu hỏi về crypto/blockchain một cách ngắn gọn và chính xác."]
+            }
+        ]
+
+        # Add previous messages for context
+        for msg in messages[:-1]:  # All except the latest
+            content = msg.get("content", "")
+            if content:
+                contents.append({
+                    "role": "user" if msg.get("role") != "assistant" else "model",
+                    "parts": [content]
+                })
+
+        # Add latest message, then context if available
+        contents.append({"role": "user", "parts": [messages[-1].get('content', '')]})
+        if context:
+            contents.append({"role": "user", "parts": [f"Thông tin bổ sung: {context}"]})
+        return contents
+
+    def _busy_message(self) -> str:
+        """Thông báo khi vượt giới hạn tốc độ / quota."""
+        if self.quota_exceeded and self.last_error_time:
+            cooldown_remaining = 60 - (datetime.now() - self.last_error_time).total_seconds()
+            if cooldown_remaining > 0:
+                return f"Hệ thống đang tạm nghỉ để đảm bảo chất lượng. Vui lòng thử lại sau {cooldown_remaining:.0f} giây."
+        return "Hệ thống đang bận. Vui lòng thử lại sau vài giây."
+
     async def chat_completion(self, messages: list[dict], context: str = "") -> str:
         """Tạo phản hồi chat."""
         try:
@@ -299,53 +376,16 @@ class GeminiService:
 
             # Check rate limits and quota
             if not self._check_rate_limit():
-                if self.quota_exceeded and self.last_error_time:
-                    current_time = datetime.now()
-                    cooldown_remaining = 60 - (current_time - self.last_error_time).total_seconds()
-                    if cooldown_remaining > 0:
-                        return f"Hệ thống đang tạm nghỉ để đảm bảo chất lượng. Vui lòng thử lại sau {cooldown_remaining:.0f} giây."
-                return "Hệ thống đang bận. Vui lòng thử lại sau vài giây."
+                return self._busy_message()
 
             def _chat_sync():
                 try:
-                    # Create content list for the model
-                    contents = []
-                    
-                    # Add system prompt
-                    contents.append({
-                        "role": "user",
-                        "parts": ["Bạn là trợ lý AI chuyên về tin tức crypto/blockchain. Trả lời ngắn gọn, chính xác."]
-                    })
-                    contents.append({
-                        "role": "model",
-                        "parts": ["Xin chào! Tôi sẽ trả lời các câu hỏi về crypto/blockchain một cách ngắn gọn và chính xác."]
-                    })
-                    
-                    # Add previous messages for context
-                    for msg in messages[:-1]:  # All except the latest
-                        content = msg.get("content", "")
-                        if content:
-                            contents.append({
-                                "role": "user" if msg.get("role") != "assistant" else "model",
-                                "parts": [content]
-                            })
-                    
-                    # Lấy nội dung tin nhắn
-                    user_message = messages[-1].get('content', '')
-                    if not user_message:
-                        return "Xin lỗi, tôi không nhận được nội dung câu hỏi. Vui lòng thử lại."
-
                     # Lấy tin nhắn mới nhất
                     user_message = messages[-1].get('content', '')
                     if not user_message:
                         return "Xin lỗi, tôi không nhận được nội dung câu hỏi. Vui lòng thử lại."
-                    
-                    # Add latest message
-                    contents.append({"role": "user", "parts": [user_message]})
-                    
-                    # Add context if available
-                    if context:
-                        contents.append({"role": "user", "parts": [f"Thông tin bổ sung: {context}"]})
+
+                    contents = self._chat_contents(messages, context)
                     
                     try:
                         # Generate response using content history
@@ -407,5 +447,74 @@ class GeminiService:
             logger.error(f"❌ Gemini error: {str(e)}")
             return "Xin lỗi, có lỗi xảy ra. Vui lòng thử lại sau."
 
+    async def stream_chat_completion(self, messages: list[dict], context: str = "") -> AsyncIterator[str]:
+        """Tạo phản hồi chat dạng stream: trả về từng đoạn văn bản ngay khi Gemini sinh ra."""
+        if not messages or not messages[-1].get('content'):
+            yield "Xin lỗi, tôi không nhận được câu hỏi của bạn. Vui lòng thử lại."
+            return
+        if not self.model:
+            yield "Xin lỗi, có lỗi xảy ra. Vui lòng thử lại sau."
+            return
+        if not self._check_rate_limit():
+            yield self._busy_message()
+            return
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        finished = object()
+        cancelled = threading.Event()
+
+        def _stream_sync():
+            # The SDK iterator blocks between chunks: drain it in a thread, hand chunks to the loop
+            try:
+                response = self.model.generate_content(
+                    contents=self._chat_contents(messages, context),
+                    generation_config={"temperature": 0.7, "max_output_tokens": 250},
+                    stream=True
+                )
+                for chunk in response:
+                    if cancelled.is_set():
+                        break
+                    for candidate in chunk.candidates[:1]:
+                        text = "".join(part.text for part in candidate.content.parts if getattr(part, 'text', None))
+                        if text:
+                            loop.call_soon_threadsafe(queue.put_nowait, text)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, finished)
+
+        producer = asyncio.create_task(asyncio.to_thread(_stream_sync))
+        streamed = False
+        try:
+            while True:
+                item = await queue.get()
+                if item is finished:
+                    break
+                if isinstance(item, Exception):
+                    error_str = str(item).lower()
+                    logger.error(f"❌ Lỗi chat (stream): {item}")
+                    busy = "429" in error_str or "quota" in error_str or "rate" in error_str
+                    if busy:
+                        self.quota_exceeded = True
+                        self.last_error_time = datetime.now()
+                    if not streamed:
+                        streamed = True
+                        yield "API đang bận. Vui lòng thử lại sau 10 giây." if busy \
+                            else "Xin lỗi, có lỗi xảy ra. Vui lòng thử lại sau."
+                    continue
+                streamed = True
+                yield item
+            if not streamed:
+                yield "Không nhận được phản hồi từ AI. Vui lòng thử lại."
+        finally:
+            # Client may have gone away: stop reading the SDK stream after the current chunk,
+            # and wait for the thread so it never outlives the request
+            cancelled.set()
+            try:
+                await producer
+            except Exception as e:
+                logger.warning(f"⚠️ Gemini stream thread failed: {e}")
+
 # Tạo một instance để các file khác import và sử dụng
 gemini_service = GeminiService()
\ No newline at end of file
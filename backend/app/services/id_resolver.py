@@ -0,0 +1,103 @@
+"""
+Article ID Resolver - single round-trip lookup for mixed `_id` types
+"""
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from bson import ObjectId
+from loguru import logger
+
+from app.core.config import settings
+
+
+# Preference order when several typed candidates match (same as the old int → str → ObjectId chain)
+_KINDS = ("int", "str", "oid")
+
+
+def _convert(external_id: str, kind: str):
+    if kind == "int":
+        return int(external_id)
+    if kind == "oid":
+        return ObjectId(external_id)
+    return external_id
+
+
+def _kind_of(value) -> str:
+    if isinstance(value, ObjectId):
+        return "oid"
+    if isinstance(value, int):
+        return "int"
+    return "str"
+
+
+def candidate_ids(external_id: str) -> List[Any]:
+    """All plausible typed `_id` values for an id taken from a URL"""
+    candidates = []
+    for kind in _KINDS:
+        try:
+            candidates.append(_convert(external_id, kind))
+        except Exception:
+            continue
+    return candidates
+
+
+class IdResolver:
+    """Resolves external (string) ids to typed `_id`s with one `$in` query.
+
+    Seeded and scheduler-generated articles use int / str `_id`s while API-created
+    ones use ObjectId. The resolved type of each external id is remembered in a
+    bounded LRU so repeat lookups go straight to a single equality match.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._kinds: "OrderedDict[str, str]" = OrderedDict()
+
+    def _remember(self, external_id: str, kind: str):
+        self._kinds[external_id] = kind
+        self._kinds.move_to_end(external_id)
+        if len(self._kinds) > self.max_entries:
+            self._kinds.popitem(last=False)
+
+    def typed_id(self, external_id: str):
+        """Typed `_id` for an external id if its type is already known, else None"""
+        kind = self._kinds.get(external_id)
+        if kind is None:
+            return None
+        self._kinds.move_to_end(external_id)
+        return _convert(external_id, kind)
+
+    async def find_one(
+        self,
+        collection,
+        external_id: str,
+        extra_filter: Optional[Dict[str, Any]] = None,
+        projection: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Find a document by external id in (usually) one round-trip"""
+        extra_filter = extra_filter or {}
+
+        typed = self.typed_id(external_id)
+        if typed is not None:
+            doc = await collection.find_one({"_id": typed, **extra_filter}, projection)
+            if doc:
+                return doc
+            # Stale entry (document deleted or re-created with another type)
+            self._kinds.pop(external_id, None)
+
+        candidates = candidate_ids(external_id)
+        docs = await collection.find(
+            {"_id": {"$in": candidates}, **extra_filter}, projection
+        ).to_list(length=len(candidates))
+        if not docs:
+            return None
+
+        docs.sort(key=lambda d: _KINDS.index(_kind_of(d['_id'])))
+        doc = docs[0]
+        self._remember(external_id, _kind_of(doc['_id']))
+        if len(docs) > 1:
+            logger.warning(f"⚠️ Several articles share external id {external_id}; using {_kind_of(doc['_id'])} _id")
+        return doc
+
+
+# Singleton instance
+article_id_resolver = IdResolver(max_entries=settings.ID_RESOLVER_CACHE_SIZE)
@@ -6,6 +6,9 @@ from datetime import datetime
 
 # Thay thế bằng hàm lấy DB của bạn
 from app.core.database import get_database
+from app.services.article_cards import article_card_service
+from app.services.response_cache import response_cache
+from app.services.rabbitmq_service import rabbitmq_service
 def clean_html(raw_html):
     """Xóa các tag HTML cơ bản khỏi nội dung."""
     if not raw_html:
@@ -67,16 +70,27 @@ async def fetch_and_save_articles(feed_url: str):
                     "category": "Tin tức",
                     "tags": [tag.term for tag in entry.tags] if hasattr(entry, 'tags') else [],
                     "status": "published"
-                    # TODO: Cần gọi 1 task khác để tạo 'article_vector'
                 }
 
                 # 5. Lưu vào MongoDB
-                await db.articles.insert_one(article_data)
+                result = await db.articles.insert_one(article_data)
+                await article_card_service.upsert(db, article_data)
                 new_articles_count += 1
 
+                # 6. Tạo 'article_vector' trong worker article_processing (batch embeddings)
+                try:
+                    await rabbitmq_service.publish_article_processing_task(
+                        article_id=str(result.inserted_id),
+                        operations=['embed']
+                    )
+                except Exception as e:
+                    logger.warning(f"⚠️ Failed to queue embedding task: {e}")
+
             except Exception as e:
                 logger.error(f"Failed to process entry {entry.get('link', 'N/A')}: {e}")
                 
+        if new_articles_count:
+            response_cache.clear()
         logger.info(f"✅ Fetch complete. Added {new_articles_count} new articles from {feed_url}")
         return new_articles_count
         
@@ -6,6 +6,7 @@ from typing import List, Dict, Optional
 from loguru import logger
 
 from app.core.config import settings
+from app.services.embedding_cache import embedding_cache
 
 
 class OpenAIService:
@@ -121,17 +122,23 @@ Trả về danh sách, mỗi điểm trên một dòng:"""
                  for line in result.split('\n') if line.strip()]
         return points[:limit]
     
+    async def _embed(self, texts: List[str]) -> List[List[float]]:
+        """Call the embeddings API (one request for all texts)"""
+        response = await self.client.embeddings.create(
+            model=self.embedding_model,
+            input=[text[:8000] for text in texts]  # Limit input size
+        )
+        embeddings = [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+        logger.info(f"✅ Created {len(embeddings)} embeddings: {len(embeddings[0])} dimensions")
+        return embeddings
+
     async def create_embedding(self, text: str) -> List[float]:
-        """Create text embedding for vector search"""
+        """Create text embedding for vector search (cached by model and text hash)"""
         try:
-            response = await self.client.embeddings.create(
-                model=self.embedding_model,
-                input=text[:8000]  # Limit input size
+            embeddings = await embedding_cache.get_or_compute(
+                f"openai:{self.embedding_model}", [text], self._embed
             )
-            
-            embedding = response.data[0].embedding
-            logger.info(f"✅ Created embedding: {len(embedding)} dimensions")
-            return embedding
+            return embeddings[0]
             
         except Exception as e:
             logger.error(f"❌ OpenAI embedding error: {e}")
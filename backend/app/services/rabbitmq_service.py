@@ -2,8 +2,9 @@
 RabbitMQ Message Queue Service
 """
 import aio_pika
+import asyncio
 import json
-from typing import Callable, Dict
+from typing import Any, Callable, Dict, List, Optional
 from loguru import logger
 from datetime import datetime  # <-- HÃY CHẮC CHẮN BẠN ĐÃ IMPORT CÁI NÀY
 
@@ -122,6 +123,95 @@ class RabbitMQService:
             logger.error(f"❌ Queue consumption error: {e}")
             raise
 
+    async def _retry_later(self, queue_name: str, message, error: Exception):
+        """Republish a failed message with its retry count, or dead-letter it after RABBITMQ_MAX_RETRIES"""
+        retries = int((message.headers or {}).get("x-retries", 0)) + 1
+        dead = retries > settings.RABBITMQ_MAX_RETRIES
+        await self.channel.default_exchange.publish(
+            aio_pika.Message(
+                body=message.body,
+                headers={"x-retries": retries, "x-error": str(error)[:500]},
+                delivery_mode=aio_pika.DeliveryMode.PERSISTENT
+            ),
+            routing_key=f"{queue_name}.dead" if dead else queue_name
+        )
+        await message.ack()
+        if dead:
+            logger.error(f"❌ Moved message to {queue_name}.dead after {retries - 1} retries: {error}")
+
+    async def consume_batches(
+        self,
+        queue_type: str,
+        callback: Callable,
+        batch_size: int = 100,
+        max_wait: float = 1.0,
+        parse: Optional[Callable[[Dict], Any]] = None
+    ):
+        """Consume messages in batches with manual acknowledgement.
+
+        Each body is decoded and passed through `parse` (validation) first;
+        messages that fail are rejected individually without requeue. `callback`
+        receives the parsed bodies of up to `batch_size` messages (collected for
+        at most `max_wait` seconds) and the batch is acked once it returns. If it
+        raises, the messages are retried one by one so a single bad message
+        cannot block the queue; those that still fail are republished (retry
+        count in the `x-retries` header) and moved to `<queue>.dead` after
+        `RABBITMQ_MAX_RETRIES`. Callbacks must therefore be idempotent.
+        """
+        queue_name = self.queues[queue_type]
+        await self.channel.set_qos(prefetch_count=batch_size * 2)
+        queue = await self.channel.declare_queue(queue_name, durable=True)
+        await self.channel.declare_queue(f"{queue_name}.dead", durable=True)
+
+        incoming: asyncio.Queue = asyncio.Queue()
+        await queue.consume(incoming.put)
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await incoming.get()]
+            deadline = loop.time() + max_wait
+            while len(batch) < batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(incoming.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            messages, bodies = [], []
+            for message in batch:
+                try:
+                    body = json.loads(message.body.decode())
+                    bodies.append(parse(body) if parse else body)
+                    messages.append(message)
+                except Exception as e:
+                    logger.error(f"❌ Dropping invalid message from {queue_name}: {e}")
+                    await message.reject(requeue=False)
+            if not messages:
+                continue
+
+            try:
+                await callback(bodies)
+            except Exception as e:
+                logger.error(f"❌ Batch of {len(messages)} from {queue_name} failed - retrying one by one: {e}")
+                failed = 0
+                for message, body in zip(messages, bodies):
+                    try:
+                        await callback([body])
+                    except Exception as message_error:
+                        failed += 1
+                        await self._retry_later(queue_name, message, message_error)
+                        continue
+                    await message.ack()
+                if failed:
+                    await asyncio.sleep(max_wait)
+                continue
+
+            # Messages are delivered in order on this channel: one ack covers the batch
+            await messages[-1].ack(multiple=True)
+            logger.info(f"📥 Processed batch of {len(messages)} from {queue_name}")
+
     # ... (Các hàm publish_article_processing_task, publish_email_task giữ nguyên) ...
     async def publish_article_processing_task(self, article_id: str, operations: list):
         """Publish article processing task"""
@@ -159,5 +249,13 @@ class RabbitMQService:
             routing_key="fetch"
         )
 
+    async def publish_analytics_events(self, events: List[Dict]):
+        """Publish a batch of analytics events (JSON-safe dicts)"""
+        await self.publish_message(
+            queue_type="analytics",
+            message={"events": events},
+            routing_key="track"
+        )
+
 # Singleton instance
 rabbitmq_service = RabbitMQService()
\ No newline at end of file
@@ -0,0 +1,94 @@
+"""
+Response Cache - in-process TTL/LRU cache for public article endpoints
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+from loguru import logger
+
+from app.core.config import settings
+
+
+class ResponseCache:
+    """TTL + size bounded cache keyed by route name and query parameters.
+
+    Public article data only changes on writes, so write endpoints (and the
+    scheduler thread) call `clear()`; the TTL bounds staleness of counters.
+    Thread-safe because the scheduler invalidates from its own thread.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(route: str, **params) -> Tuple:
+        """Build a cache key from a route name and its query parameters"""
+        return (route, tuple(sorted(params.items())))
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value or None on miss / expiry"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entries over the size bound"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        """Drop a single entry"""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        """Drop every entry (called after article writes)"""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+        logger.debug("🧹 Response cache cleared")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit / miss statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+
+
+# Singleton instance
+response_cache = ResponseCache(
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES
+)
@@ -0,0 +1,194 @@
+"""
+Trending Service - in-memory time-decayed leaderboard for /public/trending
+"""
+import heapq
+import math
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from loguru import logger
+
+from app.core.config import settings
+from app.core.database import get_database
+from app.core.tasks import PeriodicTask
+
+
+# Engagement weights per event type
+EVENT_WEIGHTS = {
+    "view": 1.0,
+    "click": 0.5,
+    "like": 3.0,
+    "share": 4.0,
+    "comment": 5.0,
+}
+
+# Rescale stored scores before exp() of the landmark offset gets large
+_RESCALE_EXPONENT = 50.0
+# Scores below this (in "now" units) are dropped on rescale / rebuild
+_MIN_SCORE = 1e-3
+
+
+class TrendingService:
+    """Forward-decay leaderboard keyed by the string article `_id`.
+
+    An event at time `t` adds `weight * exp((t - landmark) / tau)`, so existing
+    scores never need to be touched as time passes: ordering by stored score is
+    ordering by exponentially decayed score (half-life `TRENDING_HALF_LIFE_HOURS`).
+
+    Two score sources are kept apart:
+    - `_event_scores`: activity also persisted as documents (analytics events,
+      comments); replaced wholesale by `rebuild`, which recomputes it from MongoDB.
+    - `_view_scores`: public page views, which only exist as counters, so they
+      survive rebuilds and simply decay.
+
+    The top `TRENDING_CAPACITY` ids are re-ranked every `TRENDING_REFRESH_SECONDS`;
+    `top(k)` is then a slice of that list.
+    """
+
+    def __init__(self):
+        self.tau = settings.TRENDING_HALF_LIFE_HOURS * 3600 / math.log(2)
+        self.window = timedelta(hours=settings.TRENDING_HALF_LIFE_HOURS * 7)
+        self.capacity = settings.TRENDING_CAPACITY
+        self._landmark = time.time()
+        self._event_scores: Dict[str, float] = {}
+        self._view_scores: Dict[str, float] = {}
+        self._ranking: List[str] = []
+        self._dirty = False
+        self._refresh_task = PeriodicTask(
+            "trending_refresh", settings.TRENDING_REFRESH_SECONDS, self._refresh
+        )
+        self._rebuild_task = PeriodicTask(
+            "trending_rebuild", settings.TRENDING_REBUILD_SECONDS, self.rebuild
+        )
+
+    def _weight(self, event_type: str, amount: float, timestamp: Optional[float]) -> float:
+        ts = time.time() if timestamp is None else timestamp
+        return EVENT_WEIGHTS.get(event_type, 0.0) * amount * math.exp((ts - self._landmark) / self.tau)
+
+    def record_event(self, article_id, event_type: str, amount: float = 1, timestamp: Optional[float] = None):
+        """Add persisted activity (analytics event, comment)"""
+        key = str(article_id)
+        self._event_scores[key] = self._event_scores.get(key, 0.0) + self._weight(event_type, amount, timestamp)
+        self._dirty = True
+
+    def record_view(self, article_id, amount: float = 1):
+        """Add a public page view (not backed by an analytics document)"""
+        key = str(article_id)
+        self._view_scores[key] = self._view_scores.get(key, 0.0) + self._weight("view", amount, None)
+        self._dirty = True
+
+    def top(self, k: int) -> List[str]:
+        """Ids of the `k` highest-scoring articles, best first"""
+        return self._ranking[:k]
+
+    def _rescale(self):
+        """Move the landmark to now so scores stay in floating-point range"""
+        now = time.time()
+        exponent = (now - self._landmark) / self.tau
+        if exponent < _RESCALE_EXPONENT:
+            return
+        factor = math.exp(-exponent)
+        for scores in (self._event_scores, self._view_scores):
+            for key in list(scores):
+                scores[key] *= factor
+                if scores[key] < _MIN_SCORE:
+                    del scores[key]
+        self._landmark = now
+        self._dirty = True
+
+    def _rank(self):
+        keys = self._event_scores.keys() | self._view_scores.keys()
+        self._ranking = heapq.nlargest(
+            self.capacity, keys,
+            key=lambda k: self._event_scores.get(k, 0.0) + self._view_scores.get(k, 0.0)
+        )
+        self._dirty = False
+
+    async def _refresh(self):
+        self._rescale()
+        if self._dirty:
+            self._rank()
+
+    def _decayed_sum(self, match: dict, weight, time_field: str, landmark: datetime) -> List[dict]:
+        """Aggregation summing `weight * exp((t - landmark) / tau)` per article
+
+        `weight` may be an expression (e.g. event weight times a rollup count).
+        """
+        return [
+            {"$match": match},
+            {"$group": {
+                "_id": "$article_id",
+                "score": {"$sum": {"$multiply": [
+                    weight,
+                    {"$exp": {"$divide": [{"$subtract": [f"${time_field}", landmark]}, self.tau * 1000]}}
+                ]}}
+            }}
+        ]
+
+    async def rebuild(self, db=None) -> int:
+        """Recompute persisted-activity scores from hourly analytics rollups and `comments`"""
+        if db is None:
+            db = get_database()
+        if db is None:
+            return 0
+
+        landmark = self._landmark
+        landmark_dt = datetime.utcfromtimestamp(landmark)
+        since = datetime.utcnow() - self.window
+
+        # Comments are counted from their own collection, not from analytics events
+        event_types = [t for t in EVENT_WEIGHTS if t != "comment"]
+        event_weight = {"$multiply": ["$count", {"$switch": {
+            "branches": [
+                {"case": {"$eq": ["$event_type", t]}, "then": EVENT_WEIGHTS[t]}
+                for t in event_types
+            ],
+            "default": 0
+        }}]}
+        sources = (
+            # Rollups are hourly: events are dated at the start of their hour
+            (db.analytics_rollups, self._decayed_sum(
+                {"hour": {"$gte": since}, "event_type": {"$in": event_types}},
+                event_weight, "hour", landmark_dt
+            )),
+            (db.comments, self._decayed_sum(
+                {"created_at": {"$gte": since}},
+                EVENT_WEIGHTS["comment"], "created_at", landmark_dt
+            )),
+        )
+
+        scores: Dict[str, float] = {}
+        for collection, pipeline in sources:
+            async for row in collection.aggregate(pipeline):
+                if row['_id'] is None:
+                    continue
+                key = str(row['_id'])
+                scores[key] = scores.get(key, 0.0) + row['score']
+
+        # The landmark may have moved while the aggregation was running
+        factor = math.exp((landmark - self._landmark) / self.tau)
+        current = math.exp((time.time() - self._landmark) / self.tau)
+        self._event_scores = {
+            key: score * factor for key, score in scores.items()
+            if score * factor / current >= _MIN_SCORE
+        }
+        self._rank()
+        logger.info(f"✅ Rebuilt trending leaderboard ({len(self._event_scores)} articles)")
+        return len(self._event_scores)
+
+    async def start(self, db=None):
+        """Load scores from MongoDB, then keep the ranking and rebuilds running"""
+        try:
+            await self.rebuild(db)
+        except Exception as e:
+            logger.warning(f"⚠️ Initial trending rebuild failed: {e}")
+        self._refresh_task.start()
+        self._rebuild_task.start()
+
+    async def stop(self):
+        await self._refresh_task.stop()
+        await self._rebuild_task.stop()
+
+
+# Singleton instance
+trending_service = TrendingService()
@@ -0,0 +1,82 @@
+"""
+Unique Reader Service - per-article, per-day HyperLogLog sketches of readers
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from pymongo import UpdateOne
+
+from app.core import hyperloglog
+
+
+# (article_id, "YYYY-MM-DD") -> sparse registers {index: rank}
+SketchUpdates = Dict[Tuple[str, str], Dict[int, int]]
+
+
+def reader_key(event: Dict[str, Any]) -> Optional[str]:
+    """Reader identity of an event: the user id, else a client session id"""
+    if event.get('user_id'):
+        return f"u:{event['user_id']}"
+    session_id = (event.get('metadata') or {}).get('session_id')
+    if session_id:
+        return f"s:{session_id}"
+    return None
+
+
+def sketch_updates(events: List[Dict[str, Any]]) -> SketchUpdates:
+    """Register maxima per (article, day) for the view events of a batch"""
+    updates: SketchUpdates = {}
+    for event in events:
+        if getattr(event['event_type'], 'value', event['event_type']) != 'view':
+            continue
+        reader = reader_key(event)
+        if reader is None:
+            continue
+        key = (event['article_id'], event['timestamp'].strftime("%Y-%m-%d"))
+        hyperloglog.add_all(updates.setdefault(key, {}), [reader])
+    return updates
+
+
+def merge_sketch_updates(target: SketchUpdates, source: SketchUpdates):
+    """Merge pending sketch updates (carried over after a failed flush)"""
+    for key, registers in source.items():
+        hyperloglog.merge(target.setdefault(key, {}), registers)
+
+
+class UniqueReaderService:
+    """Keeps one `reader_sketches` document per article and day.
+
+    `registers.<index>` holds HyperLogLog ranks (sparse, at most 1024 entries),
+    updated with `$max` so concurrent writers and replays merge correctly.
+    Sketches of several days merge by register-wise max, so unique readers over
+    any range cost one indexed read of at most one small document per day.
+    """
+
+    async def apply(self, db, updates: SketchUpdates):
+        """Merge register updates into the stored sketches with one bulk write"""
+        if not updates:
+            return
+        await db.reader_sketches.bulk_write([
+            UpdateOne(
+                {"_id": f"{article_id}:{day}"},
+                {
+                    "$max": {f"registers.{index}": rank for index, rank in registers.items()},
+                    "$setOnInsert": {"article_id": article_id, "day": day}
+                },
+                upsert=True
+            )
+            for (article_id, day), registers in updates.items()
+        ], ordered=False)
+
+    async def unique_readers(self, db, article_id: str, since_day: Optional[str] = None) -> int:
+        """Estimated distinct readers of an article (all time, or from `since_day`)"""
+        query: Dict[str, Any] = {"article_id": article_id}
+        if since_day:
+            query["day"] = {"$gte": since_day}
+
+        merged: Dict[int, int] = {}
+        async for sketch in db.reader_sketches.find(query, {"registers": 1}):
+            hyperloglog.merge(merged, {int(i): r for i, r in (sketch.get('registers') or {}).items()})
+        return hyperloglog.estimate(merged) if merged else 0
+
+
+# Singleton instance
+unique_reader_service = UniqueReaderService()
@@ -0,0 +1,231 @@
+"""
+Vector Search Service - Atlas vector search with an in-process NumPy index fallback
+"""
+import asyncio
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+import numpy as np
+from loguru import logger
+
+from app.core.config import settings
+from app.core.database import get_database
+from app.core.tasks import PeriodicTask
+from app.core.vector_index import VectorIndex
+
+
+PUBLISHED = {"status": "published"}
+
+# Writers in other processes may stamp `vector_updated_at` slightly behind our clock
+_SYNC_OVERLAP = timedelta(minutes=1)
+
+# After Atlas `$search` fails (not Atlas / no index), go straight to the local index for a while
+_ATLAS_RETRY_AFTER = timedelta(minutes=10)
+
+
+def _atlas_pipeline(vector: List[float], path: str, k: int, query_filter: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        {"$search": {"knnBeta": {"vector": vector, "path": path, "k": k}}},
+        {"$match": query_filter},
+        {"$addFields": {"score": {"$meta": "searchScore"}}},
+        {"$limit": k}
+    ]
+
+
+class VectorSearchService:
+    """Nearest-neighbour search over a vector field (`articles.article_vector` by default).
+
+    `VECTOR_SEARCH_BACKEND` selects Atlas `$search` (`atlas`), the local index
+    (`local`) or Atlas with the local index as fallback when it errors or
+    returns nothing (`auto`, e.g. self-hosted MongoDB). The local index loads
+    every stored vector once (or memory-maps `VECTOR_INDEX_PATH`), then picks up
+    vectors whose `vector_updated_at` changed every `VECTOR_INDEX_REFRESH_SECONDS`.
+    From `VECTOR_INDEX_IVF_MIN_SIZE` vectors on, queries probe
+    `VECTOR_INDEX_NPROBE` IVF clusters instead of scanning every row.
+    Hits are re-read from MongoDB with the caller's filter, so deleted or
+    unpublished articles never leak into results.
+    """
+
+    def __init__(
+        self,
+        collection: str = "articles",
+        vector_field: str = "article_vector",
+        index_path: str = settings.VECTOR_INDEX_PATH,
+        default_filter: Optional[Dict[str, Any]] = None
+    ):
+        self.collection = collection
+        self.vector_field = vector_field
+        self.default_filter = PUBLISHED if default_filter is None else default_filter
+        self.backend = settings.VECTOR_SEARCH_BACKEND
+        self.dim = settings.EMBEDDING_DIMENSIONS
+        self.path = index_path
+        self.index = VectorIndex(self.dim)
+        self._synced_at: Optional[datetime] = None
+        self._refresh_lock = asyncio.Lock()
+        self._initial_load: Optional[asyncio.Task] = None
+        self._atlas_retry_at: Optional[datetime] = None
+        # Deletions that arrive while a refresh mutates the index in a thread
+        self._pending_removals: List[Any] = []
+        self._task = PeriodicTask(
+            f"{collection}_vector_index_refresh", settings.VECTOR_INDEX_REFRESH_SECONDS, self.refresh
+        )
+
+    @property
+    def uses_local_index(self) -> bool:
+        return self.backend in ("auto", "local")
+
+    def _maybe_build_ivf(self, index: VectorIndex):
+        """(Re)cluster once the index is large enough, or has grown by a fifth since"""
+        size = len(index)
+        if size >= settings.VECTOR_INDEX_IVF_MIN_SIZE and \
+                (not index.has_ivf or size > index.ivf_size * 1.2):
+            index.build_ivf()
+
+    def _load_persisted(self) -> bool:
+        if not self.path:
+            return False
+        index = VectorIndex.load(self.path, self.dim)
+        if index is None:
+            return False
+        self._maybe_build_ivf(index)
+        self.index = index
+        saved_at = datetime.utcfromtimestamp(os.path.getmtime(os.path.join(self.path, "ids.json")))
+        self._synced_at = saved_at - _SYNC_OVERLAP
+        logger.info(f"✅ Loaded {self.collection} vector index from {self.path} ({len(index)} vectors)")
+        return True
+
+    async def _read_vectors(self, db, since: Optional[datetime]) -> List[tuple]:
+        query: Dict[str, Any] = {self.vector_field: {"$exists": True}}
+        if since is not None:
+            query["vector_updated_at"] = {"$gte": since}
+        cursor = db[self.collection].find(query, {self.vector_field: 1}).batch_size(500)
+        # float32 rows: a quarter of the memory of Python float lists
+        return [
+            (doc['_id'], np.asarray(doc[self.vector_field], dtype=np.float32))
+            async for doc in cursor if doc.get(self.vector_field)
+        ]
+
+    def _build(self, items: List[tuple]) -> VectorIndex:
+        index = VectorIndex(self.dim)
+        index.upsert_many(items)
+        self._maybe_build_ivf(index)
+        return index
+
+    def _update(self, items: List[tuple]) -> VectorIndex:
+        # Searches keep using the current index until the updated copy is swapped in
+        index = self.index.copy()
+        index.upsert_many(items)
+        self._maybe_build_ivf(index)
+        return index
+
+    def _apply_removals(self) -> bool:
+        removals, self._pending_removals = self._pending_removals, []
+        for item_id in removals:
+            self.index.remove(item_id)
+        return bool(removals)
+
+    async def refresh(self, db=None) -> int:
+        """Load all vectors (first run) or those updated since the last sync"""
+        if not self.uses_local_index:
+            return 0
+        if db is None:
+            db = get_database()
+        if db is None:
+            return 0
+
+        async with self._refresh_lock:
+            started = datetime.utcnow()
+            items = await self._read_vectors(db, self._synced_at)
+            if self._synced_at is None:
+                # Full build off the event loop, then swap in the new index
+                self.index = await asyncio.to_thread(self._build, items)
+                logger.info(f"✅ Built {self.collection} vector index ({len(self.index)} vectors)")
+            elif items:
+                # Row appends (vstack) and re-clustering are O(index size): keep them off the loop too
+                self.index = await asyncio.to_thread(self._update, items)
+            removed = self._apply_removals()
+            self._synced_at = started - _SYNC_OVERLAP
+
+            if (items or removed) and self.path:
+                await asyncio.to_thread(self.index.save, self.path)
+            return len(items)
+
+    def remove(self, item_id: Any):
+        """Drop a deleted document from the local index (deferred while a refresh runs)"""
+        if not self.uses_local_index:
+            return
+        if self._refresh_lock.locked():
+            self._pending_removals.append(item_id)
+        else:
+            self.index.remove(item_id)
+
+    def _local_ids(self, vector: List[float], k: int, exclude_id: Any) -> List[tuple]:
+        nprobe = settings.VECTOR_INDEX_NPROBE if self.index.has_ivf else None
+        return self.index.search(vector, k, exclude=exclude_id, nprobe=nprobe)
+
+    async def _local_search(self, db, vector, k, exclude_id, query_filter) -> List[Dict[str, Any]]:
+        # Over-fetch: some hits may be filtered out (unpublished / deleted)
+        hits = self._local_ids(vector, k * 3, exclude_id)
+        if not hits:
+            return []
+        scores = {str(item_id): score for item_id, score in hits}
+        docs = await db[self.collection].find(
+            {**query_filter, "_id": {"$in": [item_id for item_id, _ in hits]}}
+        ).to_list(length=len(hits))
+        for doc in docs:
+            doc['score'] = scores[str(doc['_id'])]
+        docs.sort(key=lambda doc: doc['score'], reverse=True)
+        return docs[:k]
+
+    async def similar(
+        self,
+        db,
+        vector: List[float],
+        k: int,
+        exclude_id: Any = None,
+        query_filter: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Up to `k` documents nearest to `vector`, best first (with a `score`)"""
+        query_filter = dict(self.default_filter if query_filter is None else query_filter)
+        atlas_down = self._atlas_retry_at is not None and datetime.utcnow() < self._atlas_retry_at
+        if self.backend == "atlas" or (self.backend == "auto" and not atlas_down):
+            atlas_filter = dict(query_filter)
+            if exclude_id is not None:
+                atlas_filter["_id"] = {"$ne": exclude_id}
+            try:
+                docs = await db[self.collection].aggregate(
+                    _atlas_pipeline(vector, self.vector_field, k, atlas_filter)
+                ).to_list(length=k)
+                if docs or self.backend == "atlas":
+                    return docs
+            except Exception as e:
+                if self.backend == "atlas":
+                    raise
+                self._atlas_retry_at = datetime.utcnow() + _ATLAS_RETRY_AFTER
+                logger.warning(f"⚠️ Atlas vector search unavailable, using local index: {e}")
+
+        return await self._local_search(db, vector, k, exclude_id, query_filter)
+
+    def start(self, db):
+        """Load the local index in the background and keep it in sync"""
+        if not self.uses_local_index:
+            return
+        if not self._load_persisted():
+            self._initial_load = asyncio.create_task(self.refresh(db))
+        self._task.start()
+
+    async def stop(self):
+        if self._initial_load and not self._initial_load.done():
+            self._initial_load.cancel()
+        await self._task.stop()
+
+
+# Singleton instances
+vector_search_service = VectorSearchService()
+# Passage vectors (`article_chunks.vector`); chunk ids are re-read without a status filter
+chunk_search_service = VectorSearchService(
+    collection="article_chunks",
+    vector_field="vector",
+    index_path=os.path.join(settings.VECTOR_INDEX_PATH, "chunks") if settings.VECTOR_INDEX_PATH else "",
+    default_filter={}
+)
@@ -0,0 +1,115 @@
+"""
+View Counter Service - write-behind buffer for article view counts
+"""
+import asyncio
+from typing import Any, Dict, Optional
+from loguru import logger
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.core.config import settings
+from app.core.database import get_database
+from app.core.tasks import PeriodicTask
+from app.services.response_cache import response_cache
+
+
+class ViewCounterService:
+    """Accumulates view increments in memory and flushes them with one bulk write.
+
+    Keys are the typed article `_id` (int / str / ObjectId). At most
+    `flush_interval` seconds or `max_pending` views are lost if the process
+    crashes. `pending()` lets responses add unflushed views to stored counts.
+    """
+
+    def __init__(self):
+        self.flush_interval = settings.VIEW_COUNTER_FLUSH_SECONDS
+        self.max_pending = settings.VIEW_COUNTER_MAX_PENDING
+        self._pending: Dict[Any, int] = {}
+        self._inflight: Dict[Any, int] = {}
+        self._total_pending = 0
+        self._flush_lock = asyncio.Lock()
+        self._threshold_flush: Optional[asyncio.Task] = None
+        self._task = PeriodicTask("view_counter_flush", self.flush_interval, self.flush)
+
+    def record(self, article_id, amount: int = 1):
+        """Buffer a view; triggers an early flush once `max_pending` is reached"""
+        self._pending[article_id] = self._pending.get(article_id, 0) + amount
+        self._total_pending += amount
+
+        if self._total_pending >= self.max_pending and \
+                (self._threshold_flush is None or self._threshold_flush.done()):
+            self._threshold_flush = asyncio.create_task(self.flush())
+
+    def pending(self, article_id) -> int:
+        """Views recorded for an article but not yet persisted"""
+        return self._pending.get(article_id, 0) + self._inflight.get(article_id, 0)
+
+    async def flush(self, db=None) -> int:
+        """Persist buffered views to `articles` and `article_cards` with bulk writes"""
+        if db is None:
+            db = get_database()
+        if db is None or not self._pending:
+            return 0
+
+        async with self._flush_lock:
+            # A concurrent flush may have emptied the buffer while we waited
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            self._total_pending = 0
+            self._inflight = batch
+
+            items = list(batch.items())
+            try:
+                await db.articles.bulk_write([
+                    UpdateOne({"_id": article_id}, {"$inc": {"view_count": count}})
+                    for article_id, count in items
+                ], ordered=False)
+                failed = []
+            except BulkWriteError as e:
+                # ordered=False: only the listed updates were not applied
+                failed = [items[err['index']] for err in e.details.get('writeErrors', [])]
+                logger.error(f"❌ View counter flush failed for {len(failed)} articles: {e}")
+            except Exception as e:
+                failed = items
+                logger.error(f"❌ View counter flush failed: {e}")
+
+            # Put the failed views back so the next flush retries them
+            for article_id, count in failed:
+                self._pending[article_id] = self._pending.get(article_id, 0) + count
+                self._total_pending += count
+                del batch[article_id]
+            if not batch:
+                self._inflight = {}
+                return 0
+
+            try:
+                await db.article_cards.bulk_write([
+                    UpdateOne({"_id": str(article_id)}, {"$inc": {"view_count": count}})
+                    for article_id, count in batch.items()
+                ], ordered=False)
+            except Exception as e:
+                logger.warning(f"⚠️ View counter card update failed (rebuild cards to repair): {e}")
+            finally:
+                self._inflight = {}
+
+            # Cached public articles were stored without buffered views
+            for article_id in batch:
+                response_cache.invalidate(response_cache.make_key("public_article", article_id=str(article_id)))
+
+            flushed = sum(batch.values())
+            logger.info(f"✅ Flushed {flushed} views for {len(batch)} articles")
+            return flushed
+
+    def start(self):
+        """Start the periodic flush loop"""
+        self._task.start()
+
+    async def stop(self):
+        """Stop the flush loop and persist whatever is still buffered"""
+        await self._task.stop()
+        await self.flush()
+
+
+# Singleton instance
+view_counter = ViewCounterService()
@@ -1,10 +1,14 @@
 import asyncio
+import sys
 from loguru import logger
 
 # Import các service của bạn
 from app.services.rabbitmq_service import rabbitmq_service
 from app.services.news_fetcher import fetch_and_save_articles
-from app.core.database import connect_to_mongo, close_mongo_connection
+from app.services.analytics_ingest import write_events, events_from_message
+from app.services.article_embeddings import article_embedding_service
+from app.core.database import connect_to_mongo, close_mongo_connection, get_database
+from app.core.config import settings
 
 async def on_news_task_received(message: dict):
     """
@@ -22,11 +26,75 @@ async def on_news_task_received(message: dict):
         logger.error(f"Error processing task for {feed_url}: {e}")
         # (Không cần nack/ack vì `message.process()` đã xử lý)
 
-async def main():
+async def on_analytics_batch_received(messages: list):
+    """
+    Callback for a batch from 'analytics' (already validated by `events_from_message`):
+    one bulk write for all events. Raising makes `consume_batches` retry the
+    messages one by one; redelivered events are not counted twice.
+    """
+    events = [event for message_events in messages for event in message_events]
+    if not events:
+        return
+
+    db = get_database()
+    if db is None:
+        raise RuntimeError("MongoDB is not connected")
+    await write_events(db, events)
+    logger.info(f"Worker stored {len(events)} analytics events")
+
+async def on_article_processing_batch_received(messages: list):
+    """
+    Callback for a batch from 'article_processing': the articles of all `embed`
+    tasks are embedded together, in micro-batches of EMBEDDING_BATCH_SIZE.
+    Raising (e.g. embedding quota) makes `consume_batches` retry the messages;
+    re-embedding is idempotent (unchanged articles are skipped).
+    """
+    article_ids = [
+        str(message["article_id"])
+        for message in messages
+        if message.get("article_id") and "embed" in message.get("operations", ["embed"])
+    ]
+    if not article_ids:
+        return
+
+    db = get_database()
+    if db is None:
+        raise RuntimeError("MongoDB is not connected")
+    embedded = await article_embedding_service.embed_articles(db, article_ids)
+    logger.info(f"Worker embedded {embedded} of {len(set(article_ids))} articles")
+
+async def consume(mode: str):
+    """Listen on the queue for the selected worker mode"""
+    if mode == "article_processing":
+        logger.info("Waiting for 'article_processing' tasks...")
+        await rabbitmq_service.consume_batches(
+            queue_type="article_processing",
+            callback=on_article_processing_batch_received,
+            batch_size=settings.EMBEDDING_BATCH_SIZE,
+            max_wait=settings.EMBEDDING_WORKER_MAX_WAIT_SECONDS
+        )
+    elif mode == "analytics":
+        logger.info("Waiting for 'analytics' events...")
+        await rabbitmq_service.consume_batches(
+            queue_type="analytics",
+            callback=on_analytics_batch_received,
+            batch_size=settings.ANALYTICS_WORKER_BATCH_SIZE,
+            max_wait=settings.ANALYTICS_WORKER_MAX_WAIT_SECONDS,
+            parse=events_from_message
+        )
+    else:
+        logger.info("Waiting for 'news_fetching' tasks...")
+        await rabbitmq_service.consume_queue(
+            queue_type="news_fetching",
+            callback=on_news_task_received
+        )
+
+async def main(mode: str = "news_fetching"):
     """
     Hàm main của Worker: Kết nối CSDL, RabbitMQ và bắt đầu lắng nghe.
+    Run: python -m app.worker [news_fetching|analytics|article_processing]
     """
-    logger.info("🚀 Starting AI News Worker...")
+    logger.info(f"🚀 Starting AI News Worker ({mode})...")
     
     try:
         # 1. Kết nối CSDL
@@ -42,11 +110,7 @@ async def main():
         logger.info("✅ Worker connected to RabbitMQ.")
         
         # 3. Bắt đầu lắng nghe
-        logger.info("Waiting for 'news_fetching' tasks...")
-        await rabbitmq_service.consume_queue(
-            queue_type="news_fetching",
-            callback=on_news_task_received
-        )
+        await consume(mode)
         
     except Exception as e:
         logger.error(f"❌ Worker main loop failed: {e}")
@@ -59,6 +123,6 @@ async def main():
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        asyncio.run(main(sys.argv[1] if len(sys.argv) > 1 else "news_fetching"))
     except KeyboardInterrupt:
         logger.info("Worker process terminated by user.")
\ No newline at end of file
@@ -0,0 +1,50 @@
+"""
+Script to move analytics events older than the retention horizon to Parquet cold storage
+Run: python archive_analytics.py [--retention-days 90]
+
+Requires pyarrow and ANALYTICS_ARCHIVE_ENABLED=true (see app/services/analytics_archive.py).
+"""
+import argparse
+import os
+from pymongo import MongoClient
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+from app.services.analytics_archive import analytics_archive_service
+
+# MongoDB connection
+MONGODB_URI = os.getenv("MONGODB_URI")
+MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "ai_news_db")
+
+
+def archive_events():
+    """Archive every complete day past the retention horizon"""
+    parser = argparse.ArgumentParser(description="Archive old analytics events to Parquet")
+    parser.add_argument("--retention-days", type=int, default=None,
+                        help="override ANALYTICS_RETENTION_DAYS")
+    args = parser.parse_args()
+
+    if not analytics_archive_service.enabled:
+        print("❌ Analytics archive is disabled (set ANALYTICS_ARCHIVE_ENABLED=true and install pyarrow)")
+        return
+    if args.retention_days is not None:
+        analytics_archive_service.retention_days = args.retention_days
+
+    print(f"🔌 Connecting to MongoDB: {MONGODB_DB_NAME}...")
+    client = MongoClient(MONGODB_URI)
+    db = client[MONGODB_DB_NAME]
+
+    print(f"📊 Hot analytics collection: {db.analytics.estimated_document_count()} events")
+    print(f"🧊 Archiving events older than {analytics_archive_service.retention_days} days "
+          f"to {analytics_archive_service.root}...")
+    total = analytics_archive_service.archive(db)
+
+    print(f"✅ Archived {total} events")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    archive_events()
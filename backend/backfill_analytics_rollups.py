@@ -0,0 +1,39 @@
+"""
+Script to (re)build the hourly `analytics_rollups` collection from raw analytics events
+Run: python backfill_analytics_rollups.py
+
+Run it once after deploying rollups; it is also safe to re-run to repair drift
+(existing rollup documents are replaced by the recomputed ones).
+"""
+import os
+from pymongo import MongoClient
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+from app.services.analytics_rollups import analytics_rollup_service
+
+# MongoDB connection
+MONGODB_URI = os.getenv("MONGODB_URI")
+MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "ai_news_db")
+
+
+def backfill_rollups():
+    """Recompute hourly rollups from the analytics collection"""
+    print(f"🔌 Connecting to MongoDB: {MONGODB_DB_NAME}...")
+
+    client = MongoClient(MONGODB_URI)
+    db = client[MONGODB_DB_NAME]
+
+    print(f"📊 Found {db.analytics.estimated_document_count()} analytics events")
+    print("🧮 Building hourly rollups...")
+    total = analytics_rollup_service.backfill_sync(db)
+
+    print(f"✅ analytics_rollups now holds {total} documents")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    backfill_rollups()
@@ -0,0 +1,41 @@
+"""
+Script to (re)build the `article_stats` collection (event counts, read-time statistics)
+Run: python backfill_article_stats.py
+
+Run it once after deploying article stats; it is also safe to re-run to repair
+drift (each article's stats document is replaced by the recomputed one). Only
+events still in the `analytics` collection are counted, so run it before
+enabling the analytics archive.
+"""
+import os
+from pymongo import MongoClient
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+from app.services.article_stats import article_stats_service
+
+# MongoDB connection
+MONGODB_URI = os.getenv("MONGODB_URI")
+MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "ai_news_db")
+
+
+def backfill_article_stats():
+    """Recompute per-article stats from the analytics collection"""
+    print(f"🔌 Connecting to MongoDB: {MONGODB_DB_NAME}...")
+
+    client = MongoClient(MONGODB_URI)
+    db = client[MONGODB_DB_NAME]
+
+    print(f"📊 Found {db.analytics.estimated_document_count()} analytics events")
+    print("🧮 Building article stats...")
+    total = article_stats_service.backfill_sync(db)
+
+    print(f"✅ Built stats for {total} articles")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    backfill_article_stats()
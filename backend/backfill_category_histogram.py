@@ -0,0 +1,41 @@
+"""
+Script to (re)build the `category_hour_histogram` collection from raw view events
+Run: python backfill_category_histogram.py
+
+Safe to re-run: every category histogram is replaced by the recomputed one.
+Run rebuild_article_cards.py first if the card read model is not populated.
+"""
+import os
+from pymongo import MongoClient
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+from app.services.category_histogram import category_histogram_service, peak_hours
+
+# MongoDB connection
+MONGODB_URI = os.getenv("MONGODB_URI")
+MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "ai_news_db")
+
+
+def backfill_histogram():
+    """Recompute per-category hour histograms from the analytics collection"""
+    print(f"🔌 Connecting to MongoDB: {MONGODB_DB_NAME}...")
+
+    client = MongoClient(MONGODB_URI)
+    db = client[MONGODB_DB_NAME]
+
+    print("🧮 Building category hour histograms...")
+    total = category_histogram_service.backfill_sync(db)
+
+    for doc in db.category_hour_histogram.find():
+        top = ", ".join(f"{h['hour']}:00 ({h['views']})" for h in peak_hours(doc, limit=3))
+        print(f"   {doc['_id']}: {top or 'no views'}")
+    print(f"✅ Built histograms for {total} categories")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    backfill_histogram()
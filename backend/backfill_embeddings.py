@@ -0,0 +1,50 @@
+"""
+Script to embed existing articles (`article_vector`) and their retrieval
+passages (`article_chunks`) in batches
+Run: python backfill_embeddings.py [--restart]
+
+Progress is checkpointed in `maintenance_checkpoints` after every batch: an
+interrupted run resumes after the last processed article. Articles whose vector
+and passages match their current title and content are skipped. Use --restart to rescan
+from the first article (e.g. after bulk edits).
+"""
+import argparse
+import os
+from pymongo import MongoClient
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+from app.services.article_embeddings import article_embedding_service
+
+# MongoDB connection
+MONGODB_URI = os.getenv("MONGODB_URI")
+MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "ai_news_db")
+
+
+def backfill_embeddings(restart: bool):
+    """Embed every article that has no up-to-date vector"""
+    print(f"🔌 Connecting to MongoDB: {MONGODB_DB_NAME}...")
+
+    client = MongoClient(MONGODB_URI)
+    db = client[MONGODB_DB_NAME]
+
+    print(f"📊 Found {db.articles.estimated_document_count()} articles")
+    print("🧠 Embedding articles...")
+    total = article_embedding_service.backfill_sync(
+        db,
+        restart=restart,
+        progress=lambda scanned, embedded: print(f"   scanned {scanned}, embedded {embedded}")
+    )
+
+    print(f"✅ Done - {total} articles embedded in this backfill")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Embed existing articles (article_vector)")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and rescan all articles")
+    args = parser.parse_args()
+    backfill_embeddings(args.restart)
@@ -0,0 +1,192 @@
+"""
+Script to audit MongoDB query plans for the query shapes issued by the API
+Run: python index_audit.py [--ensure-indexes] [--max-ratio 10]
+
+Runs explain("executionStats") for every shape below and reports collection
+scans, in-memory (blocking) sorts and high examined/returned ratios.
+Exits with status 1 when a shape fails, so it can gate a deploy.
+"""
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+from pymongo import MongoClient
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+from app.core.database import COLLECTION_INDEXES
+from app.core.pagination import keyset_filter
+
+# MongoDB connection
+MONGODB_URI = os.getenv("MONGODB_URI")
+MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "ai_news_db")
+
+# Sort keys used by the endpoints (articles.py / comments.py)
+ARTICLES_SORT = [("created_at", -1), ("_id", -1)]
+PUBLIC_ARTICLES_SORT = [("article_id", -1)]
+COMMENTS_SORT = [("created_at", -1), ("_id", -1)]
+
+
+def _samples(db):
+    """Representative filter values taken from the data itself"""
+    article = db.articles.find_one({"status": "published"}) or db.articles.find_one() or {}
+    card = db.article_cards.find_one({"status": "published"}) or {}
+    return {
+        "article": article,
+        "article_id": str(article.get("_id", "")),
+        "category": article.get("category", "Technology"),
+        "card_id": card.get("_id", ""),
+        "source_category": card.get("source_category", "Technology"),
+        "since": datetime.utcnow() - timedelta(days=7),
+    }
+
+
+def query_shapes(s):
+    """(name, collection, command) for every query shape the endpoints issue"""
+    article = s["article"]
+    return [
+        # Admin article listing (GET /articles)
+        ("articles: list", "articles", {"find": "articles", "filter": {}, "sort": dict(ARTICLES_SORT), "limit": 20}),
+        ("articles: list by status", "articles", {
+            "find": "articles", "filter": {"status": "published"}, "sort": dict(ARTICLES_SORT), "limit": 20}),
+        ("articles: list by status+category", "articles", {
+            "find": "articles", "filter": {"status": "published", "category": s["category"]},
+            "sort": dict(ARTICLES_SORT), "limit": 20}),
+        ("articles: list by category", "articles", {
+            "find": "articles", "filter": {"category": s["category"]}, "sort": dict(ARTICLES_SORT), "limit": 20}),
+        ("articles: list (cursor page)", "articles", {
+            "find": "articles",
+            "filter": {"$and": [{"status": "published"}, keyset_filter(ARTICLES_SORT, {
+                "created_at": article.get("created_at"), "_id": article.get("_id")})]},
+            "sort": dict(ARTICLES_SORT), "limit": 20}),
+        # Similar-articles fallback and recommendation fallback
+        ("articles: similar by category", "articles", {
+            "find": "articles",
+            "filter": {"category": s["category"], "_id": {"$ne": article.get("_id")}, "status": "published"},
+            "limit": 5}),
+        ("articles: popular published", "articles", {
+            "find": "articles", "filter": {"status": "published"}, "sort": {"view_count": -1}, "limit": 10}),
+        ("articles: count by status", "articles", {"count": "articles", "query": {"status": "published"}}),
+        # Public read model (GET /public/articles, /public/trending, /public/articles/{id})
+        ("cards: public list", "article_cards", {
+            "find": "article_cards", "filter": {"status": "published"},
+            "sort": dict(PUBLIC_ARTICLES_SORT), "limit": 20}),
+        ("cards: public list by category", "article_cards", {
+            "find": "article_cards", "filter": {"status": "published", "source_category": s["source_category"]},
+            "sort": dict(PUBLIC_ARTICLES_SORT), "limit": 20}),
+        ("cards: all-time popular", "article_cards", {
+            "find": "article_cards", "filter": {"status": "published"},
+            "sort": {"view_count": -1, "like_count": -1}, "limit": 5}),
+        ("cards: by id", "article_cards", {"find": "article_cards", "filter": {"_id": s["card_id"]}, "limit": 1}),
+        # Comments (GET /comments, /comments/article/{id})
+        ("comments: list", "comments", {
+            "find": "comments", "filter": {}, "sort": dict(COMMENTS_SORT), "limit": 50}),
+        ("comments: by article", "comments", {
+            "find": "comments", "filter": {"article_id": s["article_id"]}, "sort": dict(COMMENTS_SORT), "limit": 50}),
+        # Per-article stats (GET /analytics/article/{id}): counters document and unique-reader sketches
+        ("article stats: by id", "article_stats", {
+            "find": "article_stats", "filter": {"_id": s["article_id"]}, "limit": 1}),
+        ("reader sketches: by article", "reader_sketches", {
+            "find": "reader_sketches", "filter": {"article_id": s["article_id"]},
+            "projection": {"registers": 1}}),
+        # Analytics rollups (GET /analytics/trending, trending rebuild)
+        ("rollups: recent engagement", "analytics_rollups", {
+            "aggregate": "analytics_rollups", "cursor": {}, "pipeline": [
+                {"$match": {"hour": {"$gte": s["since"]},
+                            "event_type": {"$in": ["view", "like", "share", "comment"]}}},
+                {"$group": {"_id": "$article_id", "n": {"$sum": "$count"}}}]}),
+        ("comments: recent", "comments", {
+            "aggregate": "comments", "cursor": {}, "pipeline": [
+                {"$match": {"created_at": {"$gte": s["since"]}}},
+                {"$group": {"_id": "$article_id", "n": {"$sum": 1}}}]}),
+    ]
+
+
+def _walk(node, stages, stats):
+    """Collect plan stage names and executionStats blocks from any explain layout"""
+    if isinstance(node, dict):
+        if "stage" in node:
+            stages.append(node["stage"])
+        if "executionStats" in node and isinstance(node["executionStats"], dict):
+            stats.append(node["executionStats"])
+        for key, value in node.items():
+            if key == "rejectedPlans":
+                continue
+            _walk(value, stages, stats)
+    elif isinstance(node, list):
+        for value in node:
+            _walk(value, stages, stats)
+
+
+def audit_shape(db, command, max_ratio):
+    """Explain one command and return (summary, problems)"""
+    explain = db.command("explain", command, verbosity="executionStats")
+    stages, stats = [], []
+    _walk(explain, stages, stats)
+
+    docs = sum(st.get("totalDocsExamined", 0) for st in stats)
+    keys = sum(st.get("totalKeysExamined", 0) for st in stats)
+    returned = max((st.get("nReturned", 0) for st in stats), default=0)
+    examined = max(docs, keys)
+
+    problems = []
+    if "COLLSCAN" in stages:
+        problems.append("COLLSCAN")
+    if "SORT" in stages:
+        problems.append("in-memory SORT")
+    # Counts and groups return few documents by design; judge them on scans only
+    if "find" in command and examined > max_ratio * max(returned, 1):
+        problems.append(f"examined/returned {examined}/{returned}")
+
+    summary = f"keys={keys} docs={docs} returned={returned} stages={'>'.join(dict.fromkeys(stages))}"
+    return summary, problems
+
+
+def ensure_indexes(db):
+    """Create the application indexes (same definitions as on startup)"""
+    for collection, indexes in COLLECTION_INDEXES.items():
+        db[collection].create_indexes(indexes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit query plans of API query shapes")
+    parser.add_argument("--ensure-indexes", action="store_true", help="create application indexes first")
+    parser.add_argument("--max-ratio", type=float, default=10.0,
+                        help="max examined/returned ratio for find queries")
+    args = parser.parse_args()
+
+    print(f"🔌 Connecting to MongoDB: {MONGODB_DB_NAME}...")
+    client = MongoClient(MONGODB_URI)
+    db = client[MONGODB_DB_NAME]
+
+    if args.ensure_indexes:
+        print("🗂️ Creating indexes...")
+        ensure_indexes(db)
+
+    failures = 0
+    for name, collection, command in query_shapes(_samples(db)):
+        try:
+            summary, problems = audit_shape(db, command, args.max_ratio)
+        except Exception as e:
+            print(f"❌ {name} [{collection}]: explain failed: {e}")
+            failures += 1
+            continue
+
+        if problems:
+            failures += 1
+            print(f"❌ {name} [{collection}]: {', '.join(problems)} ({summary})")
+        else:
+            print(f"✅ {name} [{collection}]: {summary}")
+
+    client.close()
+
+    if failures:
+        print(f"\n⚠️ {failures} query shape(s) need attention")
+        sys.exit(1)
+    print("\n✅ All query shapes use indexes")
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,17 @@ from app.api.v1 import api_router
 from apscheduler.schedulers.background import BackgroundScheduler  # Thay đổi: Dùng BackgroundScheduler
 from app.services.rabbitmq_service import rabbitmq_service
 from app.services.generative_newspaper import generative_newspaper
+from app.services.article_cards import article_card_service
+from app.services.view_counter import view_counter
+from app.services.response_cache import response_cache
+from app.services.category_counts import category_count_service
+from app.services.trending import trending_service
+from app.services.analytics_ingest import analytics_ingest
+from app.services.dashboard_stats import dashboard_stats_service
+from app.services.dashboard_live import dashboard_live
+from app.services.vector_search import vector_search_service, chunk_search_service
+from app.services.analytics_archive import analytics_archive_service
+from app.core.tasks import PeriodicTask
 from datetime import datetime, timezone
 
 # Khởi tạo scheduler - CHẠY TRONG THREAD RIÊNG
@@ -35,6 +46,16 @@ pending_keywords = []
 # Khởi tạo generative newspaper
 gen_news = None
 
+# FastAPI event loop: scheduler threads hand async work (RabbitMQ publishes) to it
+main_loop = None
+
+# Periodic repair of incrementally maintained category counters
+category_reconcile_task = PeriodicTask(
+    "category_counts_reconcile",
+    settings.CATEGORY_COUNTS_RECONCILE_SECONDS,
+    lambda: category_count_service.reconcile(get_database())
+)
+
 def fetch_keywords_job():
     """Lịch 1: Mỗi 10 phút lấy keywords mới - CHẠY TRONG THREAD RIÊNG"""
     global existing_keywords, pending_keywords, gen_news
@@ -101,9 +122,9 @@ def generate_article_job():
             "authorAvatar": "https://lh3.googleusercontent.com/a/ACg8ocKW3VsSBWwRkgu3VU4vz0AHItfbhGKlYbgqLXJAihtr-QYgMO1A3g9_eyrAbqOxANa7qc=w240-h480-rw",
             "status": "published",
             "featured": True,
-            "views": 100,
-            "likes": 100,
-            "commentsCount": 100,
+            "view_count": 100,
+            "like_count": 100,
+            "comment_count": 100,
             "readTime": "1 min",
             "tags": article_data.get("tags", [keyword]),
             "thumbnail": article_data.get("thumbnail", ""),
@@ -115,6 +136,26 @@ def generate_article_job():
         # Insert vào MongoDB
         result = db.articles.insert_one(article)
 
+        # Keep the public card read model in sync
+        try:
+            article_card_service.upsert_sync(db, article)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to write article card: {e}")
+        response_cache.clear()
+
+        # Tạo 'article_vector' + passages trong worker article_processing (RabbitMQ chạy trên main loop)
+        if main_loop is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(
+                    rabbitmq_service.publish_article_processing_task(
+                        article_id=str(result.inserted_id),
+                        operations=['embed']
+                    ),
+                    main_loop
+                ).result(timeout=10)
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to queue embedding task: {e}")
+
         # === Auto-translate: try to produce an English version and save under translations.en ===
         try:
             from app.services.google_service import google_service, gemini_service
@@ -201,6 +242,22 @@ def generate_article_job():
         import traceback
         traceback.print_exc()
 
+def archive_analytics_job():
+    """Move analytics events past the retention horizon to Parquet - CHẠY TRONG THREAD RIÊNG"""
+    try:
+        from pymongo import MongoClient
+        import os
+        client = MongoClient(os.getenv("MONGODB_URI"))
+        db = client[os.getenv("MONGODB_DB_NAME")]
+        try:
+            archived = analytics_archive_service.archive(db)
+            if archived:
+                logger.info(f"🧊 Archived {archived} analytics events to cold storage")
+        finally:
+            client.close()
+    except Exception as e:
+        logger.error(f"❌ Archive analytics error: {e}")
+
 async def scheduled_fetch_job():
     """Hàm async riêng để APScheduler gọi"""
     try:
@@ -225,6 +282,28 @@ async def lifespan(app: FastAPI):
     await connect_to_mongo()
     logger.info("✅ Connected to MongoDB Atlas")
 
+    # Build the public article card read model if it has never been populated
+    await article_card_service.ensure_populated(get_database())
+
+    # Build category counters if missing, then reconcile them periodically
+    await category_count_service.ensure_populated(get_database())
+    category_reconcile_task.start()
+
+    # Start the write-behind view counter and analytics flush loops
+    view_counter.start()
+    analytics_ingest.start()
+
+    # Load the trending leaderboard from recent analytics and keep it ranked
+    await trending_service.start(get_database())
+
+    # Keep the admin dashboard snapshot fresh in the background and push live deltas
+    dashboard_stats_service.start()
+    dashboard_live.start()
+
+    # Local vector indexes of articles and chatbot passages (fallback for Atlas vector search)
+    vector_search_service.start(get_database())
+    chunk_search_service.start(get_database())
+
     # 2. Khởi tạo generative newspaper
     global gen_news
     gen_news = generative_newspaper(
@@ -235,6 +314,8 @@ async def lifespan(app: FastAPI):
 
     # 3. Kết nối RabbitMQ
     await rabbitmq_service.connect()
+    global main_loop
+    main_loop = asyncio.get_running_loop()
 
     # 4. Khởi động Schedulers trong THREAD RIÊNG (hoàn toàn tách biệt với FastAPI main thread)
     logger.info("Starting task schedulers in SEPARATE THREAD...")
@@ -257,6 +338,16 @@ async def lifespan(app: FastAPI):
         id='generate_article'
     )
     logger.info("✅ Scheduler 2: Generate article every 30 secs")
+
+    # Scheduler 3: Move old analytics events to Parquet cold storage
+    if analytics_archive_service.enabled:
+        scheduler.add_job(
+            archive_analytics_job,
+            'interval',
+            hours=settings.ANALYTICS_ARCHIVE_INTERVAL_HOURS,
+            id='archive_analytics'
+        )
+        logger.info(f"✅ Scheduler 3: Archive analytics every {settings.ANALYTICS_ARCHIVE_INTERVAL_HOURS} hours")
     
     # Start scheduler - Chạy trong background thread riêng
     scheduler.start()
@@ -278,10 +369,20 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"❌ Error shutting down scheduler: {e}")
         
-        # 2. Ngắt kết nối RabbitMQ
+        # 2. Flush buffered view counts and analytics events before the DB connection goes away
+        await view_counter.stop()
+        await analytics_ingest.stop()
+        await category_reconcile_task.stop()
+        await trending_service.stop()
+        await dashboard_stats_service.stop()
+        await dashboard_live.stop()
+        await vector_search_service.stop()
+        await chunk_search_service.stop()
+
+        # 3. Ngắt kết nối RabbitMQ
         await rabbitmq_service.close() # <-- DÒNG MỚI QUAN TRỌNG
 
-        # 3. Ngắt kết nối MongoDB
+        # 4. Ngắt kết nối MongoDB
         await close_mongo_connection()
         logger.info("✅ Disconnected from MongoDB")
 
@@ -302,6 +403,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 
@@ -0,0 +1,39 @@
+"""
+One-off migration folding legacy article counters into the snake_case fields
+Run: python migrate_legacy_counters.py
+
+Seeded / generated articles stored `views`, `likes` and `commentsCount`. They are
+added to `view_count`, `like_count` and `comment_count` and then removed. Until
+this has run, cards and API responses add the legacy values at read time.
+"""
+import os
+from pymongo import MongoClient
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+from app.services.article_cards import LEGACY_COUNTERS_FILTER, FOLD_LEGACY_COUNTERS
+
+# MongoDB connection
+MONGODB_URI = os.getenv("MONGODB_URI")
+MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "ai_news_db")
+
+
+def migrate_counters():
+    """Fold legacy counters of every article that still has them"""
+    print(f"🔌 Connecting to MongoDB: {MONGODB_DB_NAME}...")
+
+    client = MongoClient(MONGODB_URI)
+    db = client[MONGODB_DB_NAME]
+
+    print(f"📊 Found {db.articles.count_documents(LEGACY_COUNTERS_FILTER)} articles with legacy counters")
+    result = db.articles.update_many(LEGACY_COUNTERS_FILTER, FOLD_LEGACY_COUNTERS)
+
+    print(f"✅ Migrated {result.modified_count} articles")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    migrate_counters()
@@ -0,0 +1,40 @@
+"""
+Script to rebuild the `article_cards` read model from the articles collection
+Run: python rebuild_article_cards.py
+
+Only `article_cards` is written; legacy counters (`views`, `likes`,
+`commentsCount`) on the articles are added at read time until
+`migrate_legacy_counters.py` has folded them.
+"""
+import os
+from pymongo import MongoClient
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+from app.services.article_cards import article_card_service
+
+# MongoDB connection
+MONGODB_URI = os.getenv("MONGODB_URI")
+MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "ai_news_db")
+
+
+def rebuild_cards():
+    """Recompute every article card"""
+    print(f"🔌 Connecting to MongoDB: {MONGODB_DB_NAME}...")
+
+    client = MongoClient(MONGODB_URI)
+    db = client[MONGODB_DB_NAME]
+
+    print(f"📊 Found {db.articles.count_documents({})} articles")
+    print("📇 Rebuilding article cards...")
+    total = article_card_service.rebuild_sync(db)
+
+    print(f"✅ Rebuilt {total} article cards")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    rebuild_cards()
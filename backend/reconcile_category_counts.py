@@ -0,0 +1,37 @@
+"""
+Script to recompute the `category_counts` counters from the articles collection
+Run: python reconcile_category_counts.py
+"""
+import os
+from pymongo import MongoClient
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+from app.services.category_counts import category_count_service
+
+# MongoDB connection
+MONGODB_URI = os.getenv("MONGODB_URI")
+MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "ai_news_db")
+
+
+def reconcile_counts():
+    """Rebuild per-category counters from scratch"""
+    print(f"🔌 Connecting to MongoDB: {MONGODB_DB_NAME}...")
+
+    client = MongoClient(MONGODB_URI)
+    db = client[MONGODB_DB_NAME]
+
+    print("🧮 Recomputing category counts...")
+    categories = category_count_service.reconcile_sync(db)
+
+    for doc in db.category_counts.find().sort("total", -1):
+        print(f"   {doc['_id']}: {doc['total']} ({doc.get('statuses', {})})")
+    print(f"✅ Reconciled {categories} categories")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    reconcile_counts()
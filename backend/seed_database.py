@@ -12,6 +12,8 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+from app.services.article_cards import normalize_counters
+
 # MongoDB connection
 MONGODB_URI = os.getenv("MONGODB_URI")
 MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "ai_news_db")
@@ -548,7 +550,7 @@ def seed_database():
         
         # 4. Insert Articles
         print("\n📝 Đang insert Articles...")
-        result = db.articles.insert_many(articles_data)
+        result = db.articles.insert_many([normalize_counters(article) for article in articles_data])
         print(f"✅ Đã insert {len(result.inserted_ids)} articles")
         
         # 5. Insert Comments
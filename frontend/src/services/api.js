@@ -74,6 +74,7 @@ export const analyticsAPI = {
   getDashboardStats: () => api.get('/analytics/dashboard'),
   getArticleStats: (articleId) => api.get(`/analytics/article/${articleId}`),
   trackEvent: (data) => api.post('/analytics/track', data),
+  trackEvents: (events) => api.post('/analytics/track/batch', events),
 }
 
 // ===================== AI API =====================